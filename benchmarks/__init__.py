@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Reproducible performance benchmarks; run with `python -m benchmarks run` and `python -m benchmarks compare`.
@@ -0,0 +1,73 @@
+# benchmarks/__main__.py
+
+import argparse
+import json
+import os
+import sys
+
+from benchmarks.compare import DEFAULT_THRESHOLD, compare_results, load_results, print_comparison
+from benchmarks.suite import CASES, DEFAULT_SIZES, run_suite
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Reactor optimizer benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run the benchmark suite and write results as JSON")
+    run.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    run.add_argument("--cases", nargs="+", choices=sorted(CASES), default=None)
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--steps", type=int, default=50, help="Simulation steps for run/evaluator cases")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--out", type=str, default="output/benchmarks/latest.json")
+    run.add_argument("--save-baseline", action="store_true", help=f"Also store the results as {DEFAULT_BASELINE}")
+
+    compare = sub.add_parser("compare", help="Flag regressions against a stored baseline")
+    compare.add_argument("results", help="Results JSON written by `run`")
+    compare.add_argument("--baseline", type=str, default=DEFAULT_BASELINE)
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                         help="Relative slowdown of the median that counts as a regression")
+    imports = sub.add_parser("imports", help="Check import-time and worker spawn budgets")
+    imports.add_argument("--repeat", type=int, default=5)
+    imports.add_argument("--scale", type=float, default=1.0, help="Multiply all budgets (slow machines)")
+    return parser.parse_args()
+
+
+def _write(results, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def main():
+    args = parse_args()
+
+    if args.command == "run":
+        print(f"🚀 Running {len(args.cases or CASES)} benchmark cases at sizes {args.sizes}")
+        results = run_suite(sizes=args.sizes, cases=args.cases, repeat=args.repeat,
+                            seed=args.seed, steps=args.steps)
+        _write(results, args.out)
+        print(f"📁 Results saved to: {args.out}")
+        if args.save_baseline:
+            _write(results, DEFAULT_BASELINE)
+            print(f"📌 Baseline saved to: {DEFAULT_BASELINE}")
+        return 0
+
+    if args.command == "imports":
+        from benchmarks.import_time import check_budgets
+        return 0 if check_budgets(repeat=args.repeat, scale=args.scale) else 1
+
+    rows = compare_results(load_results(args.baseline), load_results(args.results), args.threshold)
+    print_comparison(rows)
+    regressions = [row for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+    print(f"\n✅ No regressions above {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# benchmarks/adaptive_steps.py
+"""
+Compares adaptive timestepping against fixed steps on the bundled layouts:
+steps taken, wall time, and deviation of the recorded trajectories.
+
+    python -m benchmarks.adaptive_steps --timesteps 1000
+"""
+
+import argparse
+import glob
+import time
+
+import numpy as np
+
+from core_sim.core_grid import CoreGrid
+from core_sim.simulator import Simulator
+
+DEFAULT_LAYOUTS = sorted(glob.glob("layouts/test_layout*.json"))
+
+
+def _run(layout_path, timesteps, **kwargs):
+    sim = Simulator(CoreGrid.from_layout_file(layout_path), max_timesteps=timesteps,
+                    output_path="output/adaptive_check.json", **kwargs)
+    start = time.perf_counter()
+    if sim.adaptive:
+        sim.run_adaptive()
+    else:
+        for _ in range(timesteps):
+            sim.step()
+    elapsed = time.perf_counter() - start
+
+    fuel = np.array([[fa.type == "fuel" for fa in row] for row in sim.grid.grid])
+    return {
+        "sim": sim,
+        "seconds": elapsed,
+        "mean_temp": np.array([t[fuel].mean() for t in sim.temperature_log]),
+        "mean_life": np.array([l[fuel].mean() for l in sim.life_log]),
+        "total_energy": np.array([e[0, 0] for e in sim.total_energy_log]),
+        "fitness": sim.meta_history[-1]["fitness"],
+    }
+
+
+def compare_layout(layout_path, timesteps, **adaptive_kwargs):
+    fixed = _run(layout_path, timesteps)
+    adaptive = _run(layout_path, timesteps, adaptive=True, **adaptive_kwargs)
+    stats = adaptive["sim"].adaptive_stats
+
+    def rel(a, b):
+        return float(np.max(np.abs(a - b)) / max(np.max(np.abs(b)), 1e-12))
+
+    return {
+        "layout": layout_path,
+        "fixed_steps": timesteps,
+        "adaptive_steps": stats["accepted_steps"],
+        "rejected_steps": stats["rejected_steps"],
+        "steps_saved": stats["steps_saved"],
+        "speedup": fixed["seconds"] / adaptive["seconds"],
+        "max_rel_dev_mean_temp": rel(adaptive["mean_temp"], fixed["mean_temp"]),
+        "max_rel_dev_mean_life": rel(adaptive["mean_life"], fixed["mean_life"]),
+        "max_rel_dev_total_energy": rel(adaptive["total_energy"], fixed["total_energy"]),
+        "fitness_fixed": fixed["fitness"],
+        "fitness_adaptive": adaptive["fitness"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adaptive vs fixed timestepping on sample layouts")
+    parser.add_argument("layouts", nargs="*", default=DEFAULT_LAYOUTS)
+    parser.add_argument("--timesteps", type=int, default=1000)
+    parser.add_argument("--temp-tol", type=float, default=2.0)
+    parser.add_argument("--life-tol", type=float, default=1e-3)
+    parser.add_argument("--dt-max", type=float, default=50.0)
+    args = parser.parse_args()
+
+    print(f"{'layout':<28} {'steps':>6} {'rej':>4} {'saved':>6} {'speedup':>8} "
+          f"{'dTemp':>8} {'dLife':>9} {'dEnergy':>8} {'fitness fixed/adaptive':>24}")
+    for layout in args.layouts:
+        r = compare_layout(layout, args.timesteps, temp_tol=args.temp_tol,
+                           life_tol=args.life_tol, dt_max=args.dt_max)
+        print(f"{r['layout'][-28:]:<28} {r['adaptive_steps']:>6} {r['rejected_steps']:>4} {r['steps_saved']:>6} "
+              f"{r['speedup']:>7.2f}x {r['max_rel_dev_mean_temp'] * 100:>7.2f}% "
+              f"{r['max_rel_dev_mean_life'] * 100:>8.2f}% {r['max_rel_dev_total_energy'] * 100:>7.2f}% "
+              f"{r['fitness_fixed']:>11.3f}/{r['fitness_adaptive']:<11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# benchmarks/compare.py
+
+import json
+
+DEFAULT_THRESHOLD = 0.10  # flag cases whose median got more than 10% slower
+
+
+def load_results(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Matches cases by (case, size) and computes the median time ratio current / baseline.
+
+    Returns:
+        list[dict]: One row per matched case with 'ratio' and a 'status' of
+        'regression', 'improvement' or 'ok'.
+    """
+    base_index = {(r["case"], r["size"]): r for r in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        base = base_index.get((result["case"], result["size"]))
+        if base is None:
+            continue
+        ratio = result["median_s"] / base["median_s"] if base["median_s"] else float("inf")
+        if ratio > 1.0 + threshold:
+            status = "regression"
+        elif ratio < 1.0 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({
+            "case": result["case"],
+            "size": result["size"],
+            "baseline_s": base["median_s"],
+            "current_s": result["median_s"],
+            "ratio": ratio,
+            "status": status,
+        })
+    return rows
+
+
+def print_comparison(rows):
+    marks = {"regression": "❌", "improvement": "✅", "ok": "  "}
+    print(f"   {'case':<28} {'size':>9} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for row in rows:
+        size = f"{row['size']}x{row['size']}"
+        print(f"{marks[row['status']]} {row['case']:<28} {size:>9} {row['baseline_s'] * 1e3:>12.3f} "
+              f"{row['current_s'] * 1e3:>12.3f} {row['ratio']:>6.2f}x")
@@ -0,0 +1,106 @@
+# benchmarks/domain_decomposition.py
+"""
+Strong scaling of the tiled multi-process engine on one large generated core:
+the same grid and step count with 1..N worker processes, against the serial
+Simulator. Also reports how far the tiled result drifts from the serial one
+(tile seams see cross-tile neighbors one step late; one worker must match exactly).
+
+    python -m benchmarks.domain_decomposition --size 300 --timesteps 20 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import random
+import time
+
+import numpy as np
+
+from core_sim.core_grid import CoreGrid
+from core_sim.domain_decomposition import TiledSimulation
+from core_sim.simulator import Simulator
+from layout_utils.layout_generator import generate_random_layout
+
+
+def _grid(layout):
+    grid = CoreGrid(width=layout["width"], height=layout["height"])
+    grid.initialize_from_layout(layout)
+    return grid
+
+
+def _final_state(sim):
+    cells = sim.grid.grid
+    return {
+        "temperature": np.array([[fa.temperature for fa in row] for row in cells]),
+        "life": np.array([[fa.life for fa in row] for row in cells]),
+        "total_energy": sim.meta_history[-1]["total_energy"],
+        "fitness": sim.meta_history[-1]["fitness"],
+    }
+
+
+def run_serial(layout, timesteps):
+    sim = Simulator(_grid(layout), max_timesteps=timesteps, record=False)
+    start = time.perf_counter()
+    for _ in range(timesteps):
+        sim.step()
+    return time.perf_counter() - start, _final_state(sim)
+
+
+def run_tiled(layout, timesteps, workers):
+    tiled = TiledSimulation(_grid(layout), timesteps, workers=workers)
+    start = time.perf_counter()
+    tiled.run()
+    return time.perf_counter() - start, _final_state(tiled.sim)
+
+
+def compare(size, timesteps, worker_counts, seed=0):
+    random.seed(seed)
+    layout = generate_random_layout(width=size, height=size)
+    serial_s, reference = run_serial(layout, timesteps)
+
+    def rel(a, b):
+        return float(np.max(np.abs(a - b)) / max(np.max(np.abs(b)), 1e-12))
+
+    rows = []
+    base_s = None
+    for workers in worker_counts:
+        seconds, state = run_tiled(layout, timesteps, workers)
+        if workers == 1:
+            base_s = seconds
+        rows.append({
+            "workers": workers,
+            "seconds": seconds,
+            "speedup_vs_serial": serial_s / seconds,
+            # Strong-scaling efficiency relative to the 1-worker tiled run (if measured)
+            "efficiency": (base_s / (seconds * workers)) if base_s else float("nan"),
+            "identical": all(np.array_equal(state[k], reference[k]) for k in ("temperature", "life"))
+                         and state["fitness"] == reference["fitness"],
+            "max_rel_dev_temperature": rel(state["temperature"], reference["temperature"]),
+            "max_rel_dev_life": rel(state["life"], reference["life"]),
+            "rel_dev_total_energy": abs(state["total_energy"] - reference["total_energy"])
+                                    / abs(reference["total_energy"]),
+            "fitness": state["fitness"],
+        })
+    return serial_s, reference["fitness"], rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiled multi-process simulation vs the serial engine")
+    parser.add_argument("--size", type=int, default=300, help="Grid edge length")
+    parser.add_argument("--timesteps", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    serial_s, serial_fitness, rows = compare(args.size, args.timesteps, args.workers, seed=args.seed)
+    print(f"{args.size}x{args.size} grid, {args.timesteps} steps, {os.cpu_count()} CPUs")
+    print(f"serial: {serial_s:.2f}s, fitness {serial_fitness:.4f}")
+    print(f"{'workers':>7} {'time':>8} {'speedup':>8} {'effic.':>7} {'same':>5} "
+          f"{'dTemp':>9} {'dLife':>9} {'dEnergy':>9} {'fitness':>10}")
+    for r in rows:
+        print(f"{r['workers']:>7} {r['seconds']:>7.2f}s {r['speedup_vs_serial']:>7.2f}x {r['efficiency']:>7.2f} "
+              f"{'yes' if r['identical'] else 'no':>5} {r['max_rel_dev_temperature'] * 100:>8.3f}% "
+              f"{r['max_rel_dev_life'] * 100:>8.3f}% {r['rel_dev_total_energy'] * 100:>8.4f}% {r['fitness']:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+# benchmarks/editor_interaction.py
+"""
+Times the layout editor's interactive paths on a large generated layout against
+the 16 ms frame budget of a 60 Hz UI: one frame of drag painting (_flush_drag),
+a batch of single-cell repaints (_paint_cell), viewport refreshes after scroll
+jumps and overlay redraws after a preview result. Every timing includes Tk's
+idle redraw (update_idletasks). Needs a display; on a headless machine run it
+under a virtual one:
+
+    python -m benchmarks.editor_interaction --size 200
+    xvfb-run python -m benchmarks.editor_interaction --size 200 --cell-sizes 30 8
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+FRAME_BUDGET_MS = 16.0
+DRAG_EVENTS_PER_FRAME = 8  # Motion events a fast drag delivers within one frame
+PAINT_BATCH = 100
+
+
+def build_editor(size, cell_size, seed=0):
+    """A GridEditor on a hidden Tk root with a seeded size x size layout loaded and the preview off."""
+    import json
+    import tkinter as tk
+
+    from layout_utils.layout_generator import generate_random_layout
+    from layouts.layout_editor import GridEditor
+
+    random.seed(seed)
+    np.random.seed(seed)
+    layout = generate_random_layout(width=size, height=size)
+
+    root = tk.Tk()
+    root.withdraw()
+    editor = GridEditor(root, width=size, height=size)  # Sizes the canvas like opening a large layout
+    editor.preview_enabled.set(False)
+    editor.on_preview_toggle()  # Drops the pending preview countdown
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, f"layout_{size}.json")
+        with open(path, "w") as f:
+            json.dump(layout, f)
+        editor.load_layout(path)
+    editor.cell_size = cell_size
+    editor.draw_grid()
+    root.update()
+    return root, editor
+
+
+def _timed(root, body):
+    start = time.perf_counter()
+    body()
+    root.update_idletasks()
+    return (time.perf_counter() - start) * 1e3
+
+
+def time_drag_frames(root, editor, rng, frames):
+    """One frame = DRAG_EVENTS_PER_FRAME motion events, each a few cells from the last, flushed together."""
+    x0, y0, x1, y1 = editor._visible
+    samples = []
+    for i in range(frames):
+        editor.selected_type.set("Fuel" if i % 2 == 0 else "Blank")
+        editor.is_dragging = True
+        x, y = rng.randrange(x0, x1), rng.randrange(y0, y1)
+        editor.last_placed_coords = (x, y)
+        points = []
+        for _ in range(DRAG_EVENTS_PER_FRAME):
+            x = min(max(x + rng.randint(-4, 4), x0), x1 - 1)
+            y = min(max(y + rng.randint(-4, 4), y0), y1 - 1)
+            points.append((x, y))
+        editor._drag_points = points
+        samples.append(_timed(root, editor._flush_drag))
+    editor.is_dragging = False
+    return samples
+
+
+def time_paint_batches(root, editor, rng, batches):
+    x0, y0, x1, y1 = editor._visible
+    samples = []
+    for i in range(batches):
+        cell_type = ("Fuel", "Moderator", "ControlRod", "Blank")[i % 4]
+        cells = [(rng.randrange(x0, x1), rng.randrange(y0, y1)) for _ in range(PAINT_BATCH)]
+
+        def paint():
+            for x, y in cells:
+                editor.grid_data[y][x] = {"fa_type": cell_type}
+                editor._non_blank[y, x] = cell_type != "Blank"
+                editor._paint_cell(x, y)
+        samples.append(_timed(root, paint))
+    return samples
+
+
+def time_viewport_refresh(root, editor, rng, jumps):
+    samples = []
+    for _ in range(jumps):
+        editor.canvas.xview_moveto(rng.random())
+        editor.canvas.yview_moveto(rng.random())
+        samples.append(_timed(root, editor.refresh_viewport))
+    return samples
+
+
+def time_overlay_redraw(root, editor, rng, redraws):
+    from layout_utils.live_preview import PreviewResult
+
+    shape = (editor.height, editor.width)
+    editor.preview_enabled.set(True)
+    samples = []
+    for i in range(redraws):
+        if i % 2 == 0:
+            # A new preview result arrives
+            values = np.random.default_rng(i).uniform(300.0, 1200.0, shape)
+            editor.preview_result = PreviewResult(i, values, values / 10, 0.0, 0.0, 40, 0.0)
+            editor.preview_stale = False
+        else:
+            editor.preview_stale = True  # An edit fades the overlay
+        samples.append(_timed(root, editor.draw_overlay))
+    editor.preview_enabled.set(False)
+    return samples
+
+
+CASES = {
+    "drag frame": time_drag_frames,
+    f"paint {PAINT_BATCH} cells": time_paint_batches,
+    "viewport refresh": time_viewport_refresh,
+    "overlay redraw": time_overlay_redraw,
+}
+
+
+def run(size=200, cell_sizes=(30,), repeat=50, seed=0):
+    """Returns one row per (cell size, case) with median / p95 / max milliseconds."""
+    rows = []
+    for cell_size in cell_sizes:
+        root, editor = build_editor(size, cell_size, seed)
+        try:
+            x0, y0, x1, y1 = editor._visible
+            for name, case in CASES.items():
+                samples = case(root, editor, random.Random(seed), repeat)
+                rows.append({
+                    "case": name,
+                    "size": f"{size}x{size}",
+                    "cell_size": cell_size,
+                    "visible_cells": (x1 - x0) * (y1 - y0),
+                    "median_ms": statistics.median(samples),
+                    "p95_ms": float(np.percentile(samples, 95)),
+                    "max_ms": max(samples),
+                })
+        finally:
+            editor.preview.stop()
+            root.destroy()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Layout editor interaction latency vs a 60 Hz frame budget")
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--cell-sizes", type=int, nargs="+", default=[30, 8],
+                        help="Zoom levels (pixels per cell) to measure")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = run(args.size, args.cell_sizes, args.repeat, args.seed)
+    print(f"{'case':<18} {'grid':>9} {'cell px':>8} {'visible':>8} {'median ms':>10} {'p95 ms':>8} "
+          f"{'max ms':>8}  budget {FRAME_BUDGET_MS:.0f} ms")
+    ok = True
+    for r in rows:
+        within = r["p95_ms"] <= FRAME_BUDGET_MS
+        ok &= within
+        print(f"{r['case']:<18} {r['size']:>9} {r['cell_size']:>8} {r['visible_cells']:>8} {r['median_ms']:>10.2f} "
+              f"{r['p95_ms']:>8.2f} {r['max_ms']:>8.2f}  {'✅' if within else '❌'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
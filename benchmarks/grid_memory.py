@@ -0,0 +1,77 @@
+# benchmarks/grid_memory.py
+"""
+Memory footprint and copy cost of CoreGrid cell objects: an empty grid, a
+generated mixed layout, deepcopy of the cell lists (as the legacy optimizer does
+per crossover) and pickled size (what a worker process receives).
+
+    python -m benchmarks.grid_memory --sizes 100 500
+"""
+
+import argparse
+import copy
+import gc
+import pickle
+import random
+import time
+import tracemalloc
+
+from core_sim.core_grid import CoreGrid
+from layout_utils.layout_generator import generate_random_layout
+
+
+def _allocated(build):
+    """Bytes still allocated after `build()` returns, plus the built object."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, obj
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_size(size, repeat=3, seed=0):
+    random.seed(seed)
+    layout = generate_random_layout(width=size, height=size)
+
+    def build_layout_grid():
+        grid = CoreGrid(width=size, height=size)
+        grid.initialize_from_layout(layout)
+        return grid
+
+    empty_bytes, _ = _allocated(lambda: CoreGrid(width=size, height=size))
+    layout_bytes, grid = _allocated(build_layout_grid)
+
+    return {
+        "size": f"{size}x{size}",
+        "empty_grid_mb": empty_bytes / 2 ** 20,
+        "layout_grid_mb": layout_bytes / 2 ** 20,
+        "deepcopy_s": _best_of(lambda: copy.deepcopy(grid.grid), repeat),
+        "pickle_mb": len(pickle.dumps(grid.grid, protocol=pickle.HIGHEST_PROTOCOL)) / 2 ** 20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CoreGrid memory / deepcopy benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'grid':>9} {'empty MB':>9} {'layout MB':>10} {'deepcopy s':>11} {'pickle MB':>10}")
+    for size in args.sizes:
+        r = benchmark_size(size, repeat=args.repeat)
+        print(f"{r['size']:>9} {r['empty_grid_mb']:>9.2f} {r['layout_grid_mb']:>10.2f} "
+              f"{r['deepcopy_s']:>11.3f} {r['pickle_mb']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
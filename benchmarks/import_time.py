@@ -0,0 +1,113 @@
+# benchmarks/import_time.py
+"""
+Import-time budget checks for the simulation core and for worker start-up.
+
+Each measurement runs in a fresh interpreter so module caches from the parent
+process do not hide the cost. Heavy optional modules (matplotlib, tqdm, scipy)
+must not be pulled in by the engine or evaluator imports at all.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Budgets in seconds for the median of `repeat` fresh runs, on top of bare interpreter start-up
+IMPORT_BUDGETS = {
+    "core_sim.simulator": 0.25,
+    "optimization_ga.fitness_evaluator": 0.30,
+}
+WORKER_SPAWN_BUDGET = 1.0
+FORBIDDEN_MODULES = ("matplotlib", "tqdm", "scipy")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_WORKER_SCRIPT = """
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+
+def _ready():
+    from optimization_ga.fitness_evaluator import FitnessEvaluator
+    return FitnessEvaluator.__name__
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+        pool.submit(_ready).result()
+    print(time.perf_counter() - start)
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def _run_python(code):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=_env(),
+                            capture_output=True, text=True, check=True)
+    return time.perf_counter() - start, result.stdout.strip()
+
+
+def measure_import(module, repeat=5):
+    """Median wall time of `import module` in a fresh interpreter, minus bare start-up."""
+    baseline = statistics.median(_run_python("pass")[0] for _ in range(repeat))
+    samples = []
+    loaded = []
+    probe = (f"import sys; import {module}; "
+             f"print(','.join(m for m in {FORBIDDEN_MODULES!r} if m in sys.modules))")
+    for _ in range(repeat):
+        elapsed, stdout = _run_python(probe)
+        samples.append(elapsed)
+        loaded = [m for m in stdout.split(",") if m]
+    return {"module": module, "import_s": max(0.0, statistics.median(samples) - baseline), "heavy_modules": loaded}
+
+
+def measure_worker_spawn(repeat=3):
+    """Median time to spawn one worker process that imports FitnessEvaluator and answers."""
+    import tempfile
+
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as f:
+        f.write(_WORKER_SCRIPT)
+        script = f.name
+    try:
+        samples = []
+        for _ in range(repeat):
+            result = subprocess.run([sys.executable, script], cwd=REPO_ROOT, env=_env(),
+                                    capture_output=True, text=True, check=True)
+            samples.append(float(result.stdout.strip()))
+    finally:
+        os.remove(script)
+    return {"worker_spawn_s": statistics.median(samples)}
+
+
+def check_budgets(repeat=5, scale=1.0, log=print):
+    """
+    Measures all imports and the worker spawn against their budgets.
+
+    Args:
+        repeat (int): Fresh interpreter runs per measurement.
+        scale (float): Multiplier for all budgets (slow CI machines).
+
+    Returns:
+        bool: True if every budget is met and no forbidden module was imported.
+    """
+    ok = True
+    for module, budget in IMPORT_BUDGETS.items():
+        result = measure_import(module, repeat=repeat)
+        within = result["import_s"] <= budget * scale and not result["heavy_modules"]
+        ok &= within
+        heavy = f" (pulled in: {', '.join(result['heavy_modules'])})" if result["heavy_modules"] else ""
+        log(f"{'✅' if within else '❌'} import {module:<36} {result['import_s'] * 1e3:>8.1f} ms "
+            f"/ budget {budget * scale * 1e3:.0f} ms{heavy}")
+
+    spawn = measure_worker_spawn(repeat=max(1, repeat // 2))["worker_spawn_s"]
+    within = spawn <= WORKER_SPAWN_BUDGET * scale
+    ok &= within
+    log(f"{'✅' if within else '❌'} spawn worker + import evaluator         {spawn * 1e3:>8.1f} ms "
+        f"/ budget {WORKER_SPAWN_BUDGET * scale * 1e3:.0f} ms")
+    return ok
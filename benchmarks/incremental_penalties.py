@@ -0,0 +1,95 @@
+# benchmarks/incremental_penalties.py
+"""
+Checks IncrementalPenalties against full recomputation on random single-cell
+moves (fuel <-> blank flips of movable positions, half of them undone) and
+compares the per-move cost of both.
+
+    python -m benchmarks.incremental_penalties --sizes 15 50 100 --moves 2000
+"""
+
+import argparse
+import random
+import time
+
+from core_sim.assemblies.empty import Blank
+from core_sim.assemblies.fuel import Fuel
+from core_sim.core_grid import CoreGrid
+from core_sim.incremental_penalties import IncrementalPenalties
+from layout_utils.layout_generator import generate_random_layout
+
+
+def _random_fuel(rng):
+    fa = Fuel(enrichment=rng.choice([2.4, 3.2, 4.5]), life=rng.random())
+    fa.temperature = rng.uniform(600.0, 1300.0)
+    return fa
+
+
+def build_grid(size, seed=0):
+    """Generated layout with randomized fuel temperature / life, so every penalty term is active."""
+    random.seed(seed)
+    rng = random.Random(seed)
+    layout = generate_random_layout(width=size, height=size)
+    grid = CoreGrid(width=size, height=size)
+    grid.initialize_from_layout(layout)
+    for x, y, fa in grid:
+        if fa.type == "fuel":
+            grid.insert_fa(x, y, _random_fuel(rng))
+    return grid
+
+
+def benchmark_size(size, moves=2000, seed=0, full_every=1):
+    grid = build_grid(size, seed)
+    rng = random.Random(seed + 1)
+    movable = [(x, y) for x, y, fa in grid if fa.type in ("fuel", "blank")]
+    penalties = IncrementalPenalties(grid)
+
+    incremental_s = full_s = 0.0
+    checked = 0
+    max_rel_error = 0.0
+    for i in range(moves):
+        x, y = rng.choice(movable)
+        fa = Blank.shared() if grid.get_fa(x, y).type == "fuel" else _random_fuel(rng)
+
+        start = time.perf_counter()
+        penalties.apply_move(x, y, fa)
+        terms = penalties.terms()
+        incremental_s += time.perf_counter() - start
+
+        if i % full_every == 0:
+            start = time.perf_counter()
+            full = penalties.full_terms()
+            full_s += time.perf_counter() - start
+            penalties.check(terms)
+            checked += 1
+            for name, value in full.items():
+                max_rel_error = max(max_rel_error, abs(terms[name] - value) / max(abs(value), 1.0))
+
+        if rng.random() < 0.5:
+            penalties.undo_move()
+
+    return {
+        "size": f"{size}x{size}",
+        "moves": moves,
+        "checked": checked,
+        "incremental_us": incremental_s / moves * 1e6,
+        "full_us": full_s / max(checked, 1) * 1e6,
+        "max_rel_error": max_rel_error,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental vs full penalty evaluation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[15, 50, 100])
+    parser.add_argument("--moves", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'grid':>9} {'moves':>6} {'incr us/move':>13} {'full us':>10} {'speedup':>8} {'max rel err':>12}")
+    for size in args.sizes:
+        r = benchmark_size(size, moves=args.moves, seed=args.seed)
+        print(f"{r['size']:>9} {r['moves']:>6} {r['incremental_us']:>13.1f} {r['full_us']:>10.1f} "
+              f"{r['full_us'] / r['incremental_us']:>7.0f}x {r['max_rel_error']:>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
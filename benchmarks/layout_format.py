@@ -0,0 +1,75 @@
+# benchmarks/layout_format.py
+"""
+Compares the JSON and binary layout formats: file size, load time into a layout
+dict, and load time into a CoreGrid.
+
+    python -m benchmarks.layout_format --sizes 15 100 500
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from core_sim.core_grid import CoreGrid
+from layout_utils.binary_layout import save_binary_layout, load_binary_layout
+from layout_utils.layout_generator import generate_random_layout
+from layout_utils.load_layout import load_layout
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_size(size, workdir, repeat=3, seed=0):
+    random.seed(seed)
+    layout = generate_random_layout(width=size, height=size)
+
+    json_path = os.path.join(workdir, f"layout_{size}.json")
+    bin_path = os.path.join(workdir, f"layout_{size}.rfl")
+    with open(json_path, "w") as f:
+        json.dump(layout, f, indent=2)
+    save_binary_layout(layout, bin_path)
+
+    if load_binary_layout(bin_path) != layout:
+        raise AssertionError(f"Binary round trip mismatch at {size}x{size}")
+
+    return {
+        "size": f"{size}x{size}",
+        "json_bytes": os.path.getsize(json_path),
+        "binary_bytes": os.path.getsize(bin_path),
+        "json_load_s": _best_of(lambda: load_layout(json_path), repeat),
+        "binary_load_s": _best_of(lambda: load_layout(bin_path), repeat),
+        "json_grid_s": _best_of(lambda: CoreGrid.from_layout_file(json_path), repeat),
+        "binary_grid_s": _best_of(lambda: CoreGrid.from_layout_file(bin_path), repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON vs binary layout benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[15, 100, 500])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = [benchmark_size(size, workdir, repeat=args.repeat) for size in args.sizes]
+
+    print(f"{'grid':>9} | {'JSON KB':>10} {'bin KB':>9} {'ratio':>6} | "
+          f"{'JSON load':>10} {'bin load':>9} | {'JSON grid':>10} {'bin grid':>9}")
+    for r in results:
+        print(f"{r['size']:>9} | {r['json_bytes'] / 1024:>10.1f} {r['binary_bytes'] / 1024:>9.1f} "
+              f"{r['json_bytes'] / r['binary_bytes']:>5.1f}x | "
+              f"{r['json_load_s'] * 1e3:>8.2f}ms {r['binary_load_s'] * 1e3:>7.2f}ms | "
+              f"{r['json_grid_s'] * 1e3:>8.2f}ms {r['binary_grid_s'] * 1e3:>7.2f}ms")
+    return results
+
+
+if __name__ == "__main__":
+    main()
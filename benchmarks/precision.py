@@ -0,0 +1,92 @@
+# benchmarks/precision.py
+"""
+Validation of the float32 precision mode: every bundled layout is simulated
+with dtype=float64 and dtype=float32 and compared on final fitness and peak
+fuel temperature, alongside logged-frame memory, JSON output size and wall time.
+
+    python -m benchmarks.precision --timesteps 500
+"""
+
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from core_sim.core_grid import CoreGrid
+from core_sim.simulator import Simulator
+
+DEFAULT_LAYOUTS = sorted(glob.glob("layouts/test_layout*.json"))
+
+
+def _fitness(meta):
+    fitness = meta["fitness"]
+    return fitness["fitness"] if isinstance(fitness, dict) else fitness
+
+
+def run(layout_path, timesteps, dtype, workdir):
+    # An .npz output path gets both the frame log (.json) and the recorder snapshots (_snapshots.json)
+    output_path = os.path.join(workdir, f"{np.dtype(dtype).name}.npz")
+    sim = Simulator(CoreGrid.from_layout_file(layout_path), max_timesteps=timesteps,
+                    output_path=output_path, dtype=dtype)
+    start = time.perf_counter()
+    for _ in range(timesteps):
+        sim.step()
+    step_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sim.save()
+    save_s = time.perf_counter() - start
+
+    fuel = np.array([[fa.type == "fuel" for fa in row] for row in sim.grid.grid])
+    logs = (sim.temperature_log, sim.energy_output_log, sim.life_log, sim.total_energy_log, sim.flux_log)
+    return {
+        "fitness": _fitness(sim.meta_history[-1]),
+        "peak_temperature": float(max(frame[fuel].max() for frame in sim.temperature_log)) if fuel.any() else 0.0,
+        "log_mb": sum(frame.nbytes for log in logs for frame in log) / 2 ** 20,
+        "json_mb": sum(os.path.getsize(path) for path in
+                       (output_path.replace(".npz", ".json"), output_path.replace(".npz", "_snapshots.json"))) / 2 ** 20,
+        "step_s": step_s,
+        "save_s": save_s,
+    }
+
+
+def compare_layout(layout_path, timesteps):
+    with tempfile.TemporaryDirectory() as workdir:
+        double = run(layout_path, timesteps, np.float64, workdir)
+        single = run(layout_path, timesteps, np.float32, workdir)
+    return {
+        "layout": layout_path,
+        "fitness_float64": double["fitness"],
+        "rel_dev_fitness": abs(single["fitness"] - double["fitness"]) / max(abs(double["fitness"]), 1e-12),
+        "dev_peak_temperature": abs(single["peak_temperature"] - double["peak_temperature"]),
+        "peak_temperature_float64": double["peak_temperature"],
+        "log_ratio": single["log_mb"] / double["log_mb"],
+        "json_ratio": single["json_mb"] / double["json_mb"],
+        "json_mb_float64": double["json_mb"],
+        "step_speedup": double["step_s"] / single["step_s"],
+        "save_speedup": double["save_s"] / single["save_s"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="float32 vs float64 simulation drift, memory and speed")
+    parser.add_argument("layouts", nargs="*", default=DEFAULT_LAYOUTS)
+    parser.add_argument("--timesteps", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'layout':<28} {'fitness':>10} {'dFitness':>9} {'peak T':>8} {'dPeak':>8} "
+          f"{'frames':>7} {'JSON':>7} {'JSON64':>8} {'step':>6} {'save':>6}")
+    for layout in args.layouts:
+        r = compare_layout(layout, args.timesteps)
+        print(f"{r['layout'][-28:]:<28} {r['fitness_float64']:>10.4f} {r['rel_dev_fitness']:>9.2e} "
+              f"{r['peak_temperature_float64']:>8.2f} {r['dev_peak_temperature']:>7.4f}K "
+              f"{r['log_ratio']:>6.2f}x {r['json_ratio']:>6.2f}x {r['json_mb_float64']:>6.1f}MB "
+              f"{r['step_speedup']:>5.2f}x {r['save_speedup']:>5.2f}x")
+    print("frames / JSON: float32 size relative to float64; step / save: float32 speedup")
+
+
+if __name__ == "__main__":
+    main()
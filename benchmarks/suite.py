@@ -0,0 +1,234 @@
+# benchmarks/suite.py
+"""
+Seeded benchmarks for the simulation and optimization hot paths.
+
+Every case is a setup function `setup(size, ctx) -> callable`; the returned
+zero-argument callable is the timed body. Layouts come from layout_generator with
+a fixed seed so every run times exactly the same work.
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import time
+from datetime import datetime
+
+import numpy as np
+
+from core_sim.core_grid import CoreGrid
+from core_sim.flux_models import diffusion_approx_flux
+from core_sim.recorder import Recorder
+from core_sim.simulator import Simulator
+from layout_utils.binary_layout import save_binary_layout
+from layout_utils.layout_generator import generate_random_layout
+from layout_utils.load_layout import load_layout
+
+DEFAULT_SIZES = (15, 30, 60)
+
+
+class BenchmarkContext:
+    """Per-size fixtures shared by the cases: seeded layout, files on disk, step counts."""
+
+    def __init__(self, size, workdir, seed=0, steps=50):
+        self.size = size
+        self.workdir = workdir
+        self.seed = seed
+        self.steps = steps
+
+        random.seed(seed)
+        np.random.seed(seed)
+        self.layout = generate_random_layout(width=size, height=size)
+
+        self.json_path = os.path.join(workdir, f"layout_{size}.json")
+        with open(self.json_path, "w") as f:
+            json.dump(self.layout, f, indent=2)
+        self.binary_path = os.path.join(workdir, f"layout_{size}.rfl")
+        save_binary_layout(self.layout, self.binary_path)
+
+    def grid(self):
+        grid = CoreGrid(width=self.size, height=self.size)
+        grid.initialize_from_layout(self.layout)
+        return grid
+
+    def output_path(self, name):
+        return os.path.join(self.workdir, f"{name}_{self.size}.json")
+
+    def reseed(self):
+        random.seed(self.seed)
+        np.random.seed(self.seed)
+
+
+@contextlib.contextmanager
+def _quiet():
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+def bench_flux(ctx):
+    grid = ctx.grid()
+    return lambda: diffusion_approx_flux(grid)
+
+
+def bench_simulator_step(ctx):
+    sim = Simulator(ctx.grid(), max_timesteps=ctx.steps, output_path=ctx.output_path("step"), record=False)
+    return sim.step
+
+
+def _bench_run(ctx, record):
+    def body():
+        sim = Simulator(ctx.grid(), max_timesteps=ctx.steps, output_path=ctx.output_path("run"), record=record)
+        with _quiet():
+            sim.run()
+    return body
+
+
+def bench_run_recording(ctx):
+    return _bench_run(ctx, record=True)
+
+
+def bench_run_no_recording(ctx):
+    return _bench_run(ctx, record=False)
+
+
+def _ga_base_layout(ctx):
+    path = os.path.join(ctx.workdir, f"ga_base_{ctx.size}.json")
+    with open(path, "w") as f:
+        json.dump(ctx.layout, f)
+    return path
+
+
+def bench_evaluator(ctx):
+    from optimization_ga.ga_optimizer import ReactorGA
+
+    with _quiet():
+        ga = ReactorGA(_ga_base_layout(ctx), config={"timesteps": ctx.steps})
+    ctx.reseed()
+    chromosome = ga.initialize_population()[3]
+
+    def body():
+        ga.evaluator.cache.clear()
+        with _quiet():
+            ga.evaluator.evaluate(chromosome)
+    return body
+
+
+def bench_ga_generation(ctx):
+    from optimization_ga.ga_optimizer import ReactorGA
+
+    base_path = _ga_base_layout(ctx)
+    config = {"population_size": 8, "generations": 1, "elitism_count": 2, "timesteps": max(1, ctx.steps // 5)}
+
+    def body():
+        ctx.reseed()
+        with _quiet():
+            ReactorGA(base_path, config=config).run()
+    return body
+
+
+def bench_recorder_save(ctx):
+    rng = np.random.default_rng(ctx.seed)
+    recorder = Recorder((ctx.size, ctx.size), ctx.steps)
+    recorder.set_types([[cell["fa_type"] for cell in row] for row in ctx.layout["grid"]])
+    for step in range(ctx.steps):
+        frame = rng.random((ctx.size, ctx.size))
+        recorder.record(frame, frame, frame, float(step), frame, meta={"step": step})
+    path = ctx.output_path("recorder")
+    return lambda: recorder.save(path)
+
+
+def bench_layout_load_json(ctx):
+    return lambda: CoreGrid.from_layout_file(ctx.json_path)
+
+
+def bench_layout_load_binary(ctx):
+    return lambda: CoreGrid.from_layout_file(ctx.binary_path)
+
+
+def bench_layout_parse_json(ctx):
+    return lambda: load_layout(ctx.json_path)
+
+
+def bench_grid_clone(ctx):
+    grid = ctx.grid()
+    return grid.clone
+
+
+def bench_grid_snapshot_restore(ctx):
+    grid = ctx.grid()
+    return lambda: grid.restore(grid.snapshot())
+
+
+CASES = {
+    "flux.diffusion_approx_flux": bench_flux,
+    "simulator.step": bench_simulator_step,
+    "simulator.run.recording": bench_run_recording,
+    "simulator.run.no_recording": bench_run_no_recording,
+    "evaluator.evaluate": bench_evaluator,
+    "ga.generation": bench_ga_generation,
+    "recorder.save": bench_recorder_save,
+    "layout.load_json": bench_layout_load_json,
+    "layout.load_binary": bench_layout_load_binary,
+    "layout.parse_json": bench_layout_parse_json,
+    "grid.clone": bench_grid_clone,
+    "grid.snapshot_restore": bench_grid_snapshot_restore,
+}
+
+
+def time_callable(fn, repeat=5, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "max_s": max(samples),
+        "repeat": repeat,
+    }
+
+
+def run_suite(sizes=DEFAULT_SIZES, cases=None, repeat=5, seed=0, steps=50, workdir=None, log=print):
+    """
+    Runs the selected cases at every grid size.
+
+    Returns:
+        dict: {"meta": {...}, "results": [{"case", "size", "min_s", "median_s", "max_s", "repeat"}]}
+    """
+    import tempfile
+
+    selected = {name: CASES[name] for name in (cases or CASES)}
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = workdir or tmp
+        cwd = os.getcwd()
+        os.chdir(workdir)  # FitnessEvaluator writes its temp files relative to cwd
+        try:
+            for size in sizes:
+                ctx = BenchmarkContext(size, workdir, seed=seed, steps=steps)
+                for name, setup in selected.items():
+                    ctx.reseed()
+                    timing = time_callable(setup(ctx), repeat=repeat)
+                    results.append({"case": name, "size": size, **timing})
+                    log(f"  {name:<28} {size:>4}x{size:<4} median {timing['median_s'] * 1e3:>10.3f} ms")
+        finally:
+            os.chdir(cwd)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "seed": seed,
+            "steps": steps,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
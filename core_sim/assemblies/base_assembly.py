@@ -1,7 +1,11 @@
 
 class FuelAssembly:
+    # Grids hold one object per cell, so assemblies carry no __dict__; the type tag is per class
+    __slots__ = ("enrichment", "energy_output", "temperature", "life", "total_energy", "is_movable")
+    type = "base"
+    is_flyweight = False  # True for instances shared between cells (see Blank.shared)
+
     def __init__(self, enrichment=0.0, life=1.0, is_movable=False, temperature=400):
-        self.type = "base"
         self.enrichment = enrichment
         self.energy_output = 0.0
         self.temperature = temperature
@@ -9,7 +13,20 @@ class FuelAssembly:
         self.total_energy = 0.0
         self.is_movable = is_movable
 
-    def update(self, neighbors, flux=0.0):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._state_slots = tuple(slot for klass in reversed(cls.__mro__) for slot in klass.__dict__.get("__slots__", ()))
+
+    def __deepcopy__(self, memo):
+        # Per-cell state is plain scalars, so a field-by-field copy is enough and far cheaper
+        # than the generic reduce protocol (legacy optimizers deep-copy whole grids per crossover)
+        cls = type(self)
+        clone = cls.__new__(cls)
+        for attr in cls._state_slots:
+            setattr(clone, attr, getattr(self, attr))
+        return clone
+
+    def update(self, neighbors, flux=0.0, dt=1.0):
         total_flux_multiplier = 1.0
 
         for neighbor, weight in neighbors:
@@ -59,3 +76,6 @@ class FuelAssembly:
 
     def __repr__(self):
         return f"{self.type[:1].upper()}({self.enrichment:.1f})"
+
+
+FuelAssembly._state_slots = FuelAssembly.__slots__
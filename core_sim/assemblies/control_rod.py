@@ -2,13 +2,15 @@ from .base_assembly import FuelAssembly
 from .fuel import Fuel
 
 class ControlRod(FuelAssembly):
+    __slots__ = ("insertion_level", "thermal_power")
+    type = "control_rod"
+
     def __init__(self):
         super().__init__(enrichment=0.0, is_movable=False, temperature=500)
-        self.type = "control_rod"
         self.insertion_level = 0.5  # Range: 0 (out) to 1 (fully in)
         self.thermal_power = 1.0    # Acts as a "cooling influence" constant
 
-    def update(self, neighbors, flux=0.0):
+    def update(self, neighbors, flux=0.0, dt=1.0):
         self.temperature = 450
 
         weighted_temps = [n.temperature * w for n, w in neighbors if isinstance(n, Fuel)]
@@ -20,9 +22,9 @@ class ControlRod(FuelAssembly):
         avg_temp = sum(weighted_temps) / total_weight
 
         if avg_temp > 1600:
-            self.insertion_level = min(1.0, self.insertion_level + 0.05)
+            self.insertion_level = min(1.0, self.insertion_level + 0.05 * dt)
         elif avg_temp < 1000:
-            self.insertion_level = max(0.0, self.insertion_level - 0.05)
+            self.insertion_level = max(0.0, self.insertion_level - 0.05 * dt)
 
     def influence_on(self, target):
         # Control rod reduces flux proportional to insertion level
@@ -1,9 +1,54 @@
 from .base_assembly import FuelAssembly
 
+# Set right after the class is defined; None while the shared instance itself is being built
+_SHARED_BLANK = None
+
+
 class Blank(FuelAssembly):
+    """
+    Empty cell. Blanks never change state, so grids put one shared instance
+    (Blank.shared()) into every blank cell instead of a separate object per cell.
+    The shared instance is read-only; CoreGrid.mutable_fa(x, y) swaps a private
+    copy into the cell before it is modified.
+    """
+    __slots__ = ()
+    type = "blank"
+
     def __init__(self):
         super().__init__(enrichment=0.0, is_movable=False, temperature=300)
-        self.type = "blank"
 
-    def update(self, neighbors, flux=0.0):
-        self.temperature = 300
+    @classmethod
+    def shared(cls):
+        return _SHARED_BLANK
+
+    @property
+    def is_flyweight(self):
+        return self is _SHARED_BLANK
+
+    def private_copy(self):
+        clone = Blank()
+        for attr in FuelAssembly.__slots__:
+            setattr(clone, attr, getattr(self, attr))
+        return clone
+
+    def __setattr__(self, name, value):
+        if self is _SHARED_BLANK:
+            raise AttributeError(f"Cannot set '{name}' on the shared Blank; "
+                                 f"use CoreGrid.mutable_fa(x, y) to get a private copy of the cell")
+        super().__setattr__(name, value)
+
+    def __deepcopy__(self, memo):
+        return self if self is _SHARED_BLANK else super().__deepcopy__(memo)
+
+    def __reduce_ex__(self, protocol):
+        # copy and pickle of the shared instance resolve back to the shared instance
+        if self is _SHARED_BLANK:
+            return Blank.shared, ()
+        return super().__reduce_ex__(protocol)
+
+    def update(self, neighbors, flux=0.0, dt=1.0):
+        if self.temperature != 300:
+            self.temperature = 300
+
+
+_SHARED_BLANK = Blank()
@@ -1,27 +1,41 @@
 # core_sim/fuel_assembly.py
 
 from .base_assembly import FuelAssembly
-from core_sim.constants import *
+from core_sim.constants import DEFAULT_PARAMS
 from core_sim.burnup_models import HeuristicBurnupModel  # Default
 import math
+from copy import deepcopy
 
 from ..fuel_burnup import SECONDS_PER_STEP
 
 
+# The heuristic model is stateless, so all fuel assemblies can share one instance
+_DEFAULT_BURNUP_MODEL = HeuristicBurnupModel()
+
+
 class Fuel(FuelAssembly):
+    __slots__ = ("age", "burnup_model", "params")
+    type = "fuel"
 
-    def __init__(self, enrichment, life=1.0, is_movable=True, burnup_model=None):
+    def __init__(self, enrichment, life=1.0, is_movable=True, burnup_model=None, params=None):
         super().__init__(enrichment=enrichment, life=life, is_movable=is_movable, temperature=800)
-        self.type = "fuel"
         self.age = 0
-        self.burnup_model = burnup_model or HeuristicBurnupModel()
+        self.burnup_model = burnup_model or _DEFAULT_BURNUP_MODEL
+        self.params = params or DEFAULT_PARAMS  # SimulationParams; the Simulator binds its own
+
+    def __deepcopy__(self, memo):
+        clone = super().__deepcopy__(memo)
+        clone.burnup_model = deepcopy(self.burnup_model, memo)
+        return clone
 
-    def update(self, neighbors, flux=1.0):
+    def update(self, neighbors, flux=1.0, dt=1.0):
+        """Advances the assembly by `dt` timesteps (dt may be fractional or > 1 in adaptive mode)."""
         from .moderator import Moderator
         from .control_rod import ControlRod
         from core_sim.fuel_burnup import SECONDS_PER_STEP
 
-        self.age += 1
+        params = self.params
+        self.age += dt
 
         # 1. Neighbor thermal influence
         temp_change = 0.0
@@ -31,7 +45,7 @@ class Fuel(FuelAssembly):
             elif isinstance(neighbor, ControlRod):
                 temp_change -= neighbor.thermal_power * weight
 
-        self.temperature += temp_change
+        self.temperature += temp_change * dt
 
         # 2. Average neighbor temperature (for cooling)
         valid_neighbors = [n for n, _ in neighbors if isinstance(n, FuelAssembly)]
@@ -56,22 +70,22 @@ class Fuel(FuelAssembly):
         flux_factor = min(local_flux / core_flux, 1.0)
 
         # 5. Temperature effect: Gaussian around T_OPT
-        temp_factor = math.exp(-0.5 * ((self.temperature - T_OPT) / SIGMA_T) ** 2)
+        temp_factor = math.exp(-0.5 * ((self.temperature - params.t_opt) / params.sigma_t) ** 2)
 
         # 6. Energy production
-        self.energy_output = flux_factor * self.life * temp_factor * ENERGY_CONSTANT
+        self.energy_output = flux_factor * self.life * temp_factor * params.energy_constant
 
         # 7. Update temperature from heating/cooling
         heating = self.energy_output * self.life  # spent fuel heats less
-        cooling = COOLING_COEFF * (1 + (1 - self.life) * 2.0) \
+        cooling = params.cooling_coeff * (1 + (1 - self.life) * 2.0) \
                   * (self.temperature - avg_temp)  # spent fuel cools faster
-        delta_T = (heating - cooling) / (THERMAL_CAPACITY * (self.life + 0.1))
-        self.temperature = max(T_MIN, min(self.temperature + delta_T, T_MAX))
+        delta_T = (heating - cooling) / (params.thermal_capacity * (self.life + 0.1))
+        self.temperature = max(params.t_min, min(self.temperature + delta_T * dt, params.t_max))
 
         # 8. Life loss using burnup model with correct dt
-        life_loss = self.burnup_model.compute_life_loss(self, flux=flux, dt=SECONDS_PER_STEP)
+        life_loss = self.burnup_model.compute_life_loss(self, flux=flux, dt=SECONDS_PER_STEP * dt)
         self.life = max(0.0, self.life - life_loss)
 
         # 9. Accumulate total energy
-        self.total_energy += self.energy_output
+        self.total_energy += self.energy_output * dt
 
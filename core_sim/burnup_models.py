@@ -2,7 +2,6 @@
 
 from abc import ABC, abstractmethod
 import math
-from core_sim.constants import *
 from core_sim.fuel_burnup import compute_life as physical_burn, SECONDS_PER_STEP
 
 class BurnupModel(ABC):
@@ -15,8 +14,10 @@ class BurnupModel(ABC):
 class HeuristicBurnupModel(BurnupModel):
     def compute_life_loss(self, fuel, flux: float, dt: float) -> float:
         overheat_factor = 1.0 + max(0, (fuel.temperature - 600))
-        burn_rate = BURN_RATE_BASE * overheat_factor
-        return fuel.life * burn_rate * (fuel.energy_output / ENERGY_CONSTANT)
+        params = fuel.params
+        burn_rate = params.burn_rate_base * overheat_factor
+        # Calibrated per timestep; scale linearly for longer or shorter steps
+        return fuel.life * burn_rate * (fuel.energy_output / params.energy_constant) * (dt / SECONDS_PER_STEP)
 
 
 class PhysicsBurnupModel(BurnupModel):
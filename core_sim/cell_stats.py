@@ -0,0 +1,146 @@
+# core_sim/cell_stats.py
+"""
+Online per-cell summaries of a simulation run, for screening many layouts
+without keeping their trajectories. Every statistic is updated in place from
+each step's frames (mean and variance with Welford's algorithm), so memory is
+a fixed handful of (height, width) arrays however long the run is.
+"""
+
+import numpy as np
+
+from core_sim.penalties import PenaltyCalculator
+
+# Per-cell arrays, in the order they are saved
+CELL_FIELDS = ("temperature_min", "temperature_max", "temperature_mean", "temperature_std",
+               "steps_above_temp", "final_life", "peak_energy_output", "life_depleted_step")
+
+
+class CellStatistics:
+    """
+    Streaming per-cell statistics over the recorded steps.
+
+    Args:
+        grid_shape (tuple): (height, width).
+        temp_threshold (float): Temperature above which a step counts towards steps_above_temp.
+        life_threshold (float): Life below which a cell counts as depleted; life_depleted_step
+            is the first step where that happened (-1 if it never did).
+    """
+
+    def __init__(self, grid_shape, temp_threshold=PenaltyCalculator.TEMP_LIMIT,
+                 life_threshold=PenaltyCalculator.LIFE_THRESHOLD):
+        self.grid_shape = tuple(grid_shape)
+        self.temp_threshold = float(temp_threshold)
+        self.life_threshold = float(life_threshold)
+        self.count = 0
+        self.final_total_energy = 0.0
+        self.peak_total_energy = 0.0
+
+        self.temperature_min = np.full(self.grid_shape, np.inf)
+        self.temperature_max = np.full(self.grid_shape, -np.inf)
+        self.temperature_mean = np.zeros(self.grid_shape)
+        self._temperature_m2 = np.zeros(self.grid_shape)  # Welford sum of squared deviations
+        self.steps_above_temp = np.zeros(self.grid_shape, dtype=np.int64)
+        self.final_life = np.full(self.grid_shape, np.nan)
+        self.peak_energy_output = np.full(self.grid_shape, -np.inf)
+        self.life_depleted_step = np.full(self.grid_shape, -1, dtype=np.int64)
+
+    @property
+    def temperature_std(self):
+        """Population standard deviation of each cell's temperature over the recorded steps."""
+        return np.sqrt(self._temperature_m2 / self.count) if self.count else np.zeros(self.grid_shape)
+
+    def update(self, temperature, energy_output, life, total_energy=0.0):
+        """Folds one step's (height, width) frames into the statistics."""
+        step = self.count
+        self.count += 1
+
+        np.minimum(self.temperature_min, temperature, out=self.temperature_min)
+        np.maximum(self.temperature_max, temperature, out=self.temperature_max)
+        delta = temperature - self.temperature_mean
+        self.temperature_mean += delta / self.count
+        self._temperature_m2 += delta * (temperature - self.temperature_mean)
+        self.steps_above_temp += temperature > self.temp_threshold
+
+        np.maximum(self.peak_energy_output, energy_output, out=self.peak_energy_output)
+        self.final_life[...] = life
+        self.life_depleted_step[(self.life_depleted_step < 0) & (life < self.life_threshold)] = step
+
+        self.final_total_energy = float(total_energy)
+        self.peak_total_energy = max(self.peak_total_energy, float(total_energy)) if step else float(total_energy)
+
+    def summary(self, mask=None):
+        """
+        Scalar summary over the cells selected by `mask` (e.g. fuel cells), for ranking layouts.
+
+        Returns:
+            dict: Peak and mean temperature, cell-steps above the threshold, depleted fraction,
+                earliest depletion step (-1 if none), mean final life and total energy.
+        """
+        mask = np.ones(self.grid_shape, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        if not mask.any() or not self.count:
+            return {"steps": self.count, "final_total_energy": self.final_total_energy}
+        depleted = self.life_depleted_step[mask]
+        return {
+            "steps": self.count,
+            "max_temperature": float(self.temperature_max[mask].max()),
+            "mean_temperature": float(self.temperature_mean[mask].mean()),
+            "cell_steps_above_temp": int(self.steps_above_temp[mask].sum()),
+            "depleted_fraction": float(np.mean(depleted >= 0)),
+            "first_depletion_step": int(depleted[depleted >= 0].min()) if (depleted >= 0).any() else -1,
+            "mean_final_life": float(self.final_life[mask].mean()),
+            "peak_energy_output": float(self.peak_energy_output[mask].max()),
+            "final_total_energy": self.final_total_energy,
+        }
+
+    def as_dict(self):
+        """JSON-compatible form: thresholds, counters and one nested list per CELL_FIELDS entry."""
+        data = {
+            "steps": self.count,
+            "temp_threshold": self.temp_threshold,
+            "life_threshold": self.life_threshold,
+            "final_total_energy": self.final_total_energy,
+            "peak_total_energy": self.peak_total_energy,
+        }
+        for name in CELL_FIELDS:
+            data[name] = getattr(self, name).tolist()
+        return data
+
+    def state(self):
+        """Arrays needed to continue accumulating (checkpoints)."""
+        return {
+            "count": np.array(self.count),
+            "totals": np.array([self.final_total_energy, self.peak_total_energy]),
+            "temperature_min": self.temperature_min,
+            "temperature_max": self.temperature_max,
+            "temperature_mean": self.temperature_mean,
+            "temperature_m2": self._temperature_m2,
+            "steps_above_temp": self.steps_above_temp,
+            "final_life": self.final_life,
+            "peak_energy_output": self.peak_energy_output,
+            "life_depleted_step": self.life_depleted_step,
+        }
+
+    def load_state(self, state):
+        self.count = int(state["count"])
+        self.final_total_energy, self.peak_total_energy = (float(v) for v in state["totals"])
+        for name, value in state.items():
+            if name not in ("count", "totals"):
+                attr = "_temperature_m2" if name == "temperature_m2" else name
+                setattr(self, attr, np.array(value, dtype=getattr(self, attr).dtype))
+
+
+def load_cell_stats(data):
+    """
+    Per-cell arrays from a stats-mode Recorder output (path or loaded dict).
+
+    Returns:
+        dict: {"types": (H, W) array, "stats": {name: array or scalar}, "meta": final meta entry}.
+    """
+    if isinstance(data, str):
+        import json
+        with open(data, "r") as f:
+            data = json.load(f)
+    if "cell_stats" not in data:
+        raise ValueError("Not a per-cell statistics recording (run with recording='stats')")
+    stats = {name: np.array(value) if isinstance(value, list) else value for name, value in data["cell_stats"].items()}
+    return {"types": np.array(data["types"]), "stats": stats, "meta": (data.get("meta") or [None])[-1]}
@@ -0,0 +1,239 @@
+# core_sim/checkpoint.py
+"""
+Simulator checkpoints: the full dynamic state of a run at step k, stored as
+per-cell arrays plus a small JSON header. A checkpoint can resume an
+interrupted run or seed any number of independent what-if branches, in this
+process or in worker processes.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from core_sim.core_grid import CoreGrid
+
+CHECKPOINT_VERSION = 1
+
+# Per-cell attributes captured for every assembly that has them (NaN where it does not)
+STATE_FIELDS = ("enrichment", "temperature", "life", "age", "energy_output", "total_energy",
+                "insertion_level", "thermal_power")
+PENALTY_WEIGHTS = ("w_temp", "w_hotspot", "w_symmetry")
+HISTORY_FIELDS = ("temperature", "energy_output", "life", "flux")
+
+
+def capture_state(sim, include_history=False):
+    """
+    Captures the dynamic state of a fixed-step simulation after its last step.
+
+    Args:
+        sim (Simulator): Simulation to capture.
+        include_history (bool): Also store all logged frames and meta entries, so a
+            resumed run writes the same output as an uninterrupted one.
+
+    Returns:
+        dict: {"header": JSON-compatible dict, "arrays": {name: np.ndarray}}.
+    """
+    if sim.adaptive:
+        raise ValueError("Checkpoints are only supported for fixed-step simulations")
+
+    grid = sim.grid
+    shape = (grid.height, grid.width)
+    type_names, arrays = grid_arrays(grid)
+
+    header = {
+        "version": CHECKPOINT_VERSION,
+        "step": sim.current_step,
+        "max_timesteps": sim.T,
+        "width": grid.width,
+        "height": grid.height,
+        "type_names": type_names,
+        "fixed_positions": sorted([x, y] for x, y in grid.fixed_positions),
+        "penalty_weights": {name: getattr(sim.penalty_calculator, name) for name in PENALTY_WEIGHTS},
+        "params": sim.params.as_dict(),
+        "dtype": sim.dtype.name,
+        "recording": sim.recording,
+        "last_meta": sim.meta_history[-1] if sim.meta_history else None,
+        "history": None,
+    }
+
+    if include_history:
+        trajectory = sim.recorder.trajectory
+        if sim.recording == "frames" and trajectory is not None:
+            # Frames streamed to a trajectory store are not kept in memory; read them back
+            total_energy = list(trajectory.aggregates["total_energy"])
+            logs = {field: trajectory.frames(field) for field in HISTORY_FIELDS}
+        else:
+            total_energy = [float(frame.flat[0]) for frame in sim.total_energy_log]
+            logs = {
+                "temperature": sim.temperature_log,
+                "energy_output": sim.energy_output_log,
+                "life": sim.life_log,
+                "flux": sim.flux_log,
+            }
+        header["history"] = {
+            "meta": sim.meta_history,
+            "total_energy": total_energy,
+        }
+        for field in HISTORY_FIELDS:
+            arrays[f"history_{field}"] = np.array(logs[field], dtype=sim.dtype).reshape((-1,) + shape)
+        if sim.recorder.stats is not None:
+            arrays.update({f"cellstats_{name}": value for name, value in sim.recorder.stats.state().items()})
+
+    # Round trip through JSON so in-process branches see exactly what a loaded file holds
+    return {"header": json.loads(json.dumps(header)), "arrays": arrays}
+
+
+def grid_arrays(grid):
+    """
+    Per-cell arrays of a grid: type codes, is_movable and one state_<field> array per STATE_FIELDS entry.
+
+    Returns:
+        tuple: (type_names indexed by code, {name: (height, width) np.ndarray}).
+    """
+    shape = (grid.height, grid.width)
+    cells = [fa for row in grid.grid for fa in row]
+    type_names = sorted({fa.type for fa in cells})
+    codes = {name: code for code, name in enumerate(type_names)}
+
+    arrays = {
+        "types": np.array([codes[fa.type] for fa in cells], dtype=np.uint8).reshape(shape),
+        "is_movable": np.array([fa.is_movable for fa in cells], dtype=bool).reshape(shape),
+    }
+    for field in STATE_FIELDS:
+        arrays[f"state_{field}"] = np.array([getattr(fa, field, np.nan) for fa in cells],
+                                            dtype=np.float64).reshape(shape)
+    return type_names, arrays
+
+
+def build_grid(state):
+    """Builds a CoreGrid with every assembly set to the captured state."""
+    header, arrays = state["header"], state["arrays"]
+    grid = CoreGrid(width=header["width"], height=header["height"])
+    grid.fixed_positions = {(x, y) for x, y in header["fixed_positions"]}
+
+    types = arrays["types"].tolist()
+    is_movable = arrays["is_movable"].tolist()
+    values = {field: arrays[f"state_{field}"].tolist() for field in STATE_FIELDS}
+    names = header["type_names"]
+
+    for y in range(grid.height):
+        for x in range(grid.width):
+            fa_type = names[types[y][x]]
+            if fa_type == "fuel":
+                grid.set_assembly(x, y, fa_type, enrichment=values["enrichment"][y][x],
+                                  life=values["life"][y][x], is_movable=is_movable[y][x])
+            else:
+                grid.set_assembly(x, y, fa_type)
+
+            fa = grid.get_fa(x, y)
+            cell = {field: values[field][y][x] for field in STATE_FIELDS if hasattr(fa, field)}
+            cell["is_movable"] = is_movable[y][x]
+            if fa.is_flyweight and all(getattr(fa, name) == value for name, value in cell.items()):
+                continue
+            fa = grid.mutable_fa(x, y)
+            for name, value in cell.items():
+                setattr(fa, name, value)
+    return grid
+
+
+def restore_simulator(sim, state):
+    """Restores step counter, penalty weights and (if captured) logged history onto `sim`."""
+    header, arrays = state["header"], state["arrays"]
+    if (header["width"], header["height"]) != (sim.grid.width, sim.grid.height):
+        raise ValueError("Checkpoint grid size does not match the simulator grid")
+
+    for name, value in header["penalty_weights"].items():
+        setattr(sim.penalty_calculator, name, value)
+    sim.current_step = header["step"]
+
+    history = header.get("history")
+    if not history:
+        sim.meta_history = [header["last_meta"]] if header["last_meta"] else []
+        return
+
+    sim.meta_history = list(history["meta"])
+    if sim.record:
+        frames = [arrays[f"history_{field}"] for field in HISTORY_FIELDS]
+        for i, total_energy in enumerate(history["total_energy"]):
+            temperature, energy_output, life, flux = (np.array(frame[i]) for frame in frames)
+            sim._log_frame(temperature, energy_output, life, total_energy, flux, sim.meta_history[i])
+        if sim.recorder.stats is not None and "cellstats_count" in arrays:
+            sim.recorder.stats.load_state({name[len("cellstats_"):]: value for name, value in arrays.items()
+                                           if name.startswith("cellstats_")})
+            sim.recorder.meta_log[:] = sim.meta_history[-1:]
+
+
+def save_checkpoint(state, path):
+    """Writes a checkpoint as a single .npz file (atomically replacing an older one)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, header=np.array(json.dumps(state["header"])), **state["arrays"])
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    with np.load(path, allow_pickle=False) as data:
+        header = json.loads(str(data["header"]))
+        arrays = {name: data[name] for name in data.files if name != "header"}
+    if header.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {header.get('version')} in {path}")
+    return {"header": header, "arrays": arrays}
+
+
+def swap_assemblies(grid, a, b):
+    """Layout modifier for branches: swaps the assemblies (with their state) at positions a and b."""
+    grid.swap(a, b)
+
+
+def run_branch(state, modify=None, steps=None, **sim_kwargs):
+    """
+    Continues a checkpoint as an independent branch and returns its final meta entry.
+
+    Args:
+        state (dict): Checkpoint from capture_state / load_checkpoint.
+        modify (callable): Optional `modify(grid)` applied to the restored grid
+            before the branch starts (must be picklable for worker processes).
+        steps (int): Steps to run; default runs up to max_timesteps.
+        **sim_kwargs: Passed to Simulator (record defaults to False).
+    """
+    from core_sim.simulator import Simulator
+
+    sim_kwargs.setdefault("record", False)
+    sim = Simulator.from_checkpoint(state, modify=modify, **sim_kwargs)
+    end = sim.T if steps is None else min(sim.T, sim.current_step + steps)
+    while sim.current_step < end:
+        sim.step()
+    if sim.record:
+        sim.save()
+
+    final = sim.meta_history[-1]
+    return {
+        "step": sim.current_step,
+        "fitness": final["fitness"],
+        "total_energy": final["total_energy"],
+        "penalties": final["penalties"],
+    }
+
+
+def fork_many(state, variants, steps=None, workers=None, **sim_kwargs):
+    """
+    Runs one branch per variant from the same checkpoint.
+
+    Args:
+        state (dict): Checkpoint to fork from.
+        variants (list): `modify(grid)` callables (None = unmodified continuation).
+        steps (int): Steps per branch; default runs up to max_timesteps.
+        workers (int): Worker processes; None or 1 runs the branches in this process.
+
+    Returns:
+        list[dict]: run_branch results, in the order of `variants`.
+    """
+    if not workers or workers <= 1:
+        return [run_branch(state, modify, steps, **sim_kwargs) for modify in variants]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_branch, state, modify, steps, **sim_kwargs) for modify in variants]
+        return [future.result() for future in futures]
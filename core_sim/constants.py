@@ -1,4 +1,6 @@
 # core_sim/constants.py
+from dataclasses import asdict, dataclass, replace
+
 TIMESTEPS = 1000
 INITIAL_FUEL_ENERGY_OUTPUT = 10.0
 MAX_TEMPERATURE = 1800.0
@@ -13,3 +15,33 @@ T_MIN = 300.0
 T_MAX = 1800.0
 BASE_ALPHA = 1e-5  # Adjust as needed for realistic ΔT per step
 AGE_DECAY_COEFF = 0.0005  # Heating efficiency decay with age
+
+
+@dataclass(frozen=True)
+class SimulationParams:
+    """
+    Immutable set of model parameters, passed to Simulator (and from there to
+    Fuel, the burnup model and the flux model) instead of read from module
+    globals, so differently parameterized runs can share one process or pool.
+    Defaults are the module constants above.
+    """
+    initial_fuel_energy_output: float = INITIAL_FUEL_ENERGY_OUTPUT
+    t_opt: float = T_OPT
+    sigma_t: float = SIGMA_T
+    energy_constant: float = ENERGY_CONSTANT
+    thermal_capacity: float = THERMAL_CAPACITY
+    cooling_coeff: float = COOLING_COEFF
+    burn_rate_base: float = BURN_RATE_BASE
+    t_min: float = T_MIN
+    t_max: float = T_MAX
+    diffusion_coeff: float = 0.2
+
+    def replace(self, **changes):
+        """Returns a copy with some parameters changed (unknown names raise TypeError)."""
+        return replace(self, **changes)
+
+    def as_dict(self):
+        return asdict(self)
+
+
+DEFAULT_PARAMS = SimulationParams()
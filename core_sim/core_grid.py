@@ -1,18 +1,56 @@
 # core_sim/core_grid.py
 
 import json
+from copy import deepcopy
+
+import numpy as np
 from core_sim.assemblies.base_assembly import FuelAssembly
 from core_sim.assemblies.fuel import Fuel
 from core_sim.assemblies.empty import Blank
 from core_sim.assemblies.moderator import Moderator
 from core_sim.assemblies.control_rod import ControlRod
 
+# Layout files use both the editor spelling ("ControlRod") and the generator spelling ("control_rod")
+TYPE_ALIASES = {
+    "fuel": "Fuel",
+    "control_rod": "ControlRod",
+    "moderator": "Moderator",
+    "blank": "Blank",
+}
+
+STATIC_ASSEMBLIES = {
+    "ControlRod": ControlRod,
+    "Moderator": Moderator,
+    "Blank": Blank.shared,
+}
+
+
+def _no_assembly():
+    return None
+
+
+NEIGHBOR_OFFSETS = (
+    (-1, 0, 1.0),  # left
+    (1, 0, 1.0),  # right
+    (0, -1, 1.0),  # up
+    (0, 1, 1.0),  # down
+    (-1, -1, 0.4),  # top-left diagonal
+    (-1, 1, 0.4),  # bottom-left diagonal
+    (1, -1, 0.4),  # top-right diagonal
+    (1, 1, 0.4),  # bottom-right diagonal
+)
+
+
 class CoreGrid:
     def __init__(self, width=30, height=30):
         self.width = width
         self.height = height
-        self.grid = [[Blank() for _ in range(width)] for _ in range(height)]
+        self.grid = [[Blank.shared()] * width for _ in range(height)]
         self.fixed_positions = set()  # Positions that are static and should not be overwritten
+        self._neighbor_table = None
+        # Positions whose assembly objects belong to this grid alone; None means all of them.
+        # After clone()/restore() cells are shared with another grid until they are copied on write.
+        self._private = None
 
     # Add this to your CoreGrid class
     def in_bounds(self, x: int, y: int) -> bool:
@@ -23,42 +61,138 @@ class CoreGrid:
         """Insert a FuelAssembly at (x, y). Returns True if successful."""
         if 0 <= x < self.width and 0 <= y < self.height:
             self.grid[y][x] = fa
+            self._mark_private(x, y)
             return True
         return False
 
     def get_fa(self, x, y):
-        """Retrieve the FuelAssembly at (x, y), or None if out of bounds."""
+        """
+        Retrieve the FuelAssembly at (x, y), or None if out of bounds.
+
+        The object is returned for reading. After clone(), snapshot() or restore()
+        it may still be shared with another grid, and a flyweight cell is shared by
+        every grid. Setting its attributes directly would change those grids too,
+        so use mutable_fa() for any in-place change.
+        """
         if 0 <= x < self.width and 0 <= y < self.height:
             return self.grid[y][x]
         return None
 
+    def mutable_fa(self, x, y):
+        """
+        Returns the FuelAssembly at (x, y) for in-place modification. Shared
+        flyweight cells (see Blank.shared) and cells still shared with a clone
+        or snapshot are first replaced by a private copy.
+        """
+        fa = self.get_fa(x, y)
+        if fa is None:
+            return None
+        if fa.is_flyweight:
+            fa = fa.private_copy()
+        elif self._private is not None and (x, y) not in self._private:
+            fa = deepcopy(fa)
+        else:
+            return fa
+        self.grid[y][x] = fa
+        self._mark_private(x, y)
+        return fa
+
+    def swap(self, a, b):
+        """Swaps the assemblies (objects and their state) at positions a = (x1, y1) and b = (x2, y2)."""
+        (x1, y1), (x2, y2) = a, b
+        self.grid[y1][x1], self.grid[y2][x2] = self.grid[y2][x2], self.grid[y1][x1]
+        if self._private is not None:
+            # Ownership moves with the objects
+            owned_a, owned_b = (x1, y1) in self._private, (x2, y2) in self._private
+            self._private.discard((x1, y1))
+            self._private.discard((x2, y2))
+            if owned_a:
+                self._private.add((x2, y2))
+            if owned_b:
+                self._private.add((x1, y1))
+
+    def _mark_private(self, x, y):
+        if self._private is not None:
+            self._private.add((x, y))
+
+    @property
+    def has_shared_cells(self) -> bool:
+        """True if some assembly objects may still be shared with a clone or snapshot."""
+        return self._private is not None
+
+    def own_cells(self):
+        """
+        Copies every assembly still shared with a clone or snapshot, so the grid
+        can be mutated in place (the simulator calls this before updating cells).
+        Flyweight cells stay shared; they are never modified in place.
+        """
+        if self._private is None:
+            return
+        private = self._private
+        for y, row in enumerate(self.grid):
+            for x, fa in enumerate(row):
+                if fa is not None and not fa.is_flyweight and (x, y) not in private:
+                    row[x] = deepcopy(fa)
+        self._private = None
+
+    def clone(self) -> "CoreGrid":
+        """
+        Returns an independent copy of the grid in O(height).
+
+        Only the row lists are copied. Dimensions, fixed_positions and the
+        neighbor table are shared, and assembly objects are shared copy-on-write:
+        both grids copy a cell before changing it (mutable_fa / own_cells).
+        get_fa() keeps returning the shared object, so change cells through mutable_fa().
+        """
+        other = CoreGrid.__new__(CoreGrid)
+        other.width = self.width
+        other.height = self.height
+        other.grid = [row[:] for row in self.grid]
+        other.fixed_positions = self.fixed_positions
+        other._neighbor_table = self.neighbor_table
+        other._private = set()
+        self._private = set()
+        return other
+
+    def snapshot(self) -> "CoreGrid":
+        """Captures the current layout and assembly state for a later restore(); O(height)."""
+        return self.clone()
+
+    def restore(self, snapshot: "CoreGrid"):
+        """
+        Resets the grid to a snapshot taken with snapshot() (or any clone of the
+        same size). The snapshot stays valid and can be restored again.
+        """
+        if (snapshot.width, snapshot.height) != (self.width, self.height):
+            raise ValueError(f"Cannot restore a {snapshot.width}x{snapshot.height} snapshot "
+                             f"into a {self.width}x{self.height} grid")
+        self.grid = [row[:] for row in snapshot.grid]
+        self.fixed_positions = snapshot.fixed_positions
+        self._private = set()
+        snapshot._private = set()
+
+    @property
+    def neighbor_table(self):
+        """Per-cell list of in-bounds (x, y, weight) neighbors; built once and shared by clones."""
+        if self._neighbor_table is None:
+            self._neighbor_table = [
+                [
+                    [(x + dx, y + dy, weight) for dx, dy, weight in NEIGHBOR_OFFSETS if self.in_bounds(x + dx, y + dy)]
+                    for x in range(self.width)
+                ]
+                for y in range(self.height)
+            ]
+        return self._neighbor_table
+
     def get_neighbors(self, x, y):
-        offsets_with_weights = [
-            (-1, 0, 1.0),  # left
-            (1, 0, 1.0),  # right
-            (0, -1, 1.0),  # up
-            (0, 1, 1.0),  # down
-            (-1, -1, 0.4),  # top-left diagonal
-            (-1, 1, 0.4),  # bottom-left diagonal
-            (1, -1, 0.4),  # top-right diagonal
-            (1, 1, 0.4),  # bottom-right diagonal
-        ]
+        grid = self.grid
         neighbors = []
-        for dx, dy, weight in offsets_with_weights:
-            fa = self.get_fa(x + dx, y + dy)
+        for nx, ny, weight in self.neighbor_table[y][x]:
+            fa = grid[ny][nx]
             if fa is not None:
                 neighbors.append((fa, weight))
         return neighbors
 
-        # diagonal offsets with weight 0.4
-        offsets_04 = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-        for dx, dy in offsets_04:
-            neighbor = self.get_fa(x + dx, y + dy)
-            if neighbor is not None:
-                neighbors.append((neighbor, 0.4))
-
-        return neighbors
-
     def load_special_layout(self, filepath: str):
         """
         Load static layout (moderators, control rods, blanks) from a JSON file.
@@ -76,14 +210,16 @@ class CoreGrid:
             elif kind == 'control':
                 fa = ControlRod()
             elif kind == 'blank':
-                fa = Blank()
+                fa = Blank.shared()
             else:
                 raise ValueError(f"Unknown assembly type in layout: {kind}")
 
             self.insert_fa(x, y, fa)
-            self.fixed_positions.add((x, y))
+            # Rebound rather than mutated: clones share the set
+            self.fixed_positions = self.fixed_positions | {(x, y)}
 
     def set_assembly(self, x: int, y: int, fa_type: str, **kwargs):
+        fa_type = TYPE_ALIASES.get(fa_type, fa_type)
         if fa_type == "Fuel":
             self.grid[y][x] = Fuel(**kwargs)
         elif fa_type == "ControlRod":
@@ -91,9 +227,10 @@ class CoreGrid:
         elif fa_type == "Moderator":
             self.grid[y][x] = Moderator()
         elif fa_type == "Blank":
-            self.grid[y][x] = Blank()
+            self.grid[y][x] = Blank.shared()
         else:
             raise ValueError(f"Unknown fuel assembly type '{fa_type}' at ({x}, {y})")
+        self._mark_private(x, y)
 
     def initialize_from_layout(self, layout_data: dict):
         """
@@ -112,6 +249,57 @@ class CoreGrid:
 
                 self.set_assembly(x, y, fa_type, **params)
 
+    def initialize_from_binary(self, arrays: dict):
+        """
+        Initializes the grid from decoded binary layout arrays
+        (see layout_utils.binary_layout.decode_layout_arrays).
+
+        Static cells are built straight from the type-code array; only cells with
+        per-cell parameters go through set_assembly.
+        """
+        from layout_utils.binary_layout import sparse_params
+
+        names = [TYPE_ALIASES.get(name, name) for name in arrays["type_names"]]
+        for name in names:
+            if name != "Fuel" and name not in STATIC_ASSEMBLIES:
+                raise ValueError(f"Unknown fuel assembly type '{name}' in binary layout")
+
+        # Fuel cells are left empty here and built from the sparse parameters below
+        codes = arrays["codes"]
+        factories = [STATIC_ASSEMBLIES.get(name, _no_assembly) for name in names]
+        self.grid = [[factories[code]() for code in row] for row in codes.tolist()]
+        self._private = None  # every cell is a fresh object
+
+        fuel_mask = np.isin(codes, [code for code, name in enumerate(names) if name == "Fuel"])
+        fuel_mask.flat[arrays["sparse"]["index"]] = False
+
+        for x, y, params, _ in sparse_params(arrays):
+            fa_type = names[codes[y, x]]
+            if fa_type == "Fuel":
+                self.grid[y][x] = Fuel(**params)
+            else:
+                self.set_assembly(x, y, fa_type, **params)
+
+        # Fuel without parameters fails exactly like it does for JSON layouts
+        for y, x in zip(*np.nonzero(fuel_mask)):
+            self.set_assembly(int(x), int(y), "Fuel")
+
+    @classmethod
+    def from_layout_file(cls, path: str) -> "CoreGrid":
+        """Builds a CoreGrid sized to the layout stored in a JSON or binary layout file."""
+        from layout_utils.binary_layout import is_binary_layout, load_binary_layout_arrays
+        from layout_utils.load_layout import load_layout
+
+        if is_binary_layout(path):
+            arrays = load_binary_layout_arrays(path)
+            grid = cls(width=arrays["width"], height=arrays["height"])
+            grid.initialize_from_binary(arrays)
+        else:
+            layout = load_layout(path)
+            grid = cls(width=layout["width"], height=layout["height"])
+            grid.initialize_from_layout(layout)
+        return grid
+
     def __iter__(self):
         """Allows iteration over the grid, yielding (x, y, FuelAssembly) triples."""
         for y in range(self.height):
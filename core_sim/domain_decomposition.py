@@ -0,0 +1,360 @@
+# core_sim/domain_decomposition.py
+"""
+Domain decomposition of one large simulation across worker processes.
+
+The grid is split into rectangular tiles, one per worker. Per-cell state
+lives in multiprocessing.shared_memory arrays (the checkpoint layout: one
+(height, width) layer per state field, plus neutron yield and flux). Each
+worker rebuilds only its tile and a one-cell halo as assembly objects and,
+every step:
+
+    1. refreshes its halo (ghost) cells from the state its neighbors published,
+    2. publishes the neutron yield of its cells          -> halo barrier
+    3. computes the 3x3 diffusion flux of its tile from the yield halo,
+       updates its cells in row-major order (8-neighbor stencil) and
+       publishes their new state                         -> publish barrier
+    4. writes per-tile partial sums (energy and the PenaltyCalculator
+       temperature / low-life / hotspot terms)            -> step barrier
+
+after which the main process combines the partial sums into the step's
+total energy and penalties, and scores the step from the shared fuel state.
+
+With one worker the run is identical to Simulator. With several, a cell on
+the top or left edge of a tile sees its neighbors in other tiles as of the
+previous step (the serial engine updates in row-major order and would see
+some of them already updated), so results differ slightly along tile seams;
+benchmarks.domain_decomposition reports that deviation with the scaling.
+"""
+
+import math
+import multiprocessing
+import time
+import traceback
+from multiprocessing import shared_memory
+from threading import BrokenBarrierError
+
+import numpy as np
+
+from core_sim.checkpoint import STATE_FIELDS, build_grid, grid_arrays
+from core_sim.flux_models import LAPLACIAN_KERNEL
+from core_sim.penalties import PenaltyCalculator
+
+# Layers of the shared float64 state block
+LAYERS = STATE_FIELDS + ("neutron_yield", "flux")
+LAYER = {name: i for i, name in enumerate(LAYERS)}
+DYNAMIC_FIELDS = tuple(field for field in STATE_FIELDS if field != "enrichment")
+
+# Per-worker partial sums combined by the main process after every step
+REDUCTIONS = ("total_energy", "temp_penalty", "overheated", "cells", "low_life", "hotspot")
+RED = {name: i for i, name in enumerate(REDUCTIONS)}
+
+
+def tile_shape(height, width, workers):
+    """
+    Tile rows x columns for `workers` tiles, as close to square tiles as the factorization allows.
+
+    Returns:
+        tuple: (rows, cols) with rows * cols == workers.
+    """
+    best = None
+    for rows in range(1, workers + 1):
+        if workers % rows:
+            continue
+        cols = workers // rows
+        if rows > height or cols > width:
+            continue
+        aspect = abs(math.log((height / rows) / (width / cols)))
+        if best is None or aspect < best[0]:
+            best = (aspect, rows, cols)
+    if best is None:
+        raise ValueError(f"Cannot split a {width}x{height} grid into {workers} tiles")
+    return best[1], best[2]
+
+
+def tile_bounds(height, width, workers):
+    """(y0, y1, x0, x1) of every tile, row-major; edges differ by at most one cell between tiles."""
+    rows, cols = tile_shape(height, width, workers)
+    ys = np.linspace(0, height, rows + 1).round().astype(int)
+    xs = np.linspace(0, width, cols + 1).round().astype(int)
+    return [(int(ys[r]), int(ys[r + 1]), int(xs[c]), int(xs[c + 1])) for r in range(rows) for c in range(cols)]
+
+
+def _attach(name, shape, dtype):
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _tile_flux(neutron_yield, bounds, window, diffusion_coeff):
+    """
+    Flux of one tile from the neutron yield of its window (tile + halo); same arithmetic,
+    cell by cell, as flux_models.diffusion_approx_flux on the whole grid.
+    """
+    y0, y1, x0, x1 = bounds
+    wy0, wy1, wx0, wx1 = window
+    height, width = neutron_yield.shape
+    # Edge replication only where the tile touches the grid border; elsewhere the halo is real data
+    padded = np.pad(neutron_yield[wy0:wy1, wx0:wx1],
+                    ((1 if y0 == 0 else 0, 1 if y1 == height else 0),
+                     (1 if x0 == 0 else 0, 1 if x1 == width else 0)), mode="edge")
+    th, tw = y1 - y0, x1 - x0
+    flipped = LAPLACIAN_KERNEL[::-1, ::-1]
+    laplacian = np.zeros((th, tw))
+    for dy in range(3):
+        for dx in range(3):
+            laplacian += flipped[dy, dx] * padded[dy:dy + th, dx:dx + tw]
+    return neutron_yield[y0:y1, x0:x1] + diffusion_coeff * laplacian
+
+
+def _worker(index, bounds, spec, barriers, errors):
+    start_barrier, halo_barrier, publish_barrier, step_barrier = barriers
+    blocks = []
+    try:
+        state_shm, state = _attach(spec["state"], (len(LAYERS), spec["height"], spec["width"]), np.float64)
+        static_shm, static = _attach(spec["static"], (2, spec["height"], spec["width"]), np.uint8)
+        red_shm, reductions = _attach(spec["reductions"], (spec["workers"] + 1, len(REDUCTIONS)), np.float64)
+        blocks = [state_shm, static_shm, red_shm]
+        _run_tile(index, bounds, spec, state, static, reductions, barriers)
+    except BrokenBarrierError:
+        pass  # Another process failed and aborted the barriers
+    except BaseException:
+        errors.put(f"Tile worker {index} {bounds}:\n{traceback.format_exc()}")
+        for barrier in barriers:
+            barrier.abort()
+    finally:
+        for shm in blocks:
+            shm.close()
+
+
+def _run_tile(index, bounds, spec, state, static, reductions, barriers):
+    start_barrier, halo_barrier, publish_barrier, step_barrier = barriers
+    height, width = spec["height"], spec["width"]
+    y0, y1, x0, x1 = bounds
+    window = wy0, wy1, wx0, wx1 = max(0, y0 - 1), min(height, y1 + 1), max(0, x0 - 1), min(width, x1 + 1)
+    oy, ox = y0 - wy0, x0 - wx0
+
+    # Local grid over the window, built from the shared state like a checkpoint
+    arrays = {"types": static[0, wy0:wy1, wx0:wx1].copy(), "is_movable": static[1, wy0:wy1, wx0:wx1].astype(bool)}
+    for field in STATE_FIELDS:
+        arrays[f"state_{field}"] = state[LAYER[field], wy0:wy1, wx0:wx1].copy()
+    local = build_grid({"header": {"width": wx1 - wx0, "height": wy1 - wy0, "fixed_positions": [],
+                                   "type_names": spec["type_names"]}, "arrays": arrays})
+    params = spec["params"]
+    for row in local.grid:
+        for fa in row:
+            if fa.type == "fuel":
+                fa.params = params
+
+    own_rows = [local.grid[ly][ox:ox + x1 - x0] for ly in range(oy, oy + y1 - y0)]
+    ghosts = [(lx, ly, fa, [field for field in DYNAMIC_FIELDS if hasattr(fa, field)])
+              for ly, row in enumerate(local.grid) for lx, fa in enumerate(row)
+              if not (oy <= ly < oy + y1 - y0 and ox <= lx < ox + x1 - x0) and not fa.is_flyweight]
+    calc = PenaltyCalculator
+    control = reductions[spec["workers"]]
+
+    while True:
+        start_barrier.wait()
+        if control[0]:
+            return
+
+        # 1. Ghost cells take the state their owners published at the end of the last step
+        if ghosts:
+            windows = {field: state[LAYER[field], wy0:wy1, wx0:wx1].tolist() for field in DYNAMIC_FIELDS}
+            for lx, ly, fa, fields in ghosts:
+                for field in fields:
+                    setattr(fa, field, windows[field][ly][lx])
+
+        # 2. Neutron yield of the tile, read by the neighbors' flux kernels
+        state[LAYER["neutron_yield"], y0:y1, x0:x1] = [[fa.neutron_yield() for fa in row] for row in own_rows]
+        halo_barrier.wait()
+
+        # 3. Flux and cell updates
+        flux_map = _tile_flux(state[LAYER["neutron_yield"]], bounds, window, params.diffusion_coeff)
+        flux_map *= 1.0 - np.array([[fa.absorption_factor() for fa in row] for row in own_rows])
+        state[LAYER["flux"], y0:y1, x0:x1] = flux_map
+
+        total_energy = 0.0
+        for ty, row in enumerate(own_rows):
+            ly = oy + ty
+            for tx, fa in enumerate(row):
+                fa.update(neighbors=local.get_neighbors(ox + tx, ly), flux=flux_map[ty][tx], dt=1.0)
+                total_energy += fa.energy_output
+
+        for field in DYNAMIC_FIELDS:
+            state[LAYER[field], y0:y1, x0:x1] = [[getattr(fa, field, np.nan) for fa in row] for row in own_rows]
+        publish_barrier.wait()
+
+        # 4. Partial penalty sums, from the same PenaltyCalculator terms as the serial engine
+        temperature = state[LAYER["temperature"], y0:y1, x0:x1]
+        life = state[LAYER["life"]]
+        temp_penalty, overheated = calc.temperature_terms(temperature)
+        reductions[index] = (
+            total_energy,
+            temp_penalty,
+            overheated,
+            temperature.size,
+            calc.low_life_count(life[y0:y1, x0:x1]),
+            calc.hotspot_terms(life, bounds),
+        )
+        step_barrier.wait()
+
+
+class TiledSimulation:
+    """
+    Fixed-step simulation of one grid split across worker processes (see module docstring).
+
+    Wraps a record-less Simulator for initialization and penalty weights: after
+    run(), `sim.grid` holds the final state, `sim.meta_history` one scored entry per
+    step and `sim.current_step` the step count, so the
+    result can be inspected or checkpointed like a serial run.
+
+    Args:
+        grid (CoreGrid): Grid to simulate (modified in place, as by Simulator).
+        max_timesteps (int): Steps to run.
+        workers (int): Worker processes, one tile each.
+        params (SimulationParams): Model parameters; default DEFAULT_PARAMS.
+        trajectory_path (str): Optional trajectory store for the per-step frames.
+    """
+
+    def __init__(self, grid, max_timesteps, workers=2, params=None, trajectory_path=None):
+        from core_sim.simulator import Simulator
+
+        self.sim = Simulator(grid, max_timesteps, record=False, params=params)
+        self.T = max_timesteps
+        self.workers = workers
+        self.tiles = tile_bounds(grid.height, grid.width, workers)
+        self.trajectory_path = trajectory_path
+        self.step_times = []
+
+    def run(self, progress=None):
+        """
+        Runs all steps and returns the final fitness.
+
+        Args:
+            progress: Optional object with update(n) (e.g. a tqdm bar), called once per step.
+        """
+        from optimization.symmetry import symmetry_score
+
+        sim, grid = self.sim, self.sim.grid
+        height, width = grid.height, grid.width
+        type_names, arrays = grid_arrays(grid)
+        symmetry = symmetry_score(grid)  # cell types never change during a run
+        fuel = arrays["types"] == type_names.index("fuel") if "fuel" in type_names else np.zeros((height, width), bool)
+
+        blocks = []
+        processes = []
+        ctx = multiprocessing.get_context()
+        try:
+            state_shm = shared_memory.SharedMemory(create=True, size=len(LAYERS) * height * width * 8)
+            static_shm = shared_memory.SharedMemory(create=True, size=2 * height * width)
+            red_shm = shared_memory.SharedMemory(create=True, size=(self.workers + 1) * len(REDUCTIONS) * 8)
+            blocks = [state_shm, static_shm, red_shm]
+            state = np.ndarray((len(LAYERS), height, width), dtype=np.float64, buffer=state_shm.buf)
+            static = np.ndarray((2, height, width), dtype=np.uint8, buffer=static_shm.buf)
+            reductions = np.ndarray((self.workers + 1, len(REDUCTIONS)), dtype=np.float64, buffer=red_shm.buf)
+            reductions[:] = 0.0
+            for field in STATE_FIELDS:
+                state[LAYER[field]] = arrays[f"state_{field}"]
+            static[0] = arrays["types"]
+            static[1] = arrays["is_movable"]
+
+            spec = {"state": state_shm.name, "static": static_shm.name, "reductions": red_shm.name,
+                    "height": height, "width": width, "workers": self.workers,
+                    "type_names": type_names, "params": sim.params}
+            barriers = (ctx.Barrier(self.workers + 1), ctx.Barrier(self.workers),
+                        ctx.Barrier(self.workers), ctx.Barrier(self.workers + 1))
+            errors = ctx.Queue()
+            processes = [ctx.Process(target=_worker, args=(i, bounds, spec, barriers, errors), daemon=True)
+                         for i, bounds in enumerate(self.tiles)]
+            for process in processes:
+                process.start()
+
+            writer = self._open_trajectory(type_names, arrays["types"])
+            start_barrier, _, _, step_barrier = barriers
+            try:
+                for step in range(self.T):
+                    started = time.perf_counter()
+                    start_barrier.wait()
+                    step_barrier.wait()
+                    self._combine(step, reductions[:self.workers], symmetry, state, fuel)
+                    self.step_times.append(time.perf_counter() - started)
+                    if writer is not None:
+                        writer.append(state[LAYER["temperature"]], state[LAYER["energy_output"]],
+                                      state[LAYER["life"]], state[LAYER["flux"]], sim.meta_history[-1]["total_energy"])
+                    if progress is not None:
+                        progress.update(1)
+                reductions[self.workers, 0] = 1.0  # stop flag, read after the next start barrier
+                start_barrier.wait()
+            except BrokenBarrierError:
+                message = errors.get() if _wait_for(errors) else "no traceback received"
+                raise RuntimeError(f"Tiled simulation failed in a worker process:\n{message}") from None
+
+            for process in processes:
+                process.join()
+            self._write_back(state)
+            if writer is not None:
+                writer.close(meta=sim.meta_history)
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+        sim.current_step = self.T
+        sim.grid_history = [[[fa.as_dict() for fa in row] for row in grid.grid]]
+        return sim.meta_history[-1]["fitness"]
+
+    def _combine(self, step, partials, symmetry, state, fuel):
+        """
+        Reduces the per-tile sums into the step's meta entry, with the serial weight updates,
+        and scores the step like Simulator.step() from the fuel cells of the shared state.
+        """
+        from core_sim.simulator import FITNESS_CONFIG
+        from optimization.fitness import compute_fitness
+
+        totals = partials.sum(axis=0)
+        calc = self.sim.penalty_calculator
+        cells = int(totals[RED["cells"]])
+        calc._adjust_temp_weight(int(totals[RED["overheated"]]), cells)
+        calc._adjust_hotspot_weight(int(totals[RED["low_life"]]), cells)
+        penalties = calc._combine(float(totals[RED["temp_penalty"]]), float(totals[RED["hotspot"]]), symmetry)
+        entry = {
+            "step": step,
+            "penalties": penalties,
+            "fitness": None,
+            "total_energy": float(totals[RED["total_energy"]]),
+        }
+        self.sim.meta_history.append(entry)
+
+        # compute_fitness only reads fuel cells, so one row of them in row-major order stands in for the grid
+        columns = [state[LAYER[field]][fuel].tolist() for field in ("life", "temperature", "enrichment", "total_energy")]
+        fuel_cells = [{"type": "fuel", "life": life, "temperature": temperature, "enrichment": enrichment,
+                       "total_energy": total_energy} for life, temperature, enrichment, total_energy in zip(*columns)]
+        entry["fitness"] = compute_fitness(self.sim.meta_history, [[fuel_cells]], config=FITNESS_CONFIG)
+
+    def _open_trajectory(self, type_names, types):
+        if not self.trajectory_path:
+            return None
+        from core_sim.trajectory import TrajectoryWriter
+        names = np.array(type_names, dtype=object)[types].tolist()
+        return TrajectoryWriter(self.trajectory_path, types.shape, self.T, names)
+
+    def _write_back(self, state):
+        """Copies the final shared state into the assemblies of the wrapped simulator's grid."""
+        values = {field: state[LAYER[field]].tolist() for field in DYNAMIC_FIELDS}
+        for y, row in enumerate(self.sim.grid.grid):
+            for x, fa in enumerate(row):
+                if fa.is_flyweight:
+                    continue
+                for field in DYNAMIC_FIELDS:
+                    if hasattr(fa, field):
+                        setattr(fa, field, values[field][y][x])
+
+
+def _wait_for(errors, timeout=5.0):
+    # A worker aborts the barriers before its traceback reaches the queue
+    deadline = time.monotonic() + timeout
+    while errors.empty() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return not errors.empty()
@@ -0,0 +1,329 @@
+# core_sim/ensemble.py
+"""
+Ensemble stepping: many same-shaped layouts advanced together as stacked
+(N, height, width) arrays instead of one Simulator and one assembly object per
+cell each. The "ensemble" backend of core_sim.evaluation runs on it.
+
+Every step follows Simulator.step exactly, for all N layouts at once:
+
+    1. the flux of the whole stack goes through convolve3x3_nearest (it only
+       depends on the cell types and enrichments, so it is computed once),
+    2. cells update in the serial engine's row-major order, each position
+       vectorized over the layouts (fuel, moderator and control rod rows
+       separately), so a cell sees exactly the neighbors Fuel.update would:
+       those before it in this step's new state, the rest in the previous one,
+    3. the simulate_metrics per-step statistics are reduced over each layout.
+
+Scalar exp / pow calls go through math, like the assembly classes, and sums
+are accumulated in the serial order, so the records are identical to
+simulate_metrics. Layouts the arrays cannot represent (empty cells, other
+burnup models, a fuel cell without flux, which fails the serial run) are left
+to simulate_metrics.
+"""
+
+import math
+import time
+
+import numpy as np
+
+from core_sim.burnup_models import HeuristicBurnupModel
+from core_sim.constants import DEFAULT_PARAMS
+from core_sim.core_grid import CoreGrid
+from core_sim.flux_models import LAPLACIAN_KERNEL, convolve3x3_nearest
+from core_sim.fuel_burnup import SECONDS_PER_STEP
+
+BLANK, FUEL, MODERATOR, CONTROL_ROD = range(4)
+TYPE_CODES = {"blank": BLANK, "fuel": FUEL, "moderator": MODERATOR, "control_rod": CONTROL_ROD}
+
+# Fuel.update's age ramp: 1 / (1 + exp(-AGE_STEEPNESS * (age - AGE_CENTER)))
+AGE_STEEPNESS = 0.05
+AGE_CENTER = 50
+
+
+def _build_grid(layout, params):
+    """The layout's grid as Simulator would start it, or None if the arrays cannot represent it."""
+    grid = CoreGrid(width=layout["width"], height=layout["height"])
+    grid.initialize_from_layout(layout)
+    for row in grid.grid:
+        for fa in row:
+            if fa is None or fa.type not in TYPE_CODES:
+                return None
+            if fa.type == "fuel":
+                if type(fa.burnup_model) is not HeuristicBurnupModel:
+                    return None
+                fa.params = params
+                fa.energy_output = params.initial_fuel_energy_output
+    return grid
+
+
+class EnsembleSimulation:
+    """
+    N same-shaped layouts stepped together (see module docstring). State lives in
+    flat (N * height * width) arrays; position p of layout i is index i * cells + p.
+
+    Args:
+        grids (list[CoreGrid]): Grids of the same size, built by _build_grid.
+        params (SimulationParams): Model parameters shared by all layouts.
+    """
+
+    def __init__(self, grids, params=None):
+        self.params = params or DEFAULT_PARAMS
+        self.height, self.width = grids[0].height, grids[0].width
+        self.cells = self.height * self.width
+        cells = [[fa for row in grid.grid for fa in row] for grid in grids]
+
+        self.types = np.array([[TYPE_CODES[fa.type] for fa in layout] for layout in cells], dtype=np.int8)
+        self.enrichment = np.array([[fa.enrichment for fa in layout] for layout in cells], dtype=np.float64)
+        self.temperature = np.array([[fa.temperature for fa in layout] for layout in cells], dtype=np.float64).ravel()
+        self.life = np.array([[fa.life for fa in layout] for layout in cells], dtype=np.float64).ravel()
+        self.total_energy = np.zeros(len(cells) * self.cells)
+        self.thermal_power = np.array([[getattr(fa, "thermal_power", 0.0) for fa in layout] for layout in cells],
+                                      dtype=np.float64).ravel()
+        self.insertion_level = np.array([[getattr(fa, "insertion_level", 0.0) for fa in layout] for layout in cells],
+                                        dtype=np.float64).ravel()
+        self.age = 0.0
+
+        # Step 1: the flux of diffusion_approx_flux, for the whole stack
+        shape = (len(cells), self.height, self.width)
+        neutron_yield = np.array([[fa.neutron_yield() for fa in layout] for layout in cells],
+                                 dtype=np.float64).reshape(shape)
+        absorption = np.array([[fa.absorption_factor() for fa in layout] for layout in cells],
+                              dtype=np.float64).reshape(shape)
+        flux = neutron_yield + self.params.diffusion_coeff * convolve3x3_nearest(neutron_yield, LAPLACIAN_KERNEL)
+        flux *= 1.0 - absorption
+        self.flux = flux.reshape(len(cells), self.cells)
+
+        table = grids[0].neighbor_table
+        self._neighbors = [
+            (np.array([nx + ny * self.width for nx, ny, _ in table[y][x]]),
+             np.array([weight for _, _, weight in table[y][x]]))
+            for y in range(self.height) for x in range(self.width)
+        ]
+        self._plan()
+
+    def __len__(self):
+        return len(self.types)
+
+    def fuel_without_flux(self):
+        """Layouts with a fuel cell whose flux is zero (Fuel.update divides by it)."""
+        return np.flatnonzero(((self.types == FUEL) & (self.flux == 0.0)).any(axis=1))
+
+    def keep(self, rows):
+        """Drops every layout but `rows` from the ensemble."""
+        rows = np.asarray(rows)
+        flat = (rows[:, None] * self.cells + np.arange(self.cells)).ravel()
+        self.types, self.enrichment, self.flux = self.types[rows], self.enrichment[rows], self.flux[rows]
+        for name in ("temperature", "life", "total_energy", "thermal_power", "insertion_level"):
+            setattr(self, name, getattr(self, name)[flat])
+        self._plan()
+
+    def _plan(self):
+        """Per position: the layouts holding each assembly type there, with their neighbor indices and types."""
+        self._positions = []
+        for p, (neighbors, weights) in enumerate(self._neighbors):
+            plan = {}
+            for code in (FUEL, MODERATOR, CONTROL_ROD):
+                rows = np.flatnonzero(self.types[:, p] == code)
+                if rows.size == 0:
+                    continue
+                index = rows[:, None] * self.cells + neighbors
+                kinds = self.types[rows][:, neighbors]
+                plan[code] = (rows, rows * self.cells + p, index, kinds)
+            self._positions.append((weights, plan))
+
+    def state(self, name):
+        """(N, height * width) view of a per-cell state array."""
+        return getattr(self, name).reshape(len(self), self.cells)
+
+    def step(self):
+        """Advances every layout by one timestep (dt = 1); returns each layout's total energy output."""
+        self.age += 1.0
+        age_factor = 1 / (1 + math.exp(-AGE_STEEPNESS * (self.age - AGE_CENTER)))
+        total_energy = np.zeros(len(self))
+        for p, (weights, plan) in enumerate(self._positions):
+            if FUEL in plan:
+                rows, cell, index, kinds = plan[FUEL]
+                energy = self._update_fuel(p, rows, cell, index, kinds, weights, age_factor)
+                total_energy[rows] += energy
+            if MODERATOR in plan:
+                self._update_moderator(*plan[MODERATOR], weights)
+            if CONTROL_ROD in plan:
+                self._update_control_rod(*plan[CONTROL_ROD], weights)
+        return total_energy
+
+    def _update_fuel(self, p, rows, cell, index, kinds, weights, age_factor):
+        """Fuel.update for the fuel cells at position p, with the heuristic burnup model."""
+        params = self.params
+        temperature = self.temperature[cell]
+        life = self.life[cell]
+        moderator, control_rod, fuel = kinds == MODERATOR, kinds == CONTROL_ROD, kinds == FUEL
+
+        # 1. Neighbor thermal influence
+        push = self.thermal_power[index] * weights
+        temp_change = np.where(moderator, push, np.where(control_rod, -push, 0.0)).cumsum(axis=1)[:, -1]
+        temperature = temperature + temp_change * 1.0
+
+        # 2. Average neighbor temperature (every neighbor is an assembly)
+        neighbor_temperature = self.temperature[index]
+        avg_temp = neighbor_temperature.cumsum(axis=1)[:, -1] / len(weights)
+
+        # 3. Flux modifier: product of influence_on flux multipliers ** weight
+        multiplier = np.where(
+            fuel,
+            (0.8 + 0.4 * self.life[index]) * np.maximum(0.8, 1.0 - 0.0005 * (neighbor_temperature - 300)),
+            np.where(control_rod, 1.0 - self.insertion_level[index] * 0.7, 1.0))
+        for j, weight in enumerate(weights.tolist()):
+            if weight != 1.0:
+                multiplier[:, j] = [value ** weight for value in multiplier[:, j].tolist()]
+        flux_modifier = multiplier.cumprod(axis=1)[:, -1]
+
+        # 4. Flux dynamics
+        life_efficiency = 1.0 - np.array([math.exp(-3.0 * value) for value in life.tolist()])
+        core_flux = self.flux[rows, p] * 100
+        local_flux = core_flux * flux_modifier * age_factor * life_efficiency
+        flux_factor = np.minimum(local_flux / core_flux, 1.0)
+
+        # 5. Temperature effect
+        temp_factor = np.array([math.exp(-0.5 * ((value - params.t_opt) / params.sigma_t) ** 2)
+                                for value in temperature.tolist()])
+
+        # 6. Energy production
+        energy_output = flux_factor * life * temp_factor * params.energy_constant
+
+        # 7. Heating / cooling
+        heating = energy_output * life
+        cooling = params.cooling_coeff * (1 + (1 - life) * 2.0) * (temperature - avg_temp)
+        delta_t = (heating - cooling) / (params.thermal_capacity * (life + 0.1))
+        temperature = np.maximum(params.t_min, np.minimum(temperature + delta_t * 1.0, params.t_max))
+
+        # 8. Life loss (HeuristicBurnupModel)
+        overheat_factor = 1.0 + np.maximum(0, temperature - 600)
+        burn_rate = params.burn_rate_base * overheat_factor
+        life_loss = life * burn_rate * (energy_output / params.energy_constant) \
+            * (SECONDS_PER_STEP * 1.0 / SECONDS_PER_STEP)
+
+        self.temperature[cell] = temperature
+        self.life[cell] = np.maximum(0.0, life - life_loss)
+        self.total_energy[cell] += energy_output * 1.0
+        return energy_output
+
+    def _fuel_neighbor_temperature(self, index, kinds, weights):
+        """Weighted mean temperature of the fuel neighbors and their total weight (Moderator / ControlRod)."""
+        fuel = kinds == FUEL
+        weighted = np.where(fuel, self.temperature[index] * weights, 0.0).cumsum(axis=1)[:, -1]
+        total_weight = np.where(fuel, weights, 0.0).cumsum(axis=1)[:, -1]
+        return weighted / np.where(total_weight > 0, total_weight, 1.0), total_weight
+
+    def _update_moderator(self, rows, cell, index, kinds, weights):
+        avg_fuel_temp, total_weight = self._fuel_neighbor_temperature(index, kinds, weights)
+        avg_fuel_temp = np.where(total_weight > 0, avg_fuel_temp, 1000.0)
+        thermal_power = self.thermal_power[cell]
+        self.thermal_power[cell] = np.where(
+            avg_fuel_temp > 1500, np.maximum(0.1, thermal_power - 0.1 * 1.0),
+            np.where(avg_fuel_temp < 1000, np.minimum(2.0, thermal_power + 0.1 * 1.0), thermal_power))
+        self.temperature[cell] = 320
+
+    def _update_control_rod(self, rows, cell, index, kinds, weights):
+        self.temperature[cell] = 450
+        avg_temp, total_weight = self._fuel_neighbor_temperature(index, kinds, weights)
+        insertion = self.insertion_level[cell]
+        updated = np.where(avg_temp > 1600, np.minimum(1.0, insertion + 0.05 * 1.0),
+                           np.where(avg_temp < 1000, np.maximum(0.0, insertion - 0.05 * 1.0), insertion))
+        self.insertion_level[cell] = np.where(total_weight > 0, updated, insertion)
+
+    def final_grid(self, i):
+        """Grid snapshot of layout i in the as_dict form compute_fitness reads."""
+        names = {code: name for name, code in TYPE_CODES.items()}
+        temperature, life = self.state("temperature")[i].tolist(), self.state("life")[i].tolist()
+        enrichment, total_energy = self.enrichment[i].tolist(), self.state("total_energy")[i].tolist()
+        cells = [{"type": names[code], "fa_type": names[code], "enrichment": enrichment[p],
+                  "temperature": temperature[p], "life": life[p], "total_energy": total_energy[p]}
+                 for p, code in enumerate(self.types[i].tolist())]
+        return [cells[y * self.width:(y + 1) * self.width] for y in range(self.height)]
+
+
+def ensemble_metrics(layouts, config):
+    """
+    simulate_metrics records of same-shaped layouts, simulated as one ensemble.
+
+    Args:
+        layouts (list[dict]): Layout JSON dicts, all of the same width and height.
+        config (dict): Resolved evaluation config (see core_sim.evaluation.resolve_config).
+
+    Returns:
+        list: One record per layout, or None for a layout the ensemble cannot run
+            (the caller falls back to simulate_metrics). wall_time_s is the ensemble's
+            wall time divided among its layouts.
+    """
+    from core_sim.simulator import FITNESS_CONFIG
+    from optimization.fitness import compute_fitness
+
+    start = time.perf_counter()
+    params = DEFAULT_PARAMS.replace(**config["params"]) if config["params"] else DEFAULT_PARAMS
+    grids = [_build_grid(layout, params) for layout in layouts]
+    records = [None] * len(layouts)
+    members = np.array([i for i, grid in enumerate(grids) if grid is not None])
+    if members.size == 0:
+        return records
+
+    ensemble = EnsembleSimulation([grids[i] for i in members], params)
+    runnable = np.setdiff1d(np.arange(len(ensemble)), ensemble.fuel_without_flux())
+    if runnable.size < len(ensemble):
+        members = members[runnable]
+        ensemble.keep(runnable)
+    if members.size == 0:
+        return records
+
+    types = ensemble.types
+    fuel_count = (types == FUEL).sum(axis=1)
+    blank_count = (types == BLANK).sum(axis=1)
+    n = len(members)
+    cumulative_energy, max_temp, avg_temp = np.zeros(n), np.zeros(n), np.zeros(n)
+    temp_violations, critical_violation = np.zeros(n, dtype=np.int64), np.zeros(n, dtype=bool)
+    results = {}
+
+    def finish(rows, total_energy, steps_completed):
+        for row in rows.tolist():
+            meta = {"total_energy": float(total_energy[row])}
+            fitness = compute_fitness([meta], [ensemble.final_grid(row)], config=FITNESS_CONFIG)
+            fuel, blank = int(fuel_count[row]), int(blank_count[row])
+            results[int(members[row])] = {
+                "fitness": float(fitness),
+                "total_energy": float(total_energy[row]),
+                "cumulative_energy": float(cumulative_energy[row]),
+                "max_temp": float(max_temp[row]),
+                "avg_temp": float(avg_temp[row]) / steps_completed,
+                "temp_violations": int(temp_violations[row]),
+                "critical_violation": bool(critical_violation[row]),
+                "steps_completed": steps_completed,
+                "fuel_count": fuel,
+                "fuel_ratio": fuel / (fuel + blank) if fuel + blank else 0.0,
+                "error": None,
+            }
+
+    for step in range(config["timesteps"]):
+        total_energy = ensemble.step()
+        cumulative_energy += total_energy
+
+        temperature = ensemble.state("temperature")
+        max_temp = np.maximum(max_temp, temperature.max(axis=1))
+        temp_violations += (temperature > config["temp_limit"]).sum(axis=1)
+        critical_violation |= (temperature > config["critical_temp"]).any(axis=1)
+        avg_temp += temperature.cumsum(axis=1)[:, -1] / ensemble.cells
+
+        if config["stop_on_critical"] and critical_violation.any():
+            finish(np.flatnonzero(critical_violation), total_energy, step + 1)
+            running = np.flatnonzero(~critical_violation)
+            if running.size == 0:
+                break
+            ensemble.keep(running)
+            members, fuel_count, blank_count = members[running], fuel_count[running], blank_count[running]
+            cumulative_energy, max_temp, avg_temp = cumulative_energy[running], max_temp[running], avg_temp[running]
+            temp_violations, critical_violation = temp_violations[running], critical_violation[running]
+    else:
+        finish(np.arange(len(members)), total_energy, config["timesteps"])
+
+    wall_time = (time.perf_counter() - start) / len(results)
+    for i, record in results.items():
+        records[i] = dict(record, wall_time_s=wall_time)
+    return records
@@ -0,0 +1,294 @@
+# core_sim/evaluation.py
+"""
+One batch evaluation API shared by the optimizers and the batch runner:
+evaluate_many(layouts, config) simulates every layout and returns one metric
+record per layout. The runs go to a backend: "serial" (this process), "pool"
+(a process pool), "ensemble" (same-shaped layouts stepped together as stacked
+arrays, see core_sim.ensemble) or "service" (a running core_sim.service, whose
+warm pool and stored results are shared by every client). Identical layouts in
+a batch are simulated once, and a cache dict can carry records across calls.
+
+    records = evaluate_many(["layouts/test_layout1.json", layout_dict],
+                            {"timesteps": 100, "backend": "pool", "workers": 4})
+
+A caller that evaluates many batches (an optimizer, once per generation) passes
+an EvaluationPool so the worker processes start once per run, not once per call:
+
+    with EvaluationPool(workers=4) as pool:
+        for population in generations:
+            evaluate_many(population, {"backend": "pool"}, pool=pool)
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core_sim.constants import DEFAULT_PARAMS, TIMESTEPS
+
+BACKENDS = ("serial", "pool", "ensemble", "service")
+
+DEFAULT_CONFIG = {
+    "timesteps": TIMESTEPS,
+    "params": None,             # SimulationParams overrides {name: value}
+    "simulator_config": None,   # Simulator(config=...)
+    "temp_limit": 800.0,        # Cell-steps above it count as temp_violations
+    "critical_temp": 1000.0,    # Any cell above it sets critical_violation...
+    "stop_on_critical": True,   # ...and ends the run at that step
+    "backend": "serial",
+    "workers": None,            # Pool size; defaults to the CPU count
+    "service_url": None,        # Defaults to the local service's default port
+    "output_dir": None,         # Save each run's recording here (serial and pool only)
+    "recording": "stats",       # Recording mode of saved runs ("stats" or "frames")
+}
+
+# Config entries that change a record (the rest only choose where the work runs)
+RESULT_KEYS = ("timesteps", "params", "simulator_config", "temp_limit", "critical_temp",
+               "stop_on_critical", "output_dir", "recording")
+
+
+def resolve_config(config=None):
+    """
+    DEFAULT_CONFIG updated with `config`, validated.
+
+    Raises:
+        ValueError: For unknown keys, an unknown backend, or options the ensemble / service
+            backends cannot honour.
+    """
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    unknown = set(config) - set(DEFAULT_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown evaluation options: {', '.join(sorted(unknown))} "
+                         f"(expected any of {', '.join(DEFAULT_CONFIG)})")
+    if config["backend"] not in BACKENDS:
+        raise ValueError(f"Unknown backend {config['backend']!r} (expected one of {', '.join(BACKENDS)})")
+    if dataclasses.is_dataclass(config["params"]):
+        config["params"] = dataclasses.asdict(config["params"])
+    if config["backend"] == "service" and (config["output_dir"] or config["simulator_config"]):
+        raise ValueError("The service backend does not support output_dir or simulator_config")
+    if config["backend"] == "ensemble" and config["output_dir"]:
+        raise ValueError("The ensemble backend does not record runs; use serial or pool with output_dir")
+    return config
+
+
+def evaluation_key(layout, config):
+    """Content hash of a layout and the result-relevant config entries (cache key)."""
+    payload = {"width": layout["width"], "height": layout["height"], "grid": layout["grid"]}
+    payload.update((key, config[key]) for key in RESULT_KEYS)
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:20]
+
+
+def simulate_metrics(layout, config, output_path=None):
+    """
+    Simulates one layout and summarizes the run.
+
+    Args:
+        layout (dict): Layout JSON.
+        config (dict): Resolved config (see resolve_config).
+        output_path (str): If set, the run is recorded and saved there.
+
+    Returns:
+        dict: fitness (Simulator score after the last step), total_energy (last step),
+            cumulative_energy (sum over steps), max_temp / avg_temp (peak and step-averaged mean
+            cell temperature), temp_violations, critical_violation, steps_completed, fuel_count,
+            fuel_ratio (fuel share of the Fuel and Blank cells), error (None or the exception
+            that ended the run) and wall_time_s; output_path and cell_stats when saved.
+    """
+    from core_sim.core_grid import CoreGrid
+    from core_sim.simulator import Simulator
+
+    start = time.perf_counter()
+    grid = CoreGrid(width=layout["width"], height=layout["height"])
+    grid.initialize_from_layout(layout)
+    fuel = [[fa is not None and fa.type == "fuel" for fa in row] for row in grid.grid]
+    fuel_count = sum(map(sum, fuel))
+    blank_count = sum(fa is not None and fa.type == "blank" for row in grid.grid for fa in row)
+
+    record = output_path is not None
+    sim = Simulator(grid, config["timesteps"], output_path=output_path or "output/simulation_log.json",
+                    config=config["simulator_config"], record=record,
+                    recording=config["recording"] if record else "stats",
+                    params=DEFAULT_PARAMS.replace(**config["params"]) if config["params"] else None)
+
+    cumulative_energy = 0.0
+    max_temp = 0.0
+    avg_temp = 0.0
+    temp_violations = 0
+    critical_violation = False
+    error = None
+    step = -1
+    try:
+        for step in range(config["timesteps"]):
+            sim.step()
+            cumulative_energy += sim.meta_history[-1]["total_energy"]
+
+            step_max_temp = 0.0
+            step_temps = []
+            for y in range(grid.height):
+                for x in range(grid.width):
+                    fa = grid.get_fa(x, y)
+                    if fa and hasattr(fa, "temperature"):
+                        temp = fa.temperature
+                        step_temps.append(temp)
+                        step_max_temp = max(step_max_temp, temp)
+                        if temp > config["temp_limit"]:
+                            temp_violations += 1
+                        if temp > config["critical_temp"]:
+                            critical_violation = True
+
+            max_temp = max(max_temp, step_max_temp)
+            if step_temps:
+                avg_temp += sum(step_temps) / len(step_temps)
+            if critical_violation and config["stop_on_critical"]:
+                break
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    steps_completed = step + 1
+    final = sim.meta_history[-1] if sim.meta_history else {}
+    result = {
+        "fitness": float(final["fitness"]) if final.get("fitness") is not None else None,
+        "total_energy": float(final.get("total_energy", 0.0)),
+        "cumulative_energy": cumulative_energy,
+        "max_temp": max_temp,
+        "avg_temp": avg_temp / steps_completed if steps_completed else 0.0,
+        "temp_violations": temp_violations,
+        "critical_violation": critical_violation,
+        "steps_completed": steps_completed,
+        "fuel_count": fuel_count,
+        "fuel_ratio": fuel_count / (fuel_count + blank_count) if fuel_count + blank_count else 0.0,
+        "error": error,
+    }
+    if record and sim.meta_history:
+        sim.save()
+        result["output_path"] = output_path
+        if sim.recorder.stats is not None:
+            result["cell_stats"] = sim.recorder.stats.summary(mask=fuel)
+    result["wall_time_s"] = time.perf_counter() - start
+    return result
+
+
+def _run_task(task):
+    layout, config, output_path = task
+    return simulate_metrics(layout, config, output_path)
+
+
+class EvaluationPool:
+    """
+    Worker processes for the "pool" backend that outlive a single evaluate_many call.
+    The executor starts on first use and stays up until close(); a closed pool starts
+    a fresh executor if it is used again. The owner closes it when its run ends
+    (or uses it as a context manager).
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = None
+
+    def map(self, tasks):
+        """simulate_metrics records of (layout, config, output_path) tasks, in order."""
+        if self.workers <= 1 or len(tasks) <= 1:
+            return [_run_task(task) for task in tasks]
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        chunksize = max(1, len(tasks) // (self.workers * 4))
+        return list(self._executor.map(_run_task, tasks, chunksize=chunksize))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _run_serial(tasks, config, pool=None):
+    return [_run_task(task) for task in tasks]
+
+
+def _run_pool(tasks, config, pool=None):
+    if pool is not None:
+        return pool.map(tasks)
+    with EvaluationPool(min(config["workers"] or os.cpu_count() or 1, len(tasks))) as pool:
+        return pool.map(tasks)
+
+
+def _run_ensemble(tasks, config, pool=None):
+    from core_sim.ensemble import ensemble_metrics
+
+    groups = {}
+    for i, (layout, _, _) in enumerate(tasks):
+        groups.setdefault((layout["height"], layout["width"]), []).append(i)
+    records = [None] * len(tasks)
+    for members in groups.values():
+        for i, record in zip(members, ensemble_metrics([tasks[i][0] for i in members], config)):
+            records[i] = record
+    # Layouts the ensemble cannot represent run on the per-assembly engine
+    return [record if record is not None else _run_task(task) for record, task in zip(records, tasks)]
+
+
+def _run_service(tasks, config, pool=None):
+    from core_sim.service import DEFAULT_PORT, ServiceClient
+
+    client = ServiceClient(config["service_url"] or f"http://127.0.0.1:{DEFAULT_PORT}")
+    evaluation = {key: config[key] for key in ("temp_limit", "critical_temp", "stop_on_critical")}
+    # Submit everything first so the service's pool works on the whole batch
+    jobs = [client.submit(layout=layout, mode="metrics", timesteps=config["timesteps"],
+                          params=config["params"] or {}, evaluation=evaluation)
+            for layout, _, _ in tasks]
+    return [client.wait(job["job_id"]) for job in jobs]
+
+
+BACKEND_RUNNERS = {"serial": _run_serial, "pool": _run_pool, "ensemble": _run_ensemble, "service": _run_service}
+
+
+def evaluate_many(layouts, config=None, cache=None, pool=None):
+    """
+    Simulates a batch of layouts on the configured backend.
+
+    Args:
+        layouts (list): Layout dicts or layout file paths (JSON or binary .rfl).
+        config (dict): Overrides of DEFAULT_CONFIG.
+        cache (dict): Optional {evaluation_key: record} kept by the caller; layouts already
+            in it are not simulated again and new records are added to it.
+        pool (EvaluationPool): Worker processes for the "pool" backend, kept by the caller
+            across calls. Without one, each call starts and stops its own.
+
+    Returns:
+        list[dict]: One simulate_metrics record per layout, in order, with its "layout" name
+            (file name for paths, the dict's "name" or layout_NNN otherwise). Identical layouts
+            share one simulation (and one output file).
+    """
+    from layout_utils.load_layout import load_layout
+
+    config = resolve_config(config)
+    cache = {} if cache is None else cache
+
+    names, loaded = [], []
+    for i, layout in enumerate(layouts):
+        if isinstance(layout, (str, os.PathLike)):
+            names.append(os.path.basename(layout))
+            loaded.append(load_layout(layout))
+        else:
+            names.append(layout.get("name", f"layout_{i:03d}"))
+            loaded.append(layout)
+
+    keys = [evaluation_key(layout, config) for layout in loaded]
+    pending = {}
+    for name, layout, key in zip(names, loaded, keys):
+        if key not in cache and key not in pending:
+            output_path = None
+            if config["output_dir"]:
+                output_path = os.path.join(config["output_dir"], os.path.splitext(name)[0] + "_log.json")
+            pending[key] = (layout, config, output_path)
+
+    if pending:
+        cache.update(zip(pending, BACKEND_RUNNERS[config["backend"]](list(pending.values()), config, pool)))
+    return [dict(cache[key], layout=name) for name, key in zip(names, keys)]
@@ -1,21 +1,44 @@
 import numpy as np
-from scipy.ndimage import convolve
 from core_sim.core_grid import CoreGrid
 
+LAPLACIAN_KERNEL = np.array([
+    [1 / 6, 2 / 3, 1 / 6],
+    [2 / 3, -10 / 3, 2 / 3],
+    [1 / 6, 2 / 3, 1 / 6]
+], dtype=np.float64)
 
-def diffusion_approx_flux(grid: CoreGrid, diffusion_coeff: float = 0.2) -> np.ndarray:
+
+def convolve3x3_nearest(field: np.ndarray, kernel: np.ndarray = LAPLACIAN_KERNEL) -> np.ndarray:
+    """
+    3x3 convolution with edge replication, equivalent to
+    scipy.ndimage.convolve(field, kernel, mode="nearest") without importing scipy.
+    A stack of fields (..., H, W) is convolved field by field.
+    """
+    H, W = field.shape[-2:]
+    padded = np.pad(field, ((0, 0),) * (field.ndim - 2) + ((1, 1), (1, 1)), mode="edge")
+    flipped = kernel[::-1, ::-1].astype(field.dtype, copy=False)  # keep float32 fields in float32
+    result = np.zeros_like(field)
+    for dy in range(3):
+        for dx in range(3):
+            result += flipped[dy, dx] * padded[..., dy:dy + H, dx:dx + W]
+    return result
+
+
+
+def diffusion_approx_flux(grid: CoreGrid, diffusion_coeff: float = 0.2, dtype=np.float64) -> np.ndarray:
     """
     Approximate neutron flux diffusion using a 2D discrete Laplacian.
 
     Args:
         grid (CoreGrid): The reactor grid object.
         diffusion_coeff (float): Diffusion coefficient controlling how far flux spreads.
+        dtype: Floating point type of the flux field (np.float64 or np.float32).
 
     Returns:
         np.ndarray: A (height, width) array representing the neutron flux at each location.
     """
     H, W = grid.height, grid.width
-    flux_map = np.zeros((H, W), dtype=np.float64)
+    flux_map = np.zeros((H, W), dtype=dtype)
 
     # Step 1: Emitters contribute their neutron yield
     for y in range(H):
@@ -25,14 +48,8 @@ def diffusion_approx_flux(grid: CoreGrid, diffusion_coeff: float = 0.2) -> np.nd
                 flux_map[y, x] = fa.neutron_yield()
 
     # Step 2: Diffusion via discrete Laplacian
-    laplacian_kernel= np.array([
-        [1 / 6, 2 / 3, 1 / 6],
-        [2 / 3, -10 / 3, 2 / 3],
-        [1 / 6, 2 / 3, 1 / 6]
-    ], dtype=np.float64)
-
     # Apply convolution to simulate flux spread
-    diffused_flux = flux_map + diffusion_coeff * convolve(flux_map, laplacian_kernel, mode="nearest")
+    diffused_flux = flux_map + diffusion_coeff * convolve3x3_nearest(flux_map, LAPLACIAN_KERNEL)
 
     # Step 3: Apply absorption for each cell
     for y in range(H):
@@ -0,0 +1,201 @@
+# core_sim/incremental_penalties.py
+
+import math
+
+from core_sim.assemblies.base_assembly import FuelAssembly
+from core_sim.penalties import PenaltyCalculator
+from optimization.hotspots import compute_hotspots
+from optimization.symmetry import TYPE_WEIGHTS, symmetry_score
+from optimization.temperature import temperature_penalty
+
+# Largest mismatch weight per type (the per-cell share of the symmetry normalizer)
+_MAX_WEIGHT = {name: max(row.values()) for name, row in TYPE_WEIGHTS.items()}
+
+
+def _type_name(fa):
+    # Same type naming as optimization.symmetry (empty cells count as Blank)
+    return "Blank" if fa is None else type(fa).__name__
+
+
+class IncrementalPenalties:
+    """
+    Penalty terms of a CoreGrid maintained incrementally under single-cell moves.
+
+    Keeps the temperature penalty and overheated count, the hotspot sum over
+    4-neighbor pairs, the low-life count and the symmetry mismatch/normalizer
+    sums, each as a running total of per-cell or per-pair contributions. A move
+    replaces one assembly and only revisits the cell, its 4 neighbors and its
+    two mirror images, so apply_move / undo_move are O(1) regardless of grid size.
+
+    Terms match PenaltyCalculator.evaluate (up to float summation order); with
+    verify=True every terms() call is checked against a full recomputation.
+    """
+
+    def __init__(self, grid, calculator=None, verify=False, rel_tol=1e-9):
+        self.grid = grid
+        self.calculator = calculator or PenaltyCalculator()
+        self.verify = verify
+        self.rel_tol = rel_tol
+        self._moves = []
+        self.rebuild()
+
+    # === Full (re)initialization ===
+
+    def rebuild(self):
+        """Recomputes all running sums from the grid in O(H*W)."""
+        grid = self.grid
+        self.temp_total = 0.0
+        self.overheated_count = 0
+        self.low_life_count = 0
+        self.cell_count = 0
+        self.hotspot_total = 0.0
+        self.symmetry_diff = 0.0
+        self.symmetry_max = 0.0
+
+        for y in range(grid.height):
+            for x in range(grid.width):
+                self._add_cell(x, y, 1)
+                # Each undirected pair once: right and down neighbors
+                self.hotspot_total += self._pair_term(x, y, x + 1, y) + self._pair_term(x, y, x, y + 1)
+                diff, max_diff = self._symmetry_terms(x, y)
+                self.symmetry_diff += diff
+                self.symmetry_max += max_diff
+        self._moves = []
+
+    # === Per-cell / per-pair contributions ===
+
+    def _add_cell(self, x, y, sign):
+        fa = self.grid.grid[y][x]
+        if not isinstance(fa, FuelAssembly):
+            return
+        calc = self.calculator
+        self.cell_count += sign
+        if fa.temperature > calc.TEMP_LIMIT:
+            self.overheated_count += sign
+            self.temp_total += sign * math.exp((fa.temperature - calc.TEMP_LIMIT) / calc.TEMP_EXP_SCALE)
+        if fa.life < calc.LIFE_THRESHOLD:
+            self.low_life_count += sign
+
+    def _pair_term(self, x1, y1, x2, y2):
+        grid = self.grid
+        if not (grid.in_bounds(x1, y1) and grid.in_bounds(x2, y2)):
+            return 0.0
+        fa1, fa2 = grid.grid[y1][x1], grid.grid[y2][x2]
+        if not isinstance(fa1, FuelAssembly) or not isinstance(fa2, FuelAssembly):
+            return 0.0
+        diff = abs(fa1.life - fa2.life) - self.calculator.HOTSPOT_LIFE_DIFF
+        return diff if diff > 0 else 0.0
+
+    def _cell_pairs(self, x, y):
+        return (self._pair_term(x, y, x - 1, y) + self._pair_term(x, y, x + 1, y) +
+                self._pair_term(x, y, x, y - 1) + self._pair_term(x, y, x, y + 1))
+
+    def _symmetry_terms(self, x, y):
+        """Mismatch weight and normalizer share of cell (x, y) against its two mirrors."""
+        grid = self.grid
+        t = _type_name(grid.grid[y][x])
+        diff = max_diff = 0.0
+        mirror_y = grid.height - 1 - y
+        if mirror_y != y:
+            diff += TYPE_WEIGHTS[t][_type_name(grid.grid[mirror_y][x])]
+            max_diff += _MAX_WEIGHT[t]
+        mirror_x = grid.width - 1 - x
+        if mirror_x != x:
+            diff += TYPE_WEIGHTS[t][_type_name(grid.grid[y][mirror_x])]
+            max_diff += _MAX_WEIGHT[t]
+        return diff, max_diff
+
+    def _mirror_cells(self, x, y):
+        """The cell and its mirror images, whose symmetry terms depend on (x, y)."""
+        grid = self.grid
+        return {(x, y), (x, grid.height - 1 - y), (grid.width - 1 - x, y)}
+
+    def _local_terms(self, x, y):
+        cells = self._mirror_cells(x, y)
+        diff = max_diff = 0.0
+        for cx, cy in cells:
+            d, m = self._symmetry_terms(cx, cy)
+            diff += d
+            max_diff += m
+        return self._cell_pairs(x, y), diff, max_diff
+
+    def _replace(self, x, y, fa):
+        """Swaps the assembly at (x, y) and updates every running sum it touches."""
+        old_pairs, old_diff, old_max = self._local_terms(x, y)
+        self._add_cell(x, y, -1)
+
+        previous = self.grid.grid[y][x]
+        self.grid.insert_fa(x, y, fa)
+
+        self._add_cell(x, y, 1)
+        new_pairs, new_diff, new_max = self._local_terms(x, y)
+        self.hotspot_total += new_pairs - old_pairs
+        self.symmetry_diff += new_diff - old_diff
+        self.symmetry_max += new_max - old_max
+        return previous
+
+    # === Moves ===
+
+    def apply_move(self, x, y, fa):
+        """Places `fa` at (x, y); the previous assembly is kept for undo_move()."""
+        self._moves.append((x, y, self._replace(x, y, fa)))
+
+    def undo_move(self):
+        """Reverts the most recent apply_move()."""
+        x, y, previous = self._moves.pop()
+        self._replace(x, y, previous)
+
+    def refresh_cell(self, x, y):
+        """Re-reads (x, y) after its assembly's temperature or life changed in place."""
+        self._replace(x, y, self.grid.grid[y][x])
+
+    # === Results ===
+
+    @property
+    def symmetry(self):
+        if self.symmetry_max <= 0:
+            return 1.0
+        return max(0.0, 1.0 - self.symmetry_diff / self.symmetry_max)
+
+    def terms(self):
+        """Current (temp, hotspot, symmetry) penalty terms."""
+        # Running sums can drift below zero by rounding when every contribution is removed
+        result = {
+            "temp": max(self.temp_total, 0.0) if self.overheated_count else 0.0,
+            "hotspot": max(self.hotspot_total, 0.0),
+            "symmetry": self.symmetry,
+        }
+        if self.verify:
+            self.check(result)
+        return result
+
+    def evaluate(self):
+        """
+        Same result (and weight adjustments) as PenaltyCalculator.evaluate(grid),
+        computed from the running sums.
+        """
+        terms = self.terms()
+        calc = self.calculator
+        calc._adjust_temp_weight(self.overheated_count, self.cell_count)
+        calc._adjust_hotspot_weight(self.low_life_count, self.cell_count)
+        return calc._combine(terms["temp"], terms["hotspot"], terms["symmetry"])
+
+    def full_terms(self):
+        """Full O(H*W) recomputation with the original penalty functions (weights untouched)."""
+        grid, calc = self.grid, self.calculator
+        temperatures = [fa.temperature for _, _, fa in grid if isinstance(fa, FuelAssembly)]
+        temp, _ = temperature_penalty(temperatures, limit=calc.TEMP_LIMIT, scale=calc.TEMP_EXP_SCALE)
+        return {
+            "temp": temp,
+            "hotspot": compute_hotspots(grid, calc.HOTSPOT_LIFE_DIFF),
+            "symmetry": symmetry_score(grid),
+        }
+
+    def check(self, terms=None):
+        """Raises AssertionError if the running sums disagree with a full recomputation."""
+        terms = terms or self.terms()
+        full = self.full_terms()
+        for name, value in full.items():
+            if not math.isclose(terms[name], value, rel_tol=self.rel_tol, abs_tol=self.rel_tol):
+                raise AssertionError(f"Incremental {name} penalty {terms[name]!r} != full recomputation {value!r}")
+        return full
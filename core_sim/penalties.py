@@ -1,6 +1,6 @@
+import numpy as np
+
 from core_sim.assemblies.empty import FuelAssembly
-from optimization.hotspots import compute_hotspots
-from optimization.temperature import temperature_penalty
 from optimization.symmetry import symmetry_score
 
 class PenaltyCalculator:
@@ -21,10 +21,61 @@ class PenaltyCalculator:
         self.w_symmetry = 1.0
 
     def evaluate(self, grid):
-        temp_penalty = self._penalty_temperature(grid)
-        hotspot_penalty = self._penalty_hotspots(grid)
+        temperature, life = self._state_arrays(grid)
+        temp_penalty = self._penalty_temperature(temperature)
+        hotspot_penalty = self._penalty_hotspots(life)
         symmetry_score = self._penalty_symmetry(grid)
-
+        return self._combine(temp_penalty, hotspot_penalty, symmetry_score)
+
+    # === Array terms ===
+    # Shared by evaluate() and the per-tile partial sums of core_sim.domain_decomposition,
+    # so the serial and tiled engines compute every term the same way. NaN marks a cell
+    # without an assembly and never counts.
+
+    @staticmethod
+    def _state_arrays(grid):
+        """(height, width) temperature and life arrays of a grid, NaN where there is no assembly."""
+        temperature = np.array([[fa.temperature if isinstance(fa, FuelAssembly) else np.nan for fa in row]
+                                for row in grid.grid], dtype=np.float64)
+        life = np.array([[fa.life if isinstance(fa, FuelAssembly) else np.nan for fa in row]
+                         for row in grid.grid], dtype=np.float64)
+        return temperature, life
+
+    @classmethod
+    def temperature_terms(cls, temperature):
+        """
+        Overheating penalty of a temperature array.
+
+        Returns:
+            tuple: (sum of exp((T - TEMP_LIMIT) / TEMP_EXP_SCALE) over cells above TEMP_LIMIT, their count)
+        """
+        overheated = temperature > cls.TEMP_LIMIT
+        penalty = np.exp((temperature[overheated] - cls.TEMP_LIMIT) / cls.TEMP_EXP_SCALE).sum()
+        return float(penalty), int(overheated.sum())
+
+    @classmethod
+    def low_life_count(cls, life):
+        """Cells with life below LIFE_THRESHOLD."""
+        return int((life < cls.LIFE_THRESHOLD).sum())
+
+    @classmethod
+    def hotspot_terms(cls, life, bounds=None):
+        """
+        Hotspot penalty: the amount by which life differs by more than HOTSPOT_LIFE_DIFF
+        between 4-neighbors of the full `life` grid, each pair counted once.
+
+        Args:
+            life (np.ndarray): Life of every cell of the grid.
+            bounds (tuple): Optional (y0, y1, x0, x1) block; only pairs whose left / upper
+                cell lies in it count, so the sums of disjoint blocks add up to the grid's.
+        """
+        height, width = life.shape
+        y0, y1, x0, x1 = bounds or (0, height, 0, width)
+        right = np.abs(np.diff(life[y0:y1, x0:min(x1 + 1, width)], axis=1)) - cls.HOTSPOT_LIFE_DIFF
+        down = np.abs(np.diff(life[y0:min(y1 + 1, height), x0:x1], axis=0)) - cls.HOTSPOT_LIFE_DIFF
+        return float(right[right > 0].sum() + down[down > 0].sum())
+
+    def _combine(self, temp_penalty, hotspot_penalty, symmetry_score):
         # Total weighted penalty score
         total_penalty = (
             self.w_temp * temp_penalty +
@@ -40,52 +91,28 @@ class PenaltyCalculator:
             "total": total_penalty
         }
 
-    def _penalty_temperature(self, grid):
-        temperatures = []
-        total_fuel = 0
-
-        for y in range(grid.height):
-            for x in range(grid.width):
-                fa = grid.get_fa(x, y)
-                if isinstance(fa, FuelAssembly):
-                    temperatures.append(fa.temperature)
-                    total_fuel += 1
-
-        total_penalty, overheated_count = temperature_penalty(
-            temperatures,
-            limit=self.TEMP_LIMIT,
-            scale=self.TEMP_EXP_SCALE
-        )
+    def _penalty_temperature(self, temperature):
+        total_penalty, overheated_count = self.temperature_terms(temperature)
+        self._adjust_temp_weight(overheated_count, int(np.count_nonzero(~np.isnan(temperature))))
+        return total_penalty
 
+    def _adjust_temp_weight(self, overheated_count, total_fuel):
         # Dynamic penalty weight adjustment
         overheated_pct = overheated_count / total_fuel if total_fuel else 0
         if overheated_pct > 0.2:
             self.w_temp *= 1.1
 
-        return total_penalty
-
-    def _penalty_hotspots(self, grid):
-        life_values = []
-        low_life_count = 0
-        total_fuel = 0
-
-        for y in range(grid.height):
-            for x in range(grid.width):
-                fa = grid.get_fa(x, y)
-                if isinstance(fa, FuelAssembly):
-                    total_fuel += 1
-                    life_values.append(fa.life)
-                    if fa.life < self.LIFE_THRESHOLD:
-                        low_life_count += 1
+    def _penalty_hotspots(self, life):
+        self._adjust_hotspot_weight(self.low_life_count(life), int(np.count_nonzero(~np.isnan(life))))
+        return self.hotspot_terms(life)
 
+    def _adjust_hotspot_weight(self, low_life_count, total_fuel):
         # Reset or cap weight increase
         if total_fuel and (low_life_count / total_fuel) > 0.5:
             self.w_hotspot = min(self.w_hotspot * 1.1, 5.0)  # cap max weight to 5
         else:
             self.w_hotspot = 1.0  # reset to default if condition not met
 
-        return compute_hotspots(grid, self.HOTSPOT_LIFE_DIFF)
-
     def _penalty_symmetry(self, grid):
         return symmetry_score(grid)
 
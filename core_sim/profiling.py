@@ -0,0 +1,84 @@
+# core_sim/profiling.py
+
+from time import perf_counter
+
+
+class PhaseTimer:
+    """
+    Lap-style phase timer for the simulation loop.
+
+    Call begin_step() at the start of a step, lap("phase") after each phase and
+    end_step() at the end. When disabled every call returns immediately, so the
+    timer can stay in the hot loop permanently.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.cumulative = {}
+        self.per_step = []
+        self._current = None
+        self._last = 0.0
+
+    def begin_step(self):
+        if not self.enabled:
+            return
+        self._current = {}
+        self._last = perf_counter()
+
+    def lap(self, phase):
+        if not self.enabled:
+            return
+        now = perf_counter()
+        elapsed = now - self._last
+        self._current[phase] = self._current.get(phase, 0.0) + elapsed
+        self.cumulative[phase] = self.cumulative.get(phase, 0.0) + elapsed
+        self._last = now
+
+    def end_step(self):
+        if not self.enabled:
+            return
+        self.per_step.append(self._current)
+        self._current = None
+
+    @property
+    def steps(self):
+        return len(self.per_step)
+
+    @property
+    def total(self):
+        return sum(self.cumulative.values())
+
+    def last_step(self):
+        return self.per_step[-1] if self.per_step else {}
+
+    def breakdown(self):
+        """Returns per-phase totals, per-step means and shares, in phase order."""
+        total = self.total
+        steps = max(self.steps, 1)
+        return {
+            "steps": self.steps,
+            "total_s": total,
+            "phases": [
+                {
+                    "phase": phase,
+                    "total_s": seconds,
+                    "mean_step_ms": seconds / steps * 1e3,
+                    "share": seconds / total if total else 0.0,
+                }
+                for phase, seconds in self.cumulative.items()
+            ],
+        }
+
+    def format_table(self):
+        breakdown = self.breakdown()
+        lines = [
+            f"{'phase':<16} {'total s':>10} {'ms/step':>10} {'share':>7}",
+            "-" * 46,
+        ]
+        for row in breakdown["phases"]:
+            lines.append(f"{row['phase']:<16} {row['total_s']:>10.4f} {row['mean_step_ms']:>10.4f} "
+                         f"{row['share'] * 100:>6.1f}%")
+        lines.append("-" * 46)
+        lines.append(f"{'total':<16} {breakdown['total_s']:>10.4f} "
+                     f"{breakdown['total_s'] / max(breakdown['steps'], 1) * 1e3:>10.4f} {'100.0%':>7}")
+        return "\n".join(lines)
@@ -1,11 +1,36 @@
 # core_sim/recorder.py
 
 import json
+import numpy as np
+from core_sim.cell_stats import CellStatistics
+from core_sim.trajectory import TrajectoryWriter
+
+# "frames" keeps every step (in memory or in a trajectory store); "stats" keeps only
+# per-cell online statistics and the latest meta entry, in memory independent of the step count
+RECORDING_MODES = ("frames", "stats")
+
+
+def json_values(values, dtype=np.float64):
+    """
+    An array or scalar as JSON-ready floats / nested lists at `dtype` precision.
+    float32 values keep their shortest round-trip repr (0.1, not 0.10000000149011612).
+    """
+    values = np.asarray(values, dtype=dtype)
+    if values.dtype == np.float32:
+        values = values.astype(str).astype(np.float64)
+    return values.tolist()
+
 
 class Recorder:
-    def __init__(self, grid_shape, max_timesteps):
+    def __init__(self, grid_shape, max_timesteps, trajectory_path=None, dtype=np.float64, trajectory_encoding=None,
+                 mode="frames"):
+        if mode not in RECORDING_MODES:
+            raise ValueError(f"Unknown recording mode {mode!r} (expected one of {', '.join(RECORDING_MODES)})")
         self.grid_shape = grid_shape
         self.max_timesteps = max_timesteps
+        self.dtype = np.dtype(dtype)  # Precision of recorded frames (float64 or float32)
+        self.mode = mode
+        self.stats = CellStatistics(grid_shape) if mode == "stats" else None
 
         self.temperature_log = []
         self.energy_output_log = []
@@ -14,30 +39,60 @@ class Recorder:
         self.types = None  # Will be set once
         self.flux_log = []  # 🔧 Add this line
         self.meta_log = []
+        self.metadata = {}  # Run-level information (e.g. profiling breakdown)
+
+        # When set, frames are streamed to a memory-mapped trajectory store instead of kept in memory
+        self.trajectory_path = trajectory_path
+        self.trajectory_encoding = trajectory_encoding  # TrajectoryEncoding of the store (default raw)
+        self.trajectory = None
 
     def record(self, temperature, energy_output, life, total_energy, flux, meta=None):
-        self.temperature_log.append(temperature.tolist())
-        self.energy_output_log.append(energy_output.tolist())
-        self.life_log.append(life.tolist())
+        if self.stats is not None:
+            self.stats.update(temperature, energy_output, life, total_energy)
+            if self.trajectory is not None:
+                self.trajectory.append(temperature, energy_output, life, flux, total_energy)
+            if meta is not None:
+                self.meta_log[:] = [meta]
+            return
+
+        if self.trajectory is not None:
+            self.trajectory.append(temperature, energy_output, life, flux, total_energy)
+        else:
+            # Frames stay compact arrays until save()
+            self.temperature_log.append(np.array(temperature, dtype=self.dtype))
+            self.energy_output_log.append(np.array(energy_output, dtype=self.dtype))
+            self.life_log.append(np.array(life, dtype=self.dtype))
+            self.flux_log.append(np.array(flux, dtype=self.dtype))
         self.total_energy_log.append(total_energy)
-        self.flux_log.append(flux.tolist())
         if meta is not None:
             self.meta_log.append(meta)
 
     def set_types(self, types_grid):
         """Call this once before running the simulation to store the static type grid."""
         self.types = types_grid
+        if self.trajectory_path:
+            self.trajectory = TrajectoryWriter(self.trajectory_path, self.grid_shape, self.max_timesteps, types_grid,
+                                               dtype=self.dtype, encoding=self.trajectory_encoding)
 
     def save(self, output_path):
-        data = {
-            "temperature": self.temperature_log,
-            "energy_output": self.energy_output_log,
-            "life": self.life_log,
-            "total_energy": self.total_energy_log,
-            "flux": self.flux_log,
-            "meta": self.meta_log,
-            "types": self.types,  # Add this line
-        }
+        if self.stats is not None:
+            data = {"mode": "stats", "cell_stats": self.stats.as_dict(), "meta": self.meta_log, "types": self.types}
+        elif self.trajectory is not None:
+            data = {"meta": self.meta_log}  # frames are in the store
+        else:
+            data = {
+                "temperature": json_values(self.temperature_log, self.dtype),
+                "energy_output": json_values(self.energy_output_log, self.dtype),
+                "life": json_values(self.life_log, self.dtype),
+                "total_energy": json_values(self.total_energy_log, self.dtype),
+                "flux": json_values(self.flux_log, self.dtype),
+                "meta": self.meta_log,
+                "types": self.types,  # Add this line
+            }
+        if self.metadata:
+            data["metadata"] = self.metadata
+        if self.trajectory is not None:
+            self.trajectory.close(meta=self.meta_log)
+            data["trajectory"] = self.trajectory_path
         with open(output_path.replace(".npz", ".json"), "w") as f:
             json.dump(data, f)
-
@@ -0,0 +1,589 @@
+# core_sim/service.py
+"""
+Local simulation service: a small asyncio HTTP server that keeps one warm
+process pool for Simulator / FitnessEvaluator runs, so the layout editor,
+notebooks and scripts can submit layouts without starting (and importing)
+their own simulation process each time.
+
+    python -m core_sim.service --port 8765 --workers 4
+
+Endpoints (JSON in, JSON out; loopback only unless started with --allow-remote,
+since `layout_path` reads local files):
+    POST /jobs              submit a job; identical submissions share one job id
+    GET  /jobs              list jobs and their status
+    GET  /jobs/<id>         status, progress and (when done) result metrics
+    GET  /jobs/<id>/events  newline-delimited JSON progress events until the job ends
+    GET  /health            worker count and job counts
+
+A job request holds `layout` (layout dict) or `layout_path`, plus optional
+`mode` ("simulate", "ga_fitness" or "metrics"), `timesteps`, `params`
+(SimulationParams overrides), `trajectory` (store frames and return the store
+path), for "ga_fitness", `evaluator` (FitnessEvaluator temp_limit /
+optimal_fuel_ratio) and, for "metrics", `evaluation` (temp_limit,
+critical_temp, stop_on_critical; the result is a core_sim.evaluation record,
+which is how evaluate_many's "service" backend uses the pool).
+The job id is a hash of the normalized request, so resubmitting a layout
+returns the running or finished job instead of simulating it again; finished
+results are also kept under result_dir and reused after a restart.
+"""
+
+import asyncio
+import hashlib
+import ipaddress
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+from core_sim.constants import DEFAULT_PARAMS, TIMESTEPS
+from core_sim.core_grid import TYPE_ALIASES
+
+MODES = ("simulate", "ga_fitness", "metrics")
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 1024 * 1024
+RESULT_FILE = "result.json"
+
+# Progress queue of a worker process (set once by _init_worker)
+_progress = None
+
+
+class ServiceError(Exception):
+    """Request error reported to the client with an HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def is_loopback(host):
+    """True if `host` (an address or a host name) only resolves to loopback addresses."""
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        pass
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, None)}
+    except socket.gaierror:
+        return False
+    return bool(addresses) and all(ipaddress.ip_address(address.split("%")[0]).is_loopback
+                                   for address in addresses)
+
+
+# === Job specs ===
+
+def normalize_spec(request):
+    """
+    Validates a job request and returns its canonical spec (the part that is hashed).
+
+    Raises:
+        ServiceError: 400 for malformed requests.
+    """
+    from layout_utils.load_layout import load_layout
+
+    if "layout" in request:
+        layout = request["layout"]
+    elif "layout_path" in request:
+        try:
+            layout = load_layout(request["layout_path"])
+        except (OSError, ValueError) as e:
+            raise ServiceError(400, f"Cannot read layout {request['layout_path']!r}: {e}")
+    else:
+        raise ServiceError(400, "Request needs 'layout' or 'layout_path'")
+
+    try:
+        width, height = int(layout["width"]), int(layout["height"])
+        grid = [[dict(cell, fa_type=TYPE_ALIASES.get(cell["fa_type"], cell["fa_type"])) for cell in row]
+                for row in layout["grid"]]
+    except (KeyError, TypeError, ValueError) as e:
+        raise ServiceError(400, f"Malformed layout: {e!r}")
+    if len(grid) != height or any(len(row) != width for row in grid):
+        raise ServiceError(400, f"Layout grid does not match its size {width}x{height}")
+
+    mode = request.get("mode", "simulate")
+    if mode not in MODES:
+        raise ServiceError(400, f"Unknown mode {mode!r} (expected one of {', '.join(MODES)})")
+    timesteps = request.get("timesteps", TIMESTEPS)
+    if not isinstance(timesteps, int) or timesteps < 1:
+        raise ServiceError(400, "'timesteps' must be a positive integer")
+
+    try:
+        params = {name: float(value) for name, value in (request.get("params") or {}).items()}
+        DEFAULT_PARAMS.replace(**params)
+    except (AttributeError, TypeError, ValueError) as e:
+        raise ServiceError(400, f"Invalid params: {e}")
+
+    spec = {
+        "mode": mode,
+        "timesteps": timesteps,
+        "layout": {"width": width, "height": height, "grid": grid},
+        "params": params,
+    }
+    if mode == "simulate":
+        spec["trajectory"] = bool(request.get("trajectory", False))
+    elif mode == "metrics":
+        evaluation = request.get("evaluation") or {}
+        try:
+            spec["evaluation"] = {"temp_limit": float(evaluation.get("temp_limit", 800)),
+                                  "critical_temp": float(evaluation.get("critical_temp", 1000)),
+                                  "stop_on_critical": bool(evaluation.get("stop_on_critical", True))}
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ServiceError(400, f"Invalid evaluation options: {e}")
+    else:
+        evaluator = request.get("evaluator") or {}
+        try:
+            spec["evaluator"] = {"temp_limit": float(evaluator.get("temp_limit", 1000)),
+                                 "optimal_fuel_ratio": float(evaluator.get("optimal_fuel_ratio", 0.7))}
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ServiceError(400, f"Invalid evaluator options: {e}")
+    return spec
+
+
+def spec_hash(spec):
+    """Content hash of a normalized spec; used as the job id."""
+    canonical = json.dumps(spec, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:20]
+
+
+# === Worker side ===
+
+def _init_worker(progress_queue):
+    global _progress
+    _progress = progress_queue
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C stops the server, which shuts the pool down
+
+
+def _report(job_id, step, total):
+    if _progress is not None:
+        _progress.put((job_id, step, total))
+
+
+def _simulate(job_id, spec, job_dir, progress_every):
+    from core_sim.core_grid import CoreGrid
+    from core_sim.simulator import Simulator
+    from core_sim.sweep import final_metrics
+
+    layout, timesteps = spec["layout"], spec["timesteps"]
+    grid = CoreGrid(width=layout["width"], height=layout["height"])
+    grid.initialize_from_layout(layout)
+
+    trajectory_path = os.path.join(job_dir, "trajectory") if spec["trajectory"] else None
+    sim = Simulator(grid, timesteps, output_path=os.path.join(job_dir, "simulation_log.json"),
+                    trajectory_path=trajectory_path, record=trajectory_path is not None,
+                    params=DEFAULT_PARAMS.replace(**spec["params"]))
+    for step in range(1, timesteps + 1):
+        sim.step()
+        if step % progress_every == 0 or step == timesteps:
+            _report(job_id, step, timesteps)
+
+    result = final_metrics(sim)
+    if trajectory_path:
+        sim.recorder.trajectory.close(meta=sim.recorder.meta_log)
+        result["trajectory"] = trajectory_path
+    return result
+
+
+def _ga_fitness(job_id, spec):
+    from optimization_ga.chromosome import ReactorChromosome
+    from optimization_ga.fitness_evaluator import FitnessEvaluator
+
+    layout = spec["layout"]
+    movable = [(x, y) for y, row in enumerate(layout["grid"]) for x, cell in enumerate(row)
+               if cell["fa_type"] in ("Fuel", "Blank")]
+    chromosome = ReactorChromosome(layout, movable)
+    chromosome.genes = [1 if layout["grid"][y][x]["fa_type"] == "Fuel" else 0 for x, y in movable]
+
+    evaluator = FitnessEvaluator(timesteps=spec["timesteps"], **spec["evaluator"])
+    fitness = evaluator.evaluate(chromosome)
+    _report(job_id, spec["timesteps"], spec["timesteps"])
+    return {"fitness": float(fitness), "fuel_ratio": chromosome.get_fuel_ratio()}
+
+
+def _metrics(job_id, spec):
+    from core_sim.evaluation import resolve_config, simulate_metrics
+
+    config = resolve_config(dict(spec["evaluation"], timesteps=spec["timesteps"], params=spec["params"]))
+    result = simulate_metrics(spec["layout"], config)
+    _report(job_id, result["steps_completed"], spec["timesteps"])
+    return result
+
+
+def run_job(job_id, spec, job_dir, progress_every=10):
+    """Runs one job in a worker process and returns its result dict (also written to job_dir)."""
+    os.makedirs(job_dir, exist_ok=True)
+    start = time.perf_counter()
+    if spec["mode"] == "simulate":
+        result = _simulate(job_id, spec, job_dir, progress_every)
+    elif spec["mode"] == "metrics":
+        result = _metrics(job_id, spec)
+    else:
+        result = _ga_fitness(job_id, spec)
+    result["wall_time_s"] = time.perf_counter() - start
+
+    with open(os.path.join(job_dir, RESULT_FILE), "w") as f:
+        json.dump({"job_id": job_id, "spec": spec, "result": result}, f)
+    return result
+
+
+# === Server side ===
+
+class Job:
+    """A submitted spec with its status, progress and progress subscribers."""
+
+    def __init__(self, job_id, spec):
+        self.id = job_id
+        self.spec = spec
+        self.status = "queued"
+        self.step = 0
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.finished = None
+        self._listeners = []
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed")
+
+    def event(self):
+        event = {"job_id": self.id, "status": self.status, "step": self.step, "total": self.spec["timesteps"]}
+        if self.status == "done":
+            event["result"] = self.result
+        elif self.status == "failed":
+            event["error"] = self.error
+        return event
+
+    def as_dict(self):
+        return dict(self.event(), mode=self.spec["mode"], submitted=self.submitted, finished=self.finished)
+
+    def subscribe(self):
+        queue = asyncio.Queue()
+        queue.put_nowait(self.event())
+        if not self.done:
+            self._listeners.append(queue)
+        return queue
+
+    def publish(self):
+        event = self.event()
+        for queue in self._listeners:
+            queue.put_nowait(event)
+        if self.done:
+            self._listeners.clear()
+
+
+class SimulationService:
+    """
+    Job table, dispatch queue and worker pool behind the HTTP endpoints.
+
+    Args:
+        workers (int): Worker processes (and concurrently running jobs).
+        result_dir (str): Per-job directories with result.json and trajectory stores.
+        progress_every (int): Steps between progress events of a simulation.
+    """
+
+    def __init__(self, workers=None, result_dir="output/service", progress_every=10):
+        self.workers = workers or os.cpu_count() or 1
+        self.result_dir = result_dir
+        self.progress_every = progress_every
+        self.jobs = {}
+        self._queue = None
+        self._pool = None
+        self._progress = None
+        self._pump = None
+        self._dispatchers = []
+        self._loop = None
+
+    # --- lifecycle ---
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, allow_remote=False):
+        """
+        Starts the worker pool, dispatchers and HTTP server; returns the asyncio server.
+
+        Raises:
+            ValueError: If `host` is not a loopback address and allow_remote is False.
+        """
+        if not allow_remote and not is_loopback(host):
+            raise ValueError(f"Refusing to bind to non-loopback address {host!r}: jobs can read local files "
+                             f"through 'layout_path' (pass allow_remote=True / --allow-remote to override)")
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._progress = multiprocessing.Queue()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                         initargs=(self._progress,))
+        self._pump = threading.Thread(target=self._pump_progress, daemon=True)
+        self._pump.start()
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def close(self):
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+        if self._progress is not None:
+            self._progress.put(None)
+            self._pump.join(timeout=5)
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT, allow_remote=False):
+        """Runs the service until SIGINT / SIGTERM, then shuts the worker pool down."""
+        server = await self.start(host, port, allow_remote)
+        print(f"[✔] Simulation service on http://{host}:{port} ({self.workers} workers, results in {self.result_dir})")
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows: Ctrl+C still raises KeyboardInterrupt
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            await self.close()
+
+    # --- jobs ---
+
+    def submit(self, request):
+        """Registers a job request; returns (job, created) where created is False for duplicates."""
+        spec = normalize_spec(request)
+        job_id = spec_hash(spec)
+        job = self.jobs.get(job_id)
+        if job is not None and job.status != "failed":
+            return job, False
+
+        job = Job(job_id, spec)
+        self.jobs[job_id] = job
+        if self._load_result(job):
+            return job, False
+        self._queue.put_nowait(job)
+        return job, True
+
+    def _job_dir(self, job_id):
+        return os.path.join(self.result_dir, job_id)
+
+    def _load_result(self, job):
+        """Marks `job` done from a result stored by an earlier run of the service, if there is one."""
+        path = os.path.join(self._job_dir(job.id), RESULT_FILE)
+        try:
+            with open(path, "r") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return False
+        trajectory = stored["result"].get("trajectory")
+        if trajectory and not os.path.isdir(trajectory):
+            return False
+        job.result = stored["result"]
+        job.step = job.spec["timesteps"]
+        job.status = "done"
+        job.finished = os.path.getmtime(path)
+        return True
+
+    async def _dispatch(self):
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.publish()
+            try:
+                job.result = await self._loop.run_in_executor(
+                    self._pool, run_job, job.id, job.spec, self._job_dir(job.id), self.progress_every)
+                job.status = "done"
+                job.step = job.spec["timesteps"]
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.status = "failed"
+                job.error = f"{type(e).__name__}: {e}"
+            job.finished = time.time()
+            job.publish()
+
+    def _pump_progress(self):
+        # Forwards worker progress messages into the event loop
+        while True:
+            message = self._progress.get()
+            if message is None:
+                return
+            self._loop.call_soon_threadsafe(self._on_progress, *message)
+
+    def _on_progress(self, job_id, step, total):
+        job = self.jobs.get(job_id)
+        if job is not None and not job.done and step > job.step:
+            job.step = step
+            job.publish()
+
+    # --- HTTP ---
+
+    async def _handle(self, reader, writer):
+        try:
+            method, path, body = await self._read_request(reader)
+            await self._route(method, path, body, writer)
+        except ServiceError as e:
+            await self._send_json(writer, e.status, {"error": str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _read_request(reader):
+        request_line = (await reader.readline()).decode("latin-1").split()
+        if len(request_line) != 3:
+            raise ServiceError(400, "Malformed request line")
+        method, target, _ = request_line
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            raise ServiceError(400, f"Invalid Content-Length {headers['content-length']!r}")
+        if length < 0:
+            raise ServiceError(400, f"Invalid Content-Length {length}")
+        if length > MAX_BODY_BYTES:
+            raise ServiceError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), urlsplit(target).path.rstrip("/") or "/", body
+
+    async def _route(self, method, path, body, writer):
+        parts = path.strip("/").split("/")
+
+        if method == "GET" and path == "/health":
+            counts = {}
+            for job in self.jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            await self._send_json(writer, 200, {"status": "ok", "workers": self.workers,
+                                                "queued": self._queue.qsize(), "jobs": counts})
+        elif path == "/jobs" and method == "POST":
+            try:
+                request = json.loads(body or b"{}")
+            except ValueError as e:
+                raise ServiceError(400, f"Invalid JSON body: {e}")
+            if not isinstance(request, dict):
+                raise ServiceError(400, "Request body must be a JSON object")
+            job, created = self.submit(request)
+            await self._send_json(writer, 202 if created else 200, dict(job.as_dict(), deduplicated=not created))
+        elif path == "/jobs" and method == "GET":
+            await self._send_json(writer, 200, [job.as_dict() for job in self.jobs.values()])
+        elif parts[0] == "jobs" and len(parts) in (2, 3) and method == "GET":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                raise ServiceError(404, f"Unknown job {parts[1]!r}")
+            if len(parts) == 2:
+                await self._send_json(writer, 200, job.as_dict())
+            elif parts[2] == "events":
+                await self._stream_events(job, writer)
+            else:
+                raise ServiceError(404, f"Unknown resource {path!r}")
+        else:
+            raise ServiceError(404 if method in ("GET", "POST") else 405, f"No route for {method} {path}")
+
+    @staticmethod
+    async def _send_json(writer, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    @staticmethod
+    async def _stream_events(job, writer):
+        # No Content-Length: the stream ends when the connection closes after the final event
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nConnection: close\r\n\r\n")
+        queue = job.subscribe()
+        while True:
+            event = await queue.get()
+            writer.write(json.dumps(event).encode("utf-8") + b"\n")
+            await writer.drain()
+            if event["status"] in ("done", "failed"):
+                return
+
+
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+# === Client ===
+
+class ServiceClient:
+    """Minimal blocking client for scripts, notebooks and the layout editor (standard library only)."""
+
+    def __init__(self, url=f"http://127.0.0.1:{DEFAULT_PORT}", timeout=30.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, method, path, payload=None, timeout=None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(self.url + path, data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+        return urllib.request.urlopen(request, timeout=timeout or self.timeout)
+
+    def health(self):
+        with self._request("GET", "/health") as response:
+            return json.load(response)
+
+    def submit(self, layout=None, layout_path=None, **options):
+        """Submits a layout dict or file path; returns the job dict (with its id)."""
+        request = dict(options)
+        if layout is not None:
+            request["layout"] = layout
+        else:
+            request["layout_path"] = os.path.abspath(layout_path)
+        with self._request("POST", "/jobs", request) as response:
+            return json.load(response)
+
+    def job(self, job_id):
+        with self._request("GET", f"/jobs/{job_id}") as response:
+            return json.load(response)
+
+    def events(self, job_id, timeout=None):
+        """Yields progress events until the job is done or failed."""
+        with self._request("GET", f"/jobs/{job_id}/events", timeout=timeout) as response:
+            for line in response:
+                if line.strip():
+                    yield json.loads(line)
+
+    def wait(self, job_id, timeout=None):
+        """Blocks until the job ends; returns its result or raises RuntimeError if it failed."""
+        for event in self.events(job_id, timeout=timeout):
+            if event["status"] == "done":
+                return event["result"]
+            if event["status"] == "failed":
+                raise RuntimeError(f"Job {job_id} failed: {event['error']}")
+        raise RuntimeError(f"Event stream of job {job_id} ended early")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local simulation service (HTTP + worker pool)")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (loopback only without --allow-remote)")
+    parser.add_argument("--allow-remote", action="store_true",
+                        help="Allow a non-loopback --host (any client can then read local files via layout_path)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--result-dir", default="output/service", help="Per-job results and trajectory stores")
+    parser.add_argument("--progress-every", type=int, default=10, help="Steps between progress events")
+    args = parser.parse_args()
+    if not args.allow_remote and not is_loopback(args.host):
+        parser.error(f"--host {args.host} is not a loopback address; pass --allow-remote to bind to it anyway")
+
+    service = SimulationService(workers=args.workers, result_dir=args.result_dir,
+                                progress_every=args.progress_every)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.allow_remote))
+    except KeyboardInterrupt:
+        pass
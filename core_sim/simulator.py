@@ -1,25 +1,58 @@
 import numpy as np
 import os
 import json
-from tqdm import tqdm
 from core_sim.flux_models import diffusion_approx_flux
 from core_sim.core_grid import CoreGrid
 from core_sim.penalties import PenaltyCalculator
 from core_sim.assemblies.base_assembly import FuelAssembly  # adjust if split further
 from optimization.fitness import compute_fitness
-from core_sim.recorder import Recorder
+from core_sim.recorder import Recorder, json_values
+from core_sim.profiling import PhaseTimer
+from core_sim.checkpoint import capture_state, build_grid, restore_simulator, save_checkpoint
 from core_sim import constants  # Assuming you added constants.py
 
+# Scoring of the final state (see optimization.fitness.compute_fitness)
+FITNESS_CONFIG = {
+    "weights": {
+        "total_energy": 3.0,
+        "life_uniformity": 1.5,
+        "thermal_stability": 1.0,
+        "penalties": 5.0
+    },
+    "reference_max_energy": 2500.0,
+    "return_breakdown": True
+}
+
 class Simulator:
-    def __init__(self, grid: CoreGrid, max_timesteps, output_path="output/simulation_log.json", config=None):
+    def __init__(self, grid: CoreGrid, max_timesteps, output_path="output/simulation_log.json", config=None,
+                 trajectory_path=None, record=True, profile=False,
+                 adaptive=False, temp_tol=2.0, life_tol=1e-3, dt_min=1.0, dt_max=50.0, resume_from=None,
+                 params=None, dtype=np.float64, trajectory_encoding=None, recording="frames"):
         self.grid = grid
         self.T = max_timesteps
         self.current_step = 0
         self.penalty_calculator = PenaltyCalculator()
         self.output_path = output_path
         self.config = config or {}
+        self.record = record  # When False, nothing is logged to the recorder or written to disk
+        # "frames" logs every step; "stats" keeps per-cell online statistics and only the latest
+        # meta entry / grid snapshot, so memory does not grow with the number of steps
+        self.recording = recording
+        self.timer = PhaseTimer(enabled=profile)
+        self.params = params or constants.DEFAULT_PARAMS  # SimulationParams shared by all fuel cells
+        # Precision of the flux field and of logged / saved frames; cell state itself stays in Python floats
+        self.dtype = np.dtype(dtype)
+
+        # Adaptive timestepping (dt in units of one fixed timestep)
+        self.adaptive = adaptive
+        self.temp_tol = temp_tol
+        self.life_tol = life_tol
+        self.dt_min = dt_min
+        self.dt_max = dt_max
+        self.adaptive_stats = None
 
-        self.recorder = Recorder((self.grid.height, self.grid.width), self.T)
+        self.recorder = Recorder((self.grid.height, self.grid.width), self.T, trajectory_path=trajectory_path,
+                                 dtype=self.dtype, trajectory_encoding=trajectory_encoding, mode=recording)
 
         # Set types grid for recorder
         types_grid = [[fa.type if fa else "none" for fa in row] for row in self.grid.grid]
@@ -35,16 +68,97 @@ class Simulator:
         self.grid_history = []
         self.meta_history = []
 
+        # Cells shared with a clone or snapshot are copied before the simulation mutates them
+        self.grid.own_cells()
+        self._bind_params()
+
+        if resume_from is not None:
+            # Assembly state comes with the grid (see from_checkpoint); restore the rest of the run
+            restore_simulator(self, resume_from)
+            return
+
         # Initialize energy_output for fuel assemblies
         for y in range(self.grid.height):
             for x in range(self.grid.width):
                 fa = self.grid.get_fa(x, y)
                 if fa and fa.type == "fuel":
-                    fa.energy_output = constants.INITIAL_FUEL_ENERGY_OUTPUT  # from constants.py
+                    fa.energy_output = self.params.initial_fuel_energy_output
+
+    def _bind_params(self):
+        # Fuel reads its model parameters from the cell, so every fuel assembly gets ours
+        for row in self.grid.grid:
+            for fa in row:
+                if fa is not None and fa.type == "fuel" and fa.params is not self.params:
+                    fa.params = self.params
+
+    @classmethod
+    def from_checkpoint(cls, state, modify=None, max_timesteps=None, **kwargs):
+        """
+        Creates a simulator that continues from a checkpoint (see core_sim.checkpoint).
+
+        Args:
+            state (dict): Checkpoint from checkpoint() or load_checkpoint().
+            modify (callable): Optional `modify(grid)` applied to the restored grid,
+                e.g. to swap assemblies for a what-if branch.
+            max_timesteps (int): Final step of the run; defaults to the checkpointed run's.
+            **kwargs: Other Simulator arguments (output_path, record, ...). `params`,
+                `dtype` and `recording` default to the checkpointed run's.
+        """
+        grid = build_grid(state)
+        if modify is not None:
+            modify(grid)
+        max_timesteps = max_timesteps or state["header"]["max_timesteps"]
+        if kwargs.get("params") is None and state["header"].get("params"):
+            kwargs["params"] = constants.SimulationParams(**state["header"]["params"])
+        if kwargs.get("dtype") is None:
+            kwargs["dtype"] = state["header"].get("dtype", "float64")
+        if kwargs.get("recording") is None:
+            kwargs["recording"] = state["header"].get("recording", "frames")
+        return cls(grid, max_timesteps, resume_from=state, **kwargs)
+
+    def checkpoint(self, include_history=False):
+        """Captures the full dynamic state after the current step (see core_sim.checkpoint.capture_state)."""
+        return capture_state(self, include_history=include_history)
+
+    def fork(self, modify=None, **kwargs):
+        """
+        Returns an independent simulator continuing from the current step, optionally
+        with a modified layout. The logged history is carried over when recording.
+        """
+        kwargs.setdefault("record", self.record)
+        kwargs.setdefault("max_timesteps", self.T)
+        state = self.checkpoint(include_history=kwargs["record"] and self.record)
+        return Simulator.from_checkpoint(state, modify=modify, **kwargs)
+
+    def step(self, dt=1.0):
+        timer = self.timer
+        timer.begin_step()
+
+        flux_map, total_energy = self._advance(dt)
+
+        temp_grid, energy_grid, life_grid = self._state_arrays()
+        timer.lap("array_snapshot")
 
-    def step(self):
-        flux_map = diffusion_approx_flux(self.grid)
-        self.flux_log.append(flux_map)
+        meta_entry = self._observe(total_energy)
+
+        if self.record:
+            self._log_frame(temp_grid, energy_grid, life_grid, total_energy, flux_map, meta_entry)
+        timer.lap("recorder")
+
+        self._score()
+        timer.lap("fitness")
+
+        if self.recording == "stats":
+            self._trim_history()
+        self.current_step += 1
+        timer.end_step()
+
+    def _advance(self, dt):
+        """Computes the flux map and updates every assembly by `dt` timesteps."""
+        self.grid.own_cells()  # no-op unless the grid was restored from a snapshot
+        flux_map = diffusion_approx_flux(self.grid, self.params.diffusion_coeff, dtype=self.dtype)
+        flux_values = flux_map.tolist()  # cells update in Python floats whatever the field's dtype
+        self.timer.lap("flux")
 
         total_energy = 0.0
 
@@ -54,27 +168,31 @@ class Simulator:
                 if fa is None or not isinstance(fa, FuelAssembly):
                     continue
                 neighbors = self.grid.get_neighbors(x, y)
-                fa.update(neighbors=neighbors, flux=flux_map[y][x])
+                fa.update(neighbors=neighbors, flux=flux_values[y][x], dt=dt)
                 total_energy += fa.energy_output
+        self.timer.lap("cell_update")
 
-        # Create numpy arrays for logs
-        temp_grid = np.array([[fa.temperature if fa else 0.0 for fa in row] for row in self.grid.grid])
-        energy_grid = np.array([[fa.energy_output if fa else 0.0 for fa in row] for row in self.grid.grid])
-        life_grid = np.array([[fa.life if fa else 0.0 for fa in row] for row in self.grid.grid])
-        total_energy_grid = np.full_like(temp_grid, total_energy)
+        return flux_map, total_energy
 
-        self.temperature_log.append(temp_grid)
-        self.energy_output_log.append(energy_grid)
-        self.life_log.append(life_grid)
-        self.total_energy_log.append(total_energy_grid)
+    def _state_arrays(self):
+        # Create numpy arrays for logs
+        cells = self.grid.grid
+        temp_grid = np.array([[fa.temperature if fa else 0.0 for fa in row] for row in cells], dtype=self.dtype)
+        energy_grid = np.array([[fa.energy_output if fa else 0.0 for fa in row] for row in cells], dtype=self.dtype)
+        life_grid = np.array([[fa.life if fa else 0.0 for fa in row] for row in cells], dtype=self.dtype)
+        return temp_grid, energy_grid, life_grid
 
+    def _observe(self, total_energy):
+        """Snapshots the grid and evaluates penalties; returns the new meta entry."""
         snapshot = [
             [self.grid.get_fa(x, y).as_dict() if self.grid.get_fa(x, y) else None for x in range(self.grid.width)]
             for y in range(self.grid.height)
         ]
         self.grid_history.append(snapshot)
+        self.timer.lap("grid_snapshot")
 
         penalties = self.penalty_calculator.evaluate(self.grid)
+        self.timer.lap("penalties")
 
         meta_entry = {
             "step": self.current_step,
@@ -83,6 +201,21 @@ class Simulator:
             "total_energy": total_energy
         }
         self.meta_history.append(meta_entry)
+        return meta_entry
+
+    def _trim_history(self):
+        # Fitness and checkpoints only read the latest entries
+        del self.grid_history[:-1]
+        del self.meta_history[:-1]
+
+    def _log_frame(self, temp_grid, energy_grid, life_grid, total_energy, flux_map, meta_entry):
+        if self.recording == "frames" and self.recorder.trajectory is None:
+            # Without a trajectory store the frames stay in memory until save()
+            self.flux_log.append(flux_map)
+            self.temperature_log.append(temp_grid)
+            self.energy_output_log.append(energy_grid)
+            self.life_log.append(life_grid)
+            self.total_energy_log.append(np.full_like(temp_grid, total_energy))
 
         self.recorder.record(
             temperature=temp_grid,
@@ -93,40 +226,180 @@ class Simulator:
             meta=meta_entry,
         )
 
-        fitness = compute_fitness(self.meta_history, self.grid_history, config={
-            "weights": {
-                "total_energy": 3.0,
-                "life_uniformity": 1.5,
-                "thermal_stability": 1.0,
-                "penalties": 5.0
-            },
-            "reference_max_energy": 2500.0,
-            "return_breakdown": True
-        })
+    def _score(self):
+        fitness = compute_fitness(self.meta_history, self.grid_history, config=FITNESS_CONFIG)
 
         self.meta_history[-1]["fitness"] = fitness
 
-        self.current_step += 1
+    # === Adaptive timestepping ===
+
+    _DYNAMIC_ATTRS = ("temperature", "life", "age", "energy_output", "total_energy",
+                      "insertion_level", "thermal_power")
 
-    def run(self):
-        for _ in tqdm(range(self.T), desc="Running simulation", unit="step"):
-            self.step()
+    def _capture_assemblies(self):
+        # Shared flyweight cells are read-only, so there is nothing to capture or restore
+        return [
+            [{attr: getattr(fa, attr) for attr in self._DYNAMIC_ATTRS if hasattr(fa, attr)}
+             if fa is not None and not fa.is_flyweight else {} for fa in row]
+            for row in self.grid.grid
+        ]
+
+    def _restore_assemblies(self, state):
+        for row, row_state in zip(self.grid.grid, state):
+            for fa, fa_state in zip(row, row_state):
+                for attr, value in fa_state.items():
+                    setattr(fa, attr, value)
+
+    def _step_error(self, before, after):
+        """Largest fuel temperature / life change of a step, relative to the tolerances."""
+        fuel = self._fuel_mask
+        if not fuel.any():
+            return 0.0
+        d_temp = np.max(np.abs(after[0][fuel] - before[0][fuel]))
+        d_life = np.max(np.abs(after[2][fuel] - before[2][fuel]))
+        return max(d_temp / self.temp_tol, d_life / self.life_tol)
+
+    def run_adaptive(self, progress=None):
+        """
+        Advances to max_timesteps with a variable step size.
+
+        dt grows while the per-step fuel temperature and life changes stay below
+        temp_tol / life_tol and shrinks (rejecting and redoing the step) when they
+        exceed them. Logged frames stay on the fixed grid t = 1..T by linear
+        interpolation between accepted states.
+        """
+        self._fuel_mask = np.array([[fa is not None and fa.type == "fuel" for fa in row] for row in self.grid.grid])
+        t, dt = 0.0, self.dt_min
+        prev_arrays = self._state_arrays()
+        prev_flux, prev_total = None, 0.0
+        next_report = 1
+        stats = {"fixed_steps": self.T, "accepted_steps": 0, "rejected_steps": 0,
+                 "dt_min_used": float("inf"), "dt_max_used": 0.0}
+
+        while t < self.T - 1e-9:
+            dt = min(dt, self.T - t)
+            self.timer.begin_step()
+            saved = self._capture_assemblies()
+
+            flux_map, total_energy = self._advance(dt)
+            arrays = self._state_arrays()
+            self.timer.lap("array_snapshot")
+            error = self._step_error(prev_arrays, arrays)
+
+            if error > 1.0 and dt > self.dt_min:
+                self._restore_assemblies(saved)
+                dt = max(self.dt_min, dt * max(0.2, 0.9 / error))
+                stats["rejected_steps"] += 1
+                self.timer.end_step()
+                continue
+
+            t_prev, t = t, t + dt
+            stats["accepted_steps"] += 1
+            stats["dt_min_used"] = min(stats["dt_min_used"], dt)
+            stats["dt_max_used"] = max(stats["dt_max_used"], dt)
+
+            meta_entry = self._observe(total_energy)
+            meta_entry["time"] = t
+            meta_entry["dt"] = dt
+            self._score()
+            if self.recording == "stats":
+                self._trim_history()
+            self.timer.lap("fitness")
+
+            if prev_flux is None:
+                prev_flux = flux_map
+            while next_report <= t + 1e-9:
+                alpha = (next_report - t_prev) / dt
+                frame = [(1 - alpha) * a + alpha * b for a, b in zip(prev_arrays, arrays)]
+                frame_total = (1 - alpha) * prev_total + alpha * total_energy
+                frame_flux = (1 - alpha) * prev_flux + alpha * flux_map
+                if self.record:
+                    report_meta = dict(meta_entry, step=next_report - 1, total_energy=frame_total)
+                    self._log_frame(*frame, frame_total, frame_flux, report_meta)
+                next_report += 1
+                if progress is not None:
+                    progress.update(1)
+            self.timer.lap("recorder")
+
+            prev_arrays, prev_flux, prev_total = arrays, flux_map, total_energy
+            self.current_step += 1
+            self.timer.end_step()
+
+            growth = 2.0 if error == 0 else min(2.0, max(0.5, 0.9 / error))
+            dt = min(self.dt_max, max(self.dt_min, dt * growth))
+
+        stats["steps_saved"] = self.T - stats["accepted_steps"]
+        self.adaptive_stats = stats
+        return stats
+
+    def run(self, checkpoint_every=None, checkpoint_path="output/checkpoint.npz"):
+        """
+        Runs the remaining steps (all of them, unless resumed from a checkpoint).
+
+        Args:
+            checkpoint_every (int): If set, write a checkpoint (including the logged
+                history when recording) every this many steps.
+            checkpoint_path (str): Checkpoint file, overwritten on every save.
+        """
+        from tqdm import tqdm  # progress bar only for interactive runs; keeps `import core_sim.simulator` light
+
+        if self.adaptive:
+            if checkpoint_every:
+                raise ValueError("Periodic checkpoints are only supported for fixed-step runs")
+            with tqdm(total=self.T, desc="Running simulation (adaptive)", unit="step") as progress:
+                stats = self.run_adaptive(progress=progress)
+        else:
+            for _ in tqdm(range(self.current_step, self.T), desc="Running simulation", unit="step"):
+                self.step()
+                if checkpoint_every and self.current_step % checkpoint_every == 0 and self.current_step < self.T:
+                    save_checkpoint(self.checkpoint(include_history=self.record), checkpoint_path)
 
         final_fitness = self.meta_history[-1]["fitness"]
         print(f"\n[✔] Final fitness score after {self.T} steps: {final_fitness:.4f}")
 
-        self.save()
+        if self.adaptive:
+            print(f"[✔] Adaptive steps: {stats['accepted_steps']} accepted, {stats['rejected_steps']} rejected, "
+                  f"{stats['steps_saved']} of {self.T} fixed steps saved "
+                  f"(dt {stats['dt_min_used']:.2f}..{stats['dt_max_used']:.2f})")
+
+        if self.timer.enabled:
+            print(f"\n[⏱] Step phase breakdown ({self.timer.steps} steps):")
+            print(self.timer.format_table())
+
+        if self.record:
+            self.save()
 
     def save(self):
         os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
 
+        if self.timer.enabled:
+            self.recorder.metadata["profile"] = self.timer.breakdown()
+        if self.adaptive_stats is not None:
+            self.recorder.metadata["adaptive"] = self.adaptive_stats
+
+        if self.recording == "stats":
+            stats_path = self.output_path.replace(".npz", ".json")
+            self.recorder.save(stats_path)
+            print(f"\n[✔] Per-cell statistics saved to {stats_path}")
+            return
+
+        if self.recorder.trajectory is not None:
+            # Frames live in the store; the JSON log only carries meta, metadata and the store path
+            json_path = self.output_path.replace(".npz", ".json")
+            self.recorder.save(json_path)
+            print(f"\n[✔] Simulation log saved to {json_path}")
+            self._report_trajectory()
+            return
+
         data_to_save = {
-            "temperature": [arr.tolist() for arr in self.temperature_log],
-            "energy_output": [arr.tolist() for arr in self.energy_output_log],
-            "life": [arr.tolist() for arr in self.life_log],
-            "total_energy": [arr.tolist() for arr in self.total_energy_log],
-            "flux": [arr.tolist() for arr in self.flux_log],
+            "temperature": json_values(self.temperature_log, self.dtype),
+            "energy_output": json_values(self.energy_output_log, self.dtype),
+            "life": json_values(self.life_log, self.dtype),
+            "total_energy": json_values(self.total_energy_log, self.dtype),
+            "flux": json_values(self.flux_log, self.dtype),
         }
+        if self.recorder.metadata:
+            data_to_save["metadata"] = self.recorder.metadata
 
         json_path = self.output_path.replace(".npz", ".json")
         with open(json_path, "w") as f:
@@ -137,3 +410,11 @@ class Simulator:
 
         print(f"\n[✔] Simulation saved to {json_path}")
         print(f"[✔] Detailed snapshots saved to {recorder_path}")
+
+    def _report_trajectory(self):
+        print(f"[✔] Trajectory store saved to {self.recorder.trajectory_path}")
+        trajectory = self.recorder.trajectory
+        if trajectory.encoding.mode != "raw":
+            stats = trajectory.compression_stats().values()
+            ratio = sum(s["raw_bytes"] for s in stats) / max(sum(s["bytes"] for s in stats), 1)
+            print(f"[✔] Trajectory frames {trajectory.encoding.mode}-encoded, {ratio:.1f}x smaller than raw")
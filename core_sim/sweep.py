@@ -0,0 +1,171 @@
+# core_sim/sweep.py
+"""
+Parameter sweeps over the simulation constants: every combination of the
+given SimulationParams values is simulated on every layout (optionally in a
+process pool) and summarized as one row of a tidy results table.
+
+    python -m core_sim.sweep layouts/test_layout1.json --param cooling_coeff=30,40,50 \\
+        --param t_opt=900:1100:3 --timesteps 200 --workers 4 --out output/sweep.csv
+"""
+
+import csv
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+
+import numpy as np
+
+from core_sim.constants import DEFAULT_PARAMS, SimulationParams
+
+PARAM_NAMES = tuple(f.name for f in fields(SimulationParams))
+METRIC_COLUMNS = ("fitness", "total_energy", "mean_fuel_temperature", "max_fuel_temperature",
+                  "mean_fuel_life", "penalty_total", "wall_time_s")
+
+
+def expand_grid(param_grid):
+    """
+    Cartesian product of a parameter grid.
+
+    Args:
+        param_grid (dict): {parameter name: list of values}.
+
+    Returns:
+        list[dict]: One {name: value} override set per combination, last parameter varying fastest.
+    """
+    unknown = set(param_grid) - set(PARAM_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown simulation parameters: {', '.join(sorted(unknown))} "
+                         f"(expected any of {', '.join(PARAM_NAMES)})")
+    names = list(param_grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(param_grid[n] for n in names))]
+
+
+def final_metrics(sim):
+    """Summary of a finished simulation: the METRIC_COLUMNS except wall time."""
+    fuel = [fa for row in sim.grid.grid for fa in row if fa.type == "fuel"]
+    temperatures = np.array([fa.temperature for fa in fuel]) if fuel else np.zeros(1)
+    lives = np.array([fa.life for fa in fuel]) if fuel else np.zeros(1)
+    final = sim.meta_history[-1]
+    return {
+        "fitness": float(final["fitness"]),
+        "total_energy": float(final["total_energy"]),
+        "mean_fuel_temperature": float(temperatures.mean()),
+        "max_fuel_temperature": float(temperatures.max()),
+        "mean_fuel_life": float(lives.mean()),
+        "penalty_total": float(final["penalties"]["total"]),
+    }
+
+
+def run_point(layout_path, overrides, timesteps):
+    """
+    Simulates one layout with DEFAULT_PARAMS changed by `overrides` and summarizes the final state.
+
+    Returns:
+        dict: Table row with the layout, the overridden parameters and METRIC_COLUMNS.
+    """
+    from core_sim.core_grid import CoreGrid
+    from core_sim.simulator import Simulator
+
+    start = time.perf_counter()
+    sim = Simulator(CoreGrid.from_layout_file(layout_path), max_timesteps=timesteps, record=False,
+                    params=DEFAULT_PARAMS.replace(**overrides))
+    for _ in range(timesteps):
+        sim.step()
+
+    row = {"layout": os.path.basename(layout_path)}
+    row.update(overrides)
+    row.update(final_metrics(sim))
+    row["wall_time_s"] = time.perf_counter() - start
+    return row
+
+
+def _run_point(args):
+    return run_point(*args)
+
+
+def run_sweep(layouts, param_grid, timesteps=200, workers=None):
+    """
+    Runs every layout at every point of the parameter grid.
+
+    Args:
+        layouts (list): Layout file paths (JSON or binary).
+        param_grid (dict): {parameter name: list of values}; see expand_grid.
+        timesteps (int): Steps per simulation.
+        workers (int): Worker processes; None or 1 runs serially in this process.
+
+    Returns:
+        list[dict]: One row per (layout, point), in layout-then-grid order.
+    """
+    jobs = [(layout, overrides, timesteps) for layout in layouts for overrides in expand_grid(param_grid)]
+    if not workers or workers <= 1:
+        return [_run_point(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_point, jobs))
+
+
+def write_table(rows, path):
+    """Writes sweep rows as CSV, or as a JSON list of records if `path` ends in .json."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(rows, f, indent=2)
+        return path
+
+    columns = []
+    for row in rows:
+        columns.extend(name for name in row if name not in columns)
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def parse_param(spec):
+    """
+    Parses a --param option: `name=v1,v2,...` or `name=start:stop:num` (evenly spaced, inclusive).
+
+    Returns:
+        tuple: (name, list of float values).
+    """
+    name, sep, values = spec.partition("=")
+    if not sep or not values:
+        raise ValueError(f"Expected name=v1,v2,... or name=start:stop:num, got {spec!r}")
+    if ":" in values:
+        start, stop, num = values.split(":")
+        return name.strip(), [float(v) for v in np.linspace(float(start), float(stop), int(num))]
+    return name.strip(), [float(v) for v in values.split(",")]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sweep simulation parameters over one or more layouts")
+    parser.add_argument("layouts", nargs="+", help="Layout files (JSON or binary)")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=VALUES",
+                        help=f"Swept parameter, repeatable; one of: {', '.join(PARAM_NAMES)}")
+    parser.add_argument("--timesteps", type=int, default=200, help="Steps per simulation")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--out", default="output/sweep.csv", help="Results table (.csv or .json)")
+    args = parser.parse_args()
+
+    try:
+        param_grid = dict(parse_param(spec) for spec in args.param)
+        points = expand_grid(param_grid)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"Sweeping {len(points)} parameter sets x {len(args.layouts)} layouts "
+          f"({args.timesteps} steps each, {args.workers} workers)")
+    start = time.perf_counter()
+    rows = run_sweep(args.layouts, param_grid, timesteps=args.timesteps, workers=args.workers)
+    write_table(rows, args.out)
+
+    best = max(rows, key=lambda row: row["fitness"])
+    print(f"[✔] {len(rows)} runs in {time.perf_counter() - start:.1f}s, results saved to {args.out}")
+    print("[✔] Best: " + ", ".join(f"{name}={best[name]}" for name in ["layout", *param_grid]) +
+          f" (fitness {best['fitness']:.2f})")
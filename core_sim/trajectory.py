@@ -0,0 +1,373 @@
+# core_sim/trajectory.py
+
+import json
+import os
+import zlib
+import numpy as np
+from numpy.lib.format import open_memmap
+
+# A trajectory store is a directory with one (timesteps, height, width) .npy file
+# per field plus summary.json holding the type grid, per-step aggregates and meta.
+# Encoded stores hold one <field>.bin of compressed frame chunks per field instead,
+# indexed from the summary (see TrajectoryEncoding).
+FRAME_FIELDS = ("temperature", "energy_output", "life", "flux")
+SUMMARY_FILE = "summary.json"
+ENCODINGS = ("raw", "lossless", "quantized")
+
+
+class TrajectoryEncoding:
+    """
+    How a trajectory store keeps its frames.
+
+    - "raw": uncompressed memory-mapped .npy files.
+    - "lossless": each frame XOR-ed bitwise with the previous one, byte-shuffled and
+      zlib-compressed; slowly changing fields leave mostly zero bytes. Decodes exactly.
+    - "quantized": each frame's change from the previous *decoded* frame, rounded to a
+      multiple of 2 * error_bound and stored as the narrowest integers that fit, then
+      zlib-compressed. Every decoded value is within error_bound of the original and
+      errors do not accumulate over time.
+
+    Every `keyframe_every`-th frame is stored on its own (lossless: raw bits, quantized:
+    value / step), so reading frame i decodes at most keyframe_every frames.
+
+    Args:
+        mode (str): One of ENCODINGS.
+        error_bound (float | dict): Absolute error bound for "quantized", for all fields
+            or as {field: bound}; fields left out use DEFAULT_ERROR_BOUNDS.
+        keyframe_every (int): Keyframe interval in frames.
+        level (int): zlib compression level.
+    """
+
+    DEFAULT_ERROR_BOUNDS = {"temperature": 0.01, "energy_output": 0.01, "life": 1e-5, "flux": 1e-4}
+
+    def __init__(self, mode="raw", error_bound=None, keyframe_every=50, level=6):
+        if mode not in ENCODINGS:
+            raise ValueError(f"Unknown trajectory encoding {mode!r} (expected one of {', '.join(ENCODINGS)})")
+        if keyframe_every < 1:
+            raise ValueError("keyframe_every must be at least 1")
+        self.mode = mode
+        self.keyframe_every = keyframe_every
+        self.level = level
+        self.error_bounds = None
+        if mode == "quantized":
+            bounds = error_bound if isinstance(error_bound, dict) else \
+                {field: error_bound for field in FRAME_FIELDS} if error_bound is not None else {}
+            self.error_bounds = {field: float(bounds.get(field, self.DEFAULT_ERROR_BOUNDS[field]))
+                                 for field in FRAME_FIELDS}
+            if min(self.error_bounds.values()) <= 0:
+                raise ValueError("Quantization error bounds must be positive")
+
+    def as_dict(self):
+        return {"mode": self.mode, "keyframe_every": self.keyframe_every, "error_bounds": self.error_bounds}
+
+
+def _shuffle(data, itemsize):
+    # Groups byte k of every value together; the high bytes of similar numbers then compress well
+    return np.ascontiguousarray(data.view(np.uint8).reshape(-1, itemsize).T)
+
+
+def _unshuffle(data, dtype):
+    itemsize = np.dtype(dtype).itemsize
+    return np.ascontiguousarray(data.reshape(itemsize, -1).T).view(dtype).ravel()
+
+
+def _narrow(values):
+    """Signed integers in the narrowest dtype holding them."""
+    lo, hi = (int(values.min()), int(values.max())) if values.size else (0, 0)
+    for dtype in (np.int8, np.int16, np.int32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return values.astype(dtype)
+    raise OverflowError("Quantized values exceed 64-bit integers; use a larger error bound")
+
+
+class _FieldCodec:
+    """Encodes or decodes the frame sequence of one field; both sides track the previous decoded frame."""
+
+    def __init__(self, encoding, dtype, error_bound=None):
+        self.encoding = encoding
+        self.dtype = np.dtype(dtype)
+        self.bits = np.dtype(f"u{self.dtype.itemsize}")
+        # Slightly under 2 * bound, so float rounding in the reconstruction cannot exceed the bound
+        self.step = 2.0 * error_bound * (1 - 1e-6) if error_bound is not None else None
+        self.previous = None  # bits (lossless) or float64 reconstruction (quantized)
+
+    def encode(self, frame, keyframe):
+        """Returns (compressed chunk, stored integer dtype name, reconstructed frame)."""
+        frame = np.asarray(frame, dtype=self.dtype).ravel()
+        if self.encoding.mode == "lossless":
+            bits = frame.view(self.bits)
+            payload = bits if keyframe else bits ^ self.previous
+            self.previous = bits.copy()
+            decoded = frame
+        else:
+            values = frame.astype(np.float64)
+            if not np.isfinite(values).all():
+                raise ValueError("Quantized trajectories need finite values; use the lossless encoding")
+            base = 0.0 if keyframe else self.previous
+            payload = _narrow(np.rint((values - base) / self.step).astype(np.int64))
+            self.previous = base + payload * self.step
+            decoded = self.previous.astype(self.dtype)
+        chunk = zlib.compress(_shuffle(payload, payload.dtype.itemsize).tobytes(), self.encoding.level)
+        return chunk, payload.dtype.name, decoded
+
+    def decode(self, chunk, stored_dtype, keyframe):
+        """Decodes the next frame (flat, in the store's dtype) from its chunk."""
+        payload = _unshuffle(np.frombuffer(zlib.decompress(chunk), dtype=np.uint8), stored_dtype)
+        if self.encoding.mode == "lossless":
+            bits = payload if keyframe else payload ^ self.previous
+            self.previous = bits
+            return bits.view(self.dtype)
+        base = 0.0 if keyframe else self.previous
+        self.previous = base + payload.astype(np.int64) * self.step
+        return self.previous.astype(self.dtype)
+
+
+class TrajectoryWriter:
+    """
+    Streams simulation frames into a trajectory store, one frame at a time: memory-mapped
+    .npy files, or compressed frame chunks for a non-raw TrajectoryEncoding.
+    """
+
+    def __init__(self, path, grid_shape, max_timesteps, types, dtype=np.float64, encoding=None):
+        self.path = path
+        self.grid_shape = tuple(grid_shape)
+        self.max_timesteps = max_timesteps
+        self.types = types
+        self.dtype = np.dtype(dtype)
+        self.encoding = encoding or TrajectoryEncoding()
+        self.n_frames = 0
+
+        os.makedirs(path, exist_ok=True)
+        if self.encoding.mode == "raw":
+            self._arrays = {
+                field: open_memmap(os.path.join(path, f"{field}.npy"), mode="w+", dtype=dtype,
+                                   shape=(max_timesteps,) + self.grid_shape)
+                for field in FRAME_FIELDS
+            }
+        else:
+            bounds = self.encoding.error_bounds or {}
+            self._codecs = {field: _FieldCodec(self.encoding, dtype, bounds.get(field)) for field in FRAME_FIELDS}
+            self._files = {field: open(os.path.join(path, f"{field}.bin"), "wb") for field in FRAME_FIELDS}
+            self._index = {field: [] for field in FRAME_FIELDS}  # [offset, length, stored dtype] per frame
+            self._max_error = {field: 0.0 for field in FRAME_FIELDS}
+
+        self.fuel_mask = np.array(types) == "fuel"
+        self.num_fuel_cells = int(np.sum(self.fuel_mask))
+        self.aggregates = {
+            "mean_fuel_temperature": [],
+            "mean_fuel_life": [],
+            "total_energy": [],
+        }
+
+    def append(self, temperature, energy_output, life, flux, total_energy):
+        if self.n_frames >= self.max_timesteps:
+            raise IndexError(f"Trajectory store is full ({self.max_timesteps} frames)")
+
+        frame = {"temperature": temperature, "energy_output": energy_output, "life": life, "flux": flux}
+        if self.encoding.mode == "raw":
+            for field in FRAME_FIELDS:
+                self._arrays[field][self.n_frames] = frame[field]
+        else:
+            keyframe = self.n_frames % self.encoding.keyframe_every == 0
+            for field in FRAME_FIELDS:
+                chunk, stored_dtype, decoded = self._codecs[field].encode(frame[field], keyframe)
+                f = self._files[field]
+                self._index[field].append([f.tell(), len(chunk), stored_dtype])
+                f.write(chunk)
+                original = np.asarray(frame[field], dtype=self.dtype).ravel()
+                error = float(np.max(np.abs(decoded.astype(np.float64) - original))) if original.size else 0.0
+                self._max_error[field] = max(self._max_error[field], error)
+
+        if self.num_fuel_cells:
+            self.aggregates["mean_fuel_temperature"].append(float(np.mean(temperature[self.fuel_mask])))
+            self.aggregates["mean_fuel_life"].append(float(np.mean(life[self.fuel_mask])))
+        else:
+            self.aggregates["mean_fuel_temperature"].append(0.0)
+            self.aggregates["mean_fuel_life"].append(0.0)
+        self.aggregates["total_energy"].append(float(total_energy))
+        self.n_frames += 1
+
+    def frames(self, field):
+        """All frames of `field` written so far as an (n_frames, height, width) array (e.g. for checkpoints)."""
+        if self.encoding.mode == "raw":
+            return np.array(self._arrays[field][:self.n_frames])
+        self._files[field].flush()
+        with open(os.path.join(self.path, f"{field}.bin"), "rb") as f:
+            data = f.read()
+        bounds = self.encoding.error_bounds or {}
+        codec = _FieldCodec(self.encoding, self.dtype, bounds.get(field))
+        every = self.encoding.keyframe_every
+        frames = [codec.decode(data[offset:offset + length], stored_dtype, i % every == 0)
+                  for i, (offset, length, stored_dtype) in enumerate(self._index[field])]
+        return np.array(frames, dtype=self.dtype).reshape((self.n_frames,) + self.grid_shape)
+
+    def compression_stats(self):
+        """{field: {"raw_bytes", "bytes", "ratio", "max_error"}} for the frames written so far."""
+        raw_bytes = self.n_frames * int(np.prod(self.grid_shape)) * self.dtype.itemsize
+        stats = {}
+        for field in FRAME_FIELDS:
+            if self.encoding.mode == "raw":
+                size, max_error = raw_bytes, 0.0
+            else:
+                size, max_error = sum(length for _, length, _ in self._index[field]), self._max_error[field]
+            stats[field] = {"raw_bytes": raw_bytes, "bytes": size,
+                            "ratio": raw_bytes / size if size else 1.0, "max_error": max_error}
+        return stats
+
+    def close(self, meta=None):
+        if self.encoding.mode == "raw":
+            for array in self._arrays.values():
+                array.flush()
+        else:
+            for f in self._files.values():
+                f.close()
+
+        summary = {
+            "n_frames": self.n_frames,
+            "grid_shape": list(self.grid_shape),
+            "fields": list(FRAME_FIELDS),
+            "types": self.types,
+            "aggregates": self.aggregates,
+            "meta": meta or [],
+        }
+        if self.encoding.mode != "raw":
+            summary["encoding"] = dict(self.encoding.as_dict(), dtype=self.dtype.name, index=self._index,
+                                       stats=self.compression_stats())
+        with open(os.path.join(self.path, SUMMARY_FILE), "w") as f:
+            json.dump(summary, f)
+
+
+class TrajectoryStore:
+    """
+    Read-only view over a trajectory store; frames are only read (and, for encoded
+    stores, decoded) when requested. Reading frames in increasing order decodes each
+    frame once; a jump decodes forward from the nearest preceding keyframe.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, SUMMARY_FILE), "r") as f:
+            self.summary = json.load(f)
+
+        self.n_frames = self.summary["n_frames"]
+        self.types = np.array(self.summary["types"])
+        info = self.summary.get("encoding")
+        if info is None:
+            self.encoding = TrajectoryEncoding()
+            self._arrays = {
+                field: np.load(os.path.join(path, f"{field}.npy"), mmap_mode="r")
+                for field in self.summary["fields"]
+            }
+        else:
+            self.encoding = TrajectoryEncoding(info["mode"], info["error_bounds"], info["keyframe_every"])
+            self._dtype = np.dtype(info["dtype"])
+            self._chunks = {field: self._read_chunks(field) for field in self.summary["fields"]}
+            self._decoded = {}  # field -> (index, codec, last decoded frame)
+
+    def _read_chunks(self, field):
+        path = os.path.join(self.path, f"{field}.bin")
+        data = np.memmap(path, dtype=np.uint8, mode="r") if os.path.getsize(path) else np.zeros(0, np.uint8)
+        return data, self.summary["encoding"]["index"][field]
+
+    def _decode(self, field, index):
+        every = self.encoding.keyframe_every
+        keyframe = index - index % every
+        last, codec, frame = self._decoded.get(field, (None, None, None))
+        if last == index:
+            return frame
+        if last is None or not keyframe <= last < index:
+            bounds = self.encoding.error_bounds or {}
+            codec, last = _FieldCodec(self.encoding, self._dtype, bounds.get(field)), keyframe - 1
+
+        data, chunk_index = self._chunks[field]
+        for i in range(last + 1, index + 1):
+            offset, length, stored_dtype = chunk_index[i]
+            frame = codec.decode(data[offset:offset + length].tobytes(), stored_dtype, i % every == 0)
+        frame = frame.reshape(self.grid_shape)
+        self._decoded[field] = (index, codec, frame)
+        return frame
+
+    @property
+    def grid_shape(self):
+        return tuple(self.summary["grid_shape"])
+
+    @property
+    def meta(self):
+        return self.summary.get("meta", [])
+
+    def frame(self, field, index):
+        """Returns one (height, width) frame of `field` as an in-memory array."""
+        if not 0 <= index < self.n_frames:
+            raise IndexError(f"Frame {index} out of range (0..{self.n_frames - 1})")
+        if self.encoding.mode == "raw":
+            return np.array(self._arrays[field][index])
+        return self._decode(field, index).copy()
+
+    def compression_stats(self):
+        """Per-field stored size against uncompressed frames (see TrajectoryWriter.compression_stats)."""
+        if self.encoding.mode != "raw":
+            return self.summary["encoding"]["stats"]
+        stats = {}
+        for field, array in self._arrays.items():
+            size = self.n_frames * int(np.prod(self.grid_shape)) * array.dtype.itemsize
+            stats[field] = {"raw_bytes": size, "bytes": size, "ratio": 1.0, "max_error": 0.0}
+        return stats
+
+    def aggregate(self, name):
+        """Returns a precomputed per-step aggregate from the summary section."""
+        return np.array(self.summary["aggregates"][name])
+
+    def frame_indices(self, stride=1):
+        return range(0, self.n_frames, max(1, stride))
+
+
+def is_trajectory_store(path):
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, SUMMARY_FILE))
+
+
+def convert_json_to_store(json_path, store_path, encoding=None):
+    """Converts a Recorder JSON output into a trajectory store (optionally encoded, see TrajectoryEncoding)."""
+    with open(json_path, "r") as f:
+        data = json.load(f)
+
+    temperature = np.array(data["temperature"])
+    timesteps, height, width = temperature.shape
+    writer = TrajectoryWriter(store_path, (height, width), timesteps, data["types"], encoding=encoding)
+    energy_output = np.array(data["energy_output"])
+    life = np.array(data["life"])
+    flux = np.array(data["flux"])
+    for t in range(timesteps):
+        writer.append(temperature[t], energy_output[t], life[t], flux[t], data["total_energy"][t])
+    writer.close(meta=data.get("meta"))
+    return store_path
+
+
+def format_compression_stats(stats):
+    """Table of TrajectoryWriter / TrajectoryStore compression_stats()."""
+    lines = [f"{'field':<14} {'raw MB':>9} {'stored MB':>10} {'ratio':>8} {'max error':>10}"]
+    for field, s in stats.items():
+        lines.append(f"{field:<14} {s['raw_bytes'] / 2 ** 20:>9.2f} {s['bytes'] / 2 ** 20:>10.2f} "
+                     f"{s['ratio']:>7.1f}x {s['max_error']:>10.2e}")
+    raw, stored = sum(s["raw_bytes"] for s in stats.values()), sum(s["bytes"] for s in stats.values())
+    lines.append(f"{'total':<14} {raw / 2 ** 20:>9.2f} {stored / 2 ** 20:>10.2f} {raw / max(stored, 1):>7.1f}x")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert a simulation JSON log into a trajectory store")
+    parser.add_argument("input", help="Recorder JSON output")
+    parser.add_argument("output", help="Trajectory store directory")
+    parser.add_argument("--encoding", choices=ENCODINGS, default="raw", help="Frame encoding")
+    parser.add_argument("--error-bound", type=float, default=None,
+                        help="Absolute error bound for --encoding quantized (default: per-field defaults)")
+    parser.add_argument("--keyframe-every", type=int, default=50, help="Keyframe interval in frames")
+    args = parser.parse_args()
+
+    encoding = TrajectoryEncoding(args.encoding, args.error_bound, args.keyframe_every)
+    convert_json_to_store(args.input, args.output, encoding=encoding)
+    print(f"✅ Trajectory store written to {args.output}")
+    print(format_compression_stats(TrajectoryStore(args.output).compression_stats()))
+    print(f"JSON input: {os.path.getsize(args.input) / 2 ** 20:.2f} MB")
@@ -0,0 +1,220 @@
+# layout_utils/binary_layout.py
+
+import struct
+import numpy as np
+
+# File layout (little endian):
+#   header   : magic, version, width, height, number of type names
+#   types    : length-prefixed UTF-8 type names (index = type code)
+#   codes    : uint8[height * width] row-major type codes
+#   sparse   : uint32 count, then uint32 index[n], uint8 flags[n],
+#              float64 enrichment[n], float64 life[n]
+MAGIC = b"RFLB"
+VERSION = 1
+BINARY_LAYOUT_EXTENSION = ".rfl"
+
+_HEADER = struct.Struct("<4sHIIH")
+
+FLAG_ENRICHMENT = 0x01
+FLAG_LIFE = 0x02
+FLAG_BARE_STRING = 0x04  # cell was stored as a plain "Fuel" string, not a dict
+
+PARAM_KEYS = ("enrichment", "life")
+
+
+def is_binary_layout(path):
+    """Returns True if the file at `path` starts with the binary layout magic."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def encode_layout(layout):
+    """
+    Encodes a layout dictionary into the compact binary format.
+
+    Args:
+        layout (dict): Layout with 'width', 'height' and 'grid' keys.
+
+    Returns:
+        bytes: Encoded layout.
+    """
+    width, height = layout["width"], layout["height"]
+    type_names = []
+    type_codes = {}
+    codes = np.zeros(height * width, dtype=np.uint8)
+    sparse_idx, sparse_flags, sparse_enrichment, sparse_life = [], [], [], []
+
+    for y, row in enumerate(layout["grid"]):
+        for x, cell in enumerate(row):
+            if isinstance(cell, str):
+                fa_type, params, flags = cell, {}, FLAG_BARE_STRING
+            elif isinstance(cell, dict):
+                fa_type = cell["fa_type"]
+                params = {k: v for k, v in cell.items() if k != "fa_type"}
+                flags = 0
+            else:
+                raise ValueError(f"Unrecognized cell format at ({x}, {y}): {cell}")
+
+            unknown = set(params) - set(PARAM_KEYS)
+            if unknown:
+                raise ValueError(f"Cannot encode cell parameters {sorted(unknown)} at ({x}, {y})")
+
+            if fa_type not in type_codes:
+                if len(type_names) == 256:
+                    raise ValueError("Binary layout supports at most 256 distinct assembly types")
+                type_codes[fa_type] = len(type_names)
+                type_names.append(fa_type)
+            index = y * width + x
+            codes[index] = type_codes[fa_type]
+
+            if "enrichment" in params:
+                flags |= FLAG_ENRICHMENT
+            if "life" in params:
+                flags |= FLAG_LIFE
+            if flags:
+                sparse_idx.append(index)
+                sparse_flags.append(flags)
+                sparse_enrichment.append(params.get("enrichment", 0.0))
+                sparse_life.append(params.get("life", 0.0))
+
+    parts = [_HEADER.pack(MAGIC, VERSION, width, height, len(type_names))]
+    for name in type_names:
+        encoded = name.encode("utf-8")
+        parts.append(struct.pack("<B", len(encoded)) + encoded)
+    parts.append(codes.tobytes())
+    parts.append(struct.pack("<I", len(sparse_idx)))
+    parts.append(np.asarray(sparse_idx, dtype="<u4").tobytes())
+    parts.append(np.asarray(sparse_flags, dtype=np.uint8).tobytes())
+    parts.append(np.asarray(sparse_enrichment, dtype="<f8").tobytes())
+    parts.append(np.asarray(sparse_life, dtype="<f8").tobytes())
+    return b"".join(parts)
+
+
+def decode_layout_arrays(data):
+    """
+    Decodes the binary format into flat arrays without building per-cell dicts.
+
+    Args:
+        data (bytes): Encoded layout.
+
+    Returns:
+        dict: 'width', 'height', 'type_names' (list[str]), 'codes' (uint8 array of
+        shape (height, width)) and 'sparse' with 'index', 'flags', 'enrichment'
+        and 'life' arrays.
+    """
+    magic, version, width, height, n_types = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a binary layout file (bad magic)")
+    if version != VERSION:
+        raise ValueError(f"Unsupported binary layout version: {version}")
+
+    offset = _HEADER.size
+    type_names = []
+    for _ in range(n_types):
+        if offset >= len(data):
+            raise ValueError("Truncated binary layout (type table)")
+        length = data[offset]
+        offset += 1
+        type_names.append(bytes(data[offset:offset + length]).decode("utf-8"))
+        offset += length
+
+    n_cells = width * height
+    codes = np.frombuffer(data, dtype=np.uint8, count=n_cells, offset=offset).reshape(height, width)
+    offset += n_cells
+
+    (n_sparse,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    index = np.frombuffer(data, dtype="<u4", count=n_sparse, offset=offset)
+    offset += 4 * n_sparse
+    flags = np.frombuffer(data, dtype=np.uint8, count=n_sparse, offset=offset)
+    offset += n_sparse
+    enrichment = np.frombuffer(data, dtype="<f8", count=n_sparse, offset=offset)
+    offset += 8 * n_sparse
+    life = np.frombuffer(data, dtype="<f8", count=n_sparse, offset=offset)
+
+    return {
+        "width": width,
+        "height": height,
+        "type_names": type_names,
+        "codes": codes,
+        "sparse": {"index": index, "flags": flags, "enrichment": enrichment, "life": life},
+    }
+
+
+def sparse_params(arrays):
+    """Yields (x, y, params, is_bare_string) for every cell with per-cell data."""
+    width = arrays["width"]
+    sparse = arrays["sparse"]
+    for index, flags, enrichment, life in zip(
+            sparse["index"].tolist(), sparse["flags"].tolist(),
+            sparse["enrichment"].tolist(), sparse["life"].tolist()):
+        params = {}
+        if flags & FLAG_ENRICHMENT:
+            params["enrichment"] = enrichment
+        if flags & FLAG_LIFE:
+            params["life"] = life
+        yield index % width, index // width, params, bool(flags & FLAG_BARE_STRING)
+
+
+def decode_layout(data):
+    """
+    Decodes the binary format back into the JSON layout dictionary.
+
+    Args:
+        data (bytes): Encoded layout.
+
+    Returns:
+        dict: Layout with 'width', 'height' and 'grid' keys.
+    """
+    arrays = decode_layout_arrays(data)
+    type_names = arrays["type_names"]
+    grid = [[{"fa_type": type_names[code]} for code in row] for row in arrays["codes"].tolist()]
+
+    for x, y, params, bare in sparse_params(arrays):
+        if bare:
+            grid[y][x] = grid[y][x]["fa_type"]
+        else:
+            grid[y][x].update(params)
+
+    return {"width": arrays["width"], "height": arrays["height"], "grid": grid}
+
+
+def save_binary_layout(layout, path):
+    """Writes a layout dictionary to `path` in the binary format."""
+    with open(path, "wb") as f:
+        f.write(encode_layout(layout))
+
+
+def load_binary_layout(path):
+    """Reads a binary layout file and returns the JSON layout dictionary."""
+    with open(path, "rb") as f:
+        return decode_layout(f.read())
+
+
+def load_binary_layout_arrays(path):
+    """Reads a binary layout file into flat arrays (see decode_layout_arrays)."""
+    with open(path, "rb") as f:
+        return decode_layout_arrays(f.read())
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Convert layouts between JSON and the binary format")
+    parser.add_argument("input", help="Layout file (JSON or binary)")
+    parser.add_argument("output", help="Output file; binary unless it ends with .json")
+    args = parser.parse_args()
+
+    if is_binary_layout(args.input):
+        layout = load_binary_layout(args.input)
+    else:
+        with open(args.input, "r") as f:
+            layout = json.load(f)
+
+    if args.output.endswith(".json"):
+        with open(args.output, "w") as f:
+            json.dump(layout, f, indent=2)
+    else:
+        save_binary_layout(layout, args.output)
+    print(f"✅ Converted {args.input} -> {args.output}")
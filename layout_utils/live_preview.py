@@ -0,0 +1,174 @@
+# layout_utils/live_preview.py
+"""
+Background preview simulation for the layout editor: a short, low-fidelity
+run of the current layout in a worker process, restarted whenever the layout
+changes. The simulation's per-cell Python loop never holds the editor's GIL,
+so the Tk thread stays responsive on large grids. Only the newest request is
+ever simulated; a run whose layout went out of date stops at its next step.
+"""
+
+import multiprocessing
+import queue
+import signal
+import time
+
+import numpy as np
+
+PREVIEW_TIMESTEPS = 40
+
+
+class PreviewResult:
+    """Final state of one preview run (arrays are height x width)."""
+
+    def __init__(self, generation, temperature, energy, fitness, total_energy, steps, wall_time):
+        self.generation = generation
+        self.temperature = temperature
+        self.energy = energy
+        self.fitness = fitness
+        self.total_energy = total_energy
+        self.steps = steps
+        self.wall_time = wall_time
+
+    def field(self, name):
+        """'temperature' or 'energy' map."""
+        return self.temperature if name == "temperature" else self.energy
+
+
+class PreviewWorker:
+    """
+    Runs preview simulations in a daemon worker process.
+
+    request() is called from the UI thread with a layout dict and returns at
+    once; poll() (also on the UI thread, e.g. from Tk's after()) collects the
+    worker's messages and returns the newest finished result for the current
+    layout, if any. The current generation is shared with the worker, which
+    drops superseded requests and stops an outdated run between steps.
+
+    Args:
+        timesteps (int): Steps per preview run.
+    """
+
+    def __init__(self, timesteps=PREVIEW_TIMESTEPS):
+        self.timesteps = timesteps
+        self.generation = 0  # Bumped by every request; runs for older generations are cancelled
+        self.cancelled_runs = 0
+        self.last_error = None
+        self._in_flight = 0  # Requests the worker has not answered yet
+        self._current = multiprocessing.Value("q", 0)
+        self._requests = multiprocessing.Queue()
+        self._results = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=_preview_loop, name="layout-preview", daemon=True,
+                                                args=(self._requests, self._results, self._current))
+        self._process.start()
+
+    @property
+    def running(self):
+        """True while a requested preview has not finished, failed or been cancelled."""
+        return self._in_flight > 0
+
+    def request(self, layout):
+        """Schedules a preview of `layout`, superseding older ones."""
+        self._set_generation(self.generation + 1)
+        self.last_error = None
+        self._in_flight += 1
+        self._requests.put((self.generation, layout, self.timesteps))
+        return self.generation
+
+    def poll(self):
+        """Newest finished result for the latest request, or None."""
+        latest = None
+        while True:
+            try:
+                kind, generation, payload = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._in_flight -= 1
+            if kind == "cancelled":
+                self.cancelled_runs += 1
+            elif generation != self.generation:
+                continue
+            elif kind == "error":
+                # A layout the simulator rejects simply has no preview
+                self.last_error = payload
+            else:
+                latest = payload
+        return latest
+
+    def cancel(self):
+        """Drops the pending request and stops the run in progress."""
+        self._set_generation(self.generation + 1)
+
+    def stop(self):
+        self._set_generation(self.generation + 1)
+        self._requests.put(None)
+        self._process.join(timeout=1.0)
+        if self._process.is_alive():
+            self._process.terminate()
+
+    def _set_generation(self, generation):
+        self.generation = generation
+        self._current.value = generation
+
+
+def _preview_loop(requests, results, current):
+    """Worker process: simulates the newest request, answering every request with one message."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C in the editor's terminal stops the editor only
+    while True:
+        item = requests.get()
+        while item is not None:
+            try:
+                newer = requests.get_nowait()
+            except queue.Empty:
+                break
+            results.put(("cancelled", item[0], None))
+            item = newer
+        if item is None:
+            return
+
+        generation, layout, timesteps = item
+        try:
+            result = _simulate(generation, layout, timesteps, lambda: current.value == generation)
+        except Exception as e:
+            results.put(("error", generation, f"{type(e).__name__}: {e}"))
+            continue
+        if result is None:
+            results.put(("cancelled", generation, None))
+        else:
+            results.put(("done", generation, result))
+
+
+def _simulate(generation, layout, timesteps, is_current):
+    from core_sim.core_grid import CoreGrid
+    from core_sim.simulator import Simulator
+
+    start = time.perf_counter()
+    grid = CoreGrid(width=layout["width"], height=layout["height"])
+    grid.initialize_from_layout(layout)
+    sim = Simulator(grid, timesteps, record=False)
+    for _ in range(timesteps):
+        if not is_current():
+            return None
+        sim.step()
+    if not is_current():
+        return None
+
+    cells = sim.grid.grid
+    return PreviewResult(
+        generation=generation,
+        temperature=np.array([[fa.temperature for fa in row] for row in cells]),
+        energy=np.array([[fa.energy_output for fa in row] for row in cells]),
+        fitness=float(sim.meta_history[-1]["fitness"]),
+        total_energy=float(sim.meta_history[-1]["total_energy"]),
+        steps=timesteps,
+        wall_time=time.perf_counter() - start,
+    )
+
+
+def heat_color(value, vmin, vmax):
+    """Blue (vmin) -> yellow -> red (vmax) as a Tk '#rrggbb' color."""
+    t = 0.0 if vmax <= vmin else min(max((value - vmin) / (vmax - vmin), 0.0), 1.0)
+    if t < 0.5:
+        r, g, b = 2 * t, 2 * t, 1.0 - 2 * t
+    else:
+        r, g, b = 1.0, 2 * (1.0 - t), 0.0
+    return "#{:02x}{:02x}{:02x}".format(int(r * 255), int(g * 255), int(b * 255))
@@ -1,16 +1,19 @@
 import json
+from layout_utils.binary_layout import is_binary_layout, load_binary_layout
 
 
 def load_layout(path):
     """
-    Load reactor core layout from a JSON file.
+    Load reactor core layout from a JSON or binary layout file.
 
     Args:
-        path (str): Path to the JSON layout file.
+        path (str): Path to the JSON or binary (.rfl) layout file.
 
     Returns:
         dict: Parsed JSON data with keys like 'width', 'height', 'grid'.
     """
+    if is_binary_layout(path):
+        return load_binary_layout(path)
     with open(path, "r") as f:
         data = json.load(f)
     return data
@@ -1,18 +1,53 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import json
+import struct
+import numpy as np
+from layout_utils.binary_layout import BINARY_LAYOUT_EXTENSION, is_binary_layout, load_binary_layout, save_binary_layout
+from layout_utils.live_preview import PreviewWorker, heat_color
 
-GRID_SIZE = 15
-CELL_SIZE = 30
+GRID_SIZE = 15  # Size of a new, empty layout; loaded layouts keep their own size
+CELL_SIZE = 30  # Initial zoom (pixels per cell)
+MIN_CELL_SIZE = 2
+MAX_CELL_SIZE = 60
+MAX_VIEWPORT = 720  # Largest initial canvas side; bigger layouts scroll
 TYPES = ["Fuel", "ControlRod", "Moderator", "Blank"]
+LAYOUT_FILETYPES = [("JSON Files", "*.json"), ("Binary Layouts", f"*{BINARY_LAYOUT_EXTENSION}")]
+
+PREVIEW_DELAY_MS = 250  # Quiet time after the last edit before a preview run starts
+PREVIEW_POLL_MS = 50
+DRAG_FLUSH_MS = 16  # Drag events are applied in batches, at most once per frame (~60 Hz)
+OVERLAY_INSET = 0.25  # Fraction of a cell between its border and its preview square
+OVERLAY_FIELDS = {"Temperature": "temperature", "Energy": "energy", "None": None}
+
+
+def line_cells(x0, y0, x1, y1):
+    """Cells on the straight line from (x0, y0) to (x1, y1), both ends included (Bresenham)."""
+    cells = []
+    dx, dy = abs(x1 - x0), -abs(y1 - y0)
+    sx, sy = (1 if x0 < x1 else -1), (1 if y0 < y1 else -1)
+    err = dx + dy
+    while True:
+        cells.append((x0, y0))
+        if (x0, y0) == (x1, y1):
+            return cells
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x0 += sx
+        if e2 <= dx:
+            err += dx
+            y0 += sy
 
 
 class GridEditor:
-    def __init__(self, root):
+    def __init__(self, root, width=GRID_SIZE, height=GRID_SIZE):
         self.root = root
         self.root.title("Reactor Layout Editor")
 
-        self.grid_data = [[{"fa_type": "Blank"} for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        self.width, self.height = width, height
+        self.grid_data = [[{"fa_type": "Blank"} for _ in range(width)] for _ in range(height)]
+        self._non_blank = np.zeros((height, width), dtype=bool)  # Kept in step with grid_data
         self.selected_type = tk.StringVar(value="Fuel")
 
         # Use StringVar for Entry widgets
@@ -26,10 +61,34 @@ class GridEditor:
         # For continuous placing
         self.is_dragging = False
         self.last_placed_coords = None  # (x, y) tuple of the last cell filled during a drag
+        self._drag_points = []  # Cells reached by drag events since the last flush
+        self._drag_flush_id = None
+
+        # Canvas items exist only for visible cells: {(x, y): item id}
+        self.cell_size = CELL_SIZE
+        self._cell_items = {}
+        self._overlay_items = {}
+        self._visible = (0, 0, 0, 0)  # x0, y0, x1, y1 (exclusive) of the cells with items
+        self._viewport_after_id = None
+
+        # Live preview: short background simulation of the current layout, overlaid on the grid
+        self.preview = PreviewWorker()
+        self.preview_enabled = tk.BooleanVar(value=True)
+        self.overlay_name = tk.StringVar(value="Temperature")
+        self.preview_status = tk.StringVar(value="")
+        self.preview_result = None
+        self.preview_stale = False  # Layout changed since preview_result was computed
+        self._preview_after_id = None
+        self._overlay_values = None  # Shown preview map and its color range (None = no overlay)
+        self._overlay_range = (0.0, 1.0)
 
         self.setup_ui()
         self.draw_grid()  # Initial draw
 
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.schedule_preview()
+        self.root.after(PREVIEW_POLL_MS, self._poll_preview)
+
     def setup_ui(self):
         control_frame = ttk.Frame(self.root)
         control_frame.pack(side=tk.LEFT, fill=tk.Y, padx=5, pady=5)
@@ -60,14 +119,51 @@ class GridEditor:
         ttk.Button(control_frame, text="Save Layout", command=self.save_layout).pack(fill=tk.X, pady=(10, 5))
         ttk.Button(control_frame, text="Load Layout", command=self.load_layout).pack(fill=tk.X)
 
-        self.canvas = tk.Canvas(self.root, width=GRID_SIZE * CELL_SIZE, height=GRID_SIZE * CELL_SIZE, bg="lightgray")
-        self.canvas.pack(side=tk.RIGHT)
+        # Zoom controls (also Ctrl+mouse wheel and Ctrl +/-)
+        zoom_frame = ttk.Frame(control_frame)
+        zoom_frame.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(zoom_frame, text="Zoom -", width=7, command=lambda: self.zoom(0.5)).pack(side=tk.LEFT)
+        ttk.Button(zoom_frame, text="Zoom +", width=7, command=lambda: self.zoom(2.0)).pack(side=tk.RIGHT)
+
+        # Live preview controls
+        ttk.Separator(control_frame).pack(fill=tk.X, pady=10)
+        ttk.Checkbutton(control_frame, text="Live Preview", variable=self.preview_enabled,
+                        command=self.on_preview_toggle).pack(anchor=tk.W)
+        ttk.Label(control_frame, text="Overlay:").pack(anchor=tk.W, pady=(5, 0))
+        for name in OVERLAY_FIELDS:
+            ttk.Radiobutton(control_frame, text=name, variable=self.overlay_name, value=name,
+                            command=self.draw_overlay).pack(anchor=tk.W)
+        ttk.Label(control_frame, textvariable=self.preview_status, wraplength=160,
+                  justify=tk.LEFT).pack(anchor=tk.W, pady=(5, 0))
+
+        # Scrollable canvas; only the cells inside the visible region get canvas items
+        canvas_frame = ttk.Frame(self.root)
+        canvas_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        self.canvas = tk.Canvas(canvas_frame, bg="lightgray", highlightthickness=0,
+                                width=min(self.width * CELL_SIZE, MAX_VIEWPORT),
+                                height=min(self.height * CELL_SIZE, MAX_VIEWPORT))
+        x_scroll = ttk.Scrollbar(canvas_frame, orient=tk.HORIZONTAL, command=self.canvas.xview)
+        y_scroll = ttk.Scrollbar(canvas_frame, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.canvas.configure(xscrollcommand=lambda *a: self._on_scroll(x_scroll, *a),
+                              yscrollcommand=lambda *a: self._on_scroll(y_scroll, *a))
+        x_scroll.pack(side=tk.BOTTOM, fill=tk.X)
+        y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         # Bind mouse events for continuous placing
         self.canvas.bind("<Button-1>", self.on_mouse_down)
         self.canvas.bind("<B1-Motion>", self.on_mouse_drag)
         self.canvas.bind("<ButtonRelease-1>", self.on_mouse_up)
 
+        # Scrolling and zoom: <MouseWheel> on Windows/macOS, buttons 4/5 on X11
+        self.canvas.bind("<Configure>", lambda e: self.schedule_viewport_refresh())
+        self.canvas.bind("<MouseWheel>", lambda e: self.on_wheel(e, 1 if e.delta > 0 else -1))
+        self.canvas.bind("<Button-4>", lambda e: self.on_wheel(e, 1))
+        self.canvas.bind("<Button-5>", lambda e: self.on_wheel(e, -1))
+        for key in ("<Control-plus>", "<Control-equal>"):
+            self.root.bind(key, lambda e: self.zoom(2.0))
+        self.root.bind("<Control-minus>", lambda e: self.zoom(0.5))
+
     def _validate_enrichment_input(self, P):
         """Validates input for the enrichment entry."""
         if not P:  # Allow empty string for temporary input clearing
@@ -98,14 +194,93 @@ class GridEditor:
         except ValueError:
             return False  # Reject non-numeric input
 
+    # === Drawing ===
+
     def draw_grid(self):
+        """Full redraw: drops every canvas item and recreates the visible cells (after a load)."""
+        self._reset_items()
+        self.refresh_viewport()
+
+    def _reset_items(self):
         self.canvas.delete("all")
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                x1, y1 = x * CELL_SIZE, y * CELL_SIZE
-                x2, y2 = x1 + CELL_SIZE, y1 + CELL_SIZE
-                color = self.get_color(self.grid_data[y][x]["fa_type"])
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="black")
+        self._cell_items.clear()
+        self._overlay_items.clear()
+        self._visible = (0, 0, 0, 0)
+        size = self.cell_size
+        self.canvas.configure(scrollregion=(0, 0, self.width * size, self.height * size))
+
+    def _visible_range(self):
+        size = self.cell_size
+        left, top = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        right = self.canvas.canvasx(max(self.canvas.winfo_width(), int(self.canvas["width"])))
+        bottom = self.canvas.canvasy(max(self.canvas.winfo_height(), int(self.canvas["height"])))
+        return (max(0, int(left // size)), max(0, int(top // size)),
+                min(self.width, int(right // size) + 1), min(self.height, int(bottom // size) + 1))
+
+    def schedule_viewport_refresh(self):
+        # Scroll and resize events arrive in bursts; refresh once when the UI is idle
+        if self._viewport_after_id is None:
+            self._viewport_after_id = self.root.after_idle(self.refresh_viewport)
+
+    def refresh_viewport(self):
+        """Creates items for cells that scrolled into view and deletes those that left it."""
+        self._viewport_after_id = None
+        x0, y0, x1, y1 = visible = self._visible_range()
+        if visible == self._visible:
+            return
+        for (x, y) in [cell for cell in self._cell_items if not (x0 <= cell[0] < x1 and y0 <= cell[1] < y1)]:
+            self.canvas.delete(self._cell_items.pop((x, y)))
+            overlay = self._overlay_items.pop((x, y), None)
+            if overlay is not None:
+                self.canvas.delete(overlay)
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                if (x, y) not in self._cell_items:
+                    self._create_cell(x, y)
+        self._visible = visible
+
+    def _cell_bbox(self, x, y, inset=0.0):
+        size = self.cell_size
+        pad = size * inset
+        return x * size + pad, y * size + pad, (x + 1) * size - pad, (y + 1) * size - pad
+
+    def _create_cell(self, x, y):
+        outline = "black" if self.cell_size >= 6 else ""  # Outlines only clutter a zoomed-out view
+        color = self.get_color(self.grid_data[y][x]["fa_type"])
+        self._cell_items[(x, y)] = self.canvas.create_rectangle(*self._cell_bbox(x, y), fill=color, outline=outline)
+        self._overlay_items[(x, y)] = self.canvas.create_rectangle(
+            *self._cell_bbox(x, y, OVERLAY_INSET), outline="", tags="overlay", **self._overlay_style(x, y))
+
+    def _paint_cell(self, x, y):
+        """Updates the existing items of one cell after its component changed."""
+        item = self._cell_items.get((x, y))
+        if item is None:
+            return  # Off screen: drawn with the right color when it scrolls into view
+        self.canvas.itemconfigure(item, fill=self.get_color(self.grid_data[y][x]["fa_type"]))
+        self.canvas.itemconfigure(self._overlay_items[(x, y)], **self._overlay_style(x, y))
+
+    def _overlay_style(self, x, y):
+        values = self._overlay_values
+        if values is None or self.grid_data[y][x]["fa_type"] == "Blank":
+            return {"state": "hidden"}
+        vmin, vmax = self._overlay_range
+        # Faded while a newer preview is pending
+        return {"state": "normal", "fill": heat_color(values[y][x], vmin, vmax),
+                "stipple": "gray50" if self.preview_stale else ""}
+
+    def draw_overlay(self):
+        """Recolors the preview square of every visible cell from the last preview map."""
+        field = OVERLAY_FIELDS[self.overlay_name.get()]
+        result = self.preview_result
+        self._overlay_values = None
+        if field is not None and result is not None and self.preview_enabled.get():
+            values = result.field(field)
+            shown = self._non_blank
+            if values.shape == shown.shape and shown.any():
+                self._overlay_values = values
+                self._overlay_range = (float(values[shown].min()), float(values[shown].max()))
+        for (x, y), item in self._overlay_items.items():
+            self.canvas.itemconfigure(item, **self._overlay_style(x, y))
 
     def get_color(self, cell_type):
         return {
@@ -115,10 +290,52 @@ class GridEditor:
             "Blank": "white",
         }.get(cell_type, "white")
 
-    def place_component(self, x, y):
-        """Places the currently selected component at (x, y) if valid."""
-        if not (0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE):
+    # === Viewport ===
+
+    def _on_scroll(self, scrollbar, first, last):
+        scrollbar.set(first, last)
+        self.schedule_viewport_refresh()
+
+    def on_wheel(self, event, direction):
+        if event.state & 0x4:  # Ctrl: zoom around the pointer
+            self.zoom(2.0 if direction > 0 else 0.5, event)
+        elif event.state & 0x1:  # Shift: scroll horizontally
+            self.canvas.xview_scroll(-direction * 3, "units")
+        else:
+            self.canvas.yview_scroll(-direction * 3, "units")
+
+    def zoom(self, factor, event=None):
+        """Changes the cell size, keeping the cell under the pointer (or the view center) in place."""
+        old_size = self.cell_size
+        new_size = int(min(max(round(old_size * factor), MIN_CELL_SIZE), MAX_CELL_SIZE))
+        if new_size == old_size:
             return
+        px = event.x if event is not None else self.canvas.winfo_width() / 2
+        py = event.y if event is not None else self.canvas.winfo_height() / 2
+        gx, gy = self.canvas.canvasx(px) / old_size, self.canvas.canvasy(py) / old_size
+
+        self.cell_size = new_size
+        self._reset_items()
+        self.canvas.xview_moveto(max(0.0, gx * new_size - px) / (self.width * new_size))
+        self.canvas.yview_moveto(max(0.0, gy * new_size - py) / (self.height * new_size))
+        self.refresh_viewport()
+
+    # === Editing ===
+
+    def _event_cell(self, event):
+        size = self.cell_size
+        return int(self.canvas.canvasx(event.x) // size), int(self.canvas.canvasy(event.y) // size)
+
+    def _set_cell(self, x, y):
+        """
+        Stores the selected component at (x, y) without redrawing.
+
+        Returns:
+            bool or None: True if the cell changed, False if it already held that
+            component, None if the placement was rejected (invalid fuel values).
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
 
         cell_type = self.selected_type.get()
         cell = {"fa_type": cell_type}
@@ -132,78 +349,179 @@ class GridEditor:
             if not (0.01 <= cell["enrichment"] <= 0.10 and 0.1 <= cell["life"] <= 1.0):
                 messagebox.showwarning("Invalid Fuel Properties",
                                        "Please enter valid Enrichment (0.01-0.10) and Life (0.1-1.0) values for Fuel.")
-                return  # Do not place if values are out of range or not yet validated
+                return None  # Do not place if values are out of range or not yet validated
 
+        if self.grid_data[y][x] == cell:
+            return False
         self.grid_data[y][x] = cell
-        self.draw_grid()
+        self._non_blank[y, x] = cell_type != "Blank"
+        return True
+
+    def place_component(self, x, y):
+        """Places the currently selected component at (x, y) if valid."""
+        placed = self._set_cell(x, y)
+        if placed:
+            self._paint_cell(x, y)
+            self.schedule_preview()
+        return placed
 
     def on_mouse_down(self, event):
         self.is_dragging = True
-        x, y = event.x // CELL_SIZE, event.y // CELL_SIZE
+        x, y = self._event_cell(event)
         self.last_placed_coords = (x, y)  # Initialize last placed
-        self.place_component(x, y)
+        if self.place_component(x, y) is None:
+            self.is_dragging = False
 
     def on_mouse_drag(self, event):
         if self.is_dragging:
-            x, y = event.x // CELL_SIZE, event.y // CELL_SIZE
-            if (x, y) != self.last_placed_coords:  # Only place if moved to a new cell
-                self.place_component(x, y)
-                self.last_placed_coords = (x, y)
+            self._drag_points.append(self._event_cell(event))
+            if self._drag_flush_id is None:
+                self._drag_flush_id = self.root.after(DRAG_FLUSH_MS, self._flush_drag)
+
+    def _flush_drag(self):
+        """Applies the drag events of one frame; fast drags are filled in along straight lines."""
+        self._drag_flush_id = None
+        points, self._drag_points = self._drag_points, []
+        changed = False
+        for point in points:
+            if not self.is_dragging or point == self.last_placed_coords:
+                continue
+            for x, y in line_cells(*self.last_placed_coords, *point)[1:]:
+                placed = self._set_cell(x, y)
+                if placed is None:
+                    self.is_dragging = False
+                    break
+                if placed:
+                    self._paint_cell(x, y)
+                    changed = True
+            self.last_placed_coords = point
+        if changed:
+            self.schedule_preview()
 
     def on_mouse_up(self, event):
+        if self._drag_flush_id is not None:
+            self.root.after_cancel(self._drag_flush_id)
+            self._flush_drag()
         self.is_dragging = False
         self.last_placed_coords = None  # Reset state
 
+    # === Live preview ===
+
+    def schedule_preview(self):
+        """Restarts the preview countdown; called after every layout change."""
+        if not self.preview_enabled.get():
+            return
+        if self._preview_after_id is not None:
+            self.root.after_cancel(self._preview_after_id)
+        self.preview.cancel()  # The run in progress (if any) is for an outdated layout
+        if self.preview_result is not None and not self.preview_stale:
+            self.preview_stale = True
+            self.draw_overlay()
+        self.preview_status.set("Preview: waiting for edits to settle...")
+        self._preview_after_id = self.root.after(PREVIEW_DELAY_MS, self._start_preview)
+
+    def _start_preview(self):
+        self._preview_after_id = None
+        # Cells are replaced, never mutated, so copying the rows gives the worker a stable snapshot
+        layout = {"width": self.width, "height": self.height, "grid": [list(row) for row in self.grid_data]}
+        self.preview.request(layout)
+        self.preview_status.set(f"Preview: simulating {self.preview.timesteps} steps...")
+
+    def _poll_preview(self):
+        result = self.preview.poll()
+        if result is not None:
+            self.preview_result = result
+            self.preview_stale = False
+            self.preview_status.set(f"Preview ({result.steps} steps, {result.wall_time:.2f}s):\n"
+                                    f"fitness ~ {result.fitness:.1f}\n"
+                                    f"max T {result.temperature.max():.0f}, energy {result.total_energy:.0f}")
+            self.draw_overlay()
+        elif self.preview.last_error and not self.preview.running and self._preview_after_id is None:
+            self.preview_status.set(f"Preview failed: {self.preview.last_error}")
+        self.root.after(PREVIEW_POLL_MS, self._poll_preview)
+
+    def on_preview_toggle(self):
+        if self.preview_enabled.get():
+            self.schedule_preview()
+        else:
+            if self._preview_after_id is not None:
+                self.root.after_cancel(self._preview_after_id)
+                self._preview_after_id = None
+            self.preview.cancel()
+            self.preview_status.set("")
+            self.draw_overlay()
+
+    def on_close(self):
+        self.preview.stop()
+        self.root.destroy()
+
+    # === Files ===
+
     def save_layout(self):
-        file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON Files", "*.json")])
+        file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=LAYOUT_FILETYPES)
         if file_path:
             layout_data = {
-                "width": GRID_SIZE,
-                "height": GRID_SIZE,
+                "width": self.width,
+                "height": self.height,
                 "grid": self.grid_data
             }
             try:
-                with open(file_path, "w") as f:
-                    json.dump(layout_data, f, indent=2)
+                if file_path.endswith(BINARY_LAYOUT_EXTENSION):
+                    save_binary_layout(layout_data, file_path)
+                else:
+                    with open(file_path, "w") as f:
+                        json.dump(layout_data, f, indent=2)
                 messagebox.showinfo("Save Successful", f"Layout saved to {file_path}")
             except IOError as e:
                 messagebox.showerror("Save Error", f"Could not save file: {e}")
+            except (ValueError, struct.error) as e:
+                messagebox.showerror("Save Error", f"Could not encode layout: {e}")
 
-    def load_layout(self):
-        file_path = filedialog.askopenfilename(filetypes=[("JSON Files", "*.json")])
+    def load_layout(self, file_path=None):
+        interactive = file_path is None
+        file_path = file_path or filedialog.askopenfilename(filetypes=LAYOUT_FILETYPES)
         if file_path:
             try:
-                with open(file_path, "r") as f:
-                    layout_data = json.load(f)
-                    # Basic validation of loaded data
-                    if "grid" in layout_data and isinstance(layout_data["grid"], list):
-                        loaded_grid = layout_data["grid"]
-                        # Check if grid dimensions match or handle resizing
-                        if len(loaded_grid) == GRID_SIZE and all(len(row) == GRID_SIZE for row in loaded_grid):
-                            self.grid_data = loaded_grid
-                            self.draw_grid()
-                            messagebox.showinfo("Load Successful", f"Layout loaded from {file_path}")
-                        else:
-                            messagebox.showwarning("Load Warning",
-                                                   "Loaded grid dimensions do not match current editor size (15x15). Displaying partial grid if smaller, or only first 15x15 if larger.")
-                            # For simplicity, if dimensions don't match, we'll try to fit the data
-                            # A more robust solution would dynamically resize GRID_SIZE or prompt the user.
-                            self.grid_data = [[{"fa_type": "Blank"} for _ in range(GRID_SIZE)] for _ in
-                                              range(GRID_SIZE)]
-                            for r_idx, row in enumerate(loaded_grid):
-                                if r_idx < GRID_SIZE:
-                                    for c_idx, cell in enumerate(row):
-                                        if c_idx < GRID_SIZE:
-                                            self.grid_data[r_idx][c_idx] = cell
-                            self.draw_grid()
-                    else:
-                        messagebox.showerror("Load Error", "Invalid JSON format: 'grid' key missing or malformed.")
+                if is_binary_layout(file_path):
+                    layout_data = load_binary_layout(file_path)
+                else:
+                    with open(file_path, "r") as f:
+                        layout_data = json.load(f)
+                # Basic validation of loaded data
+                loaded_grid = layout_data.get("grid")
+                if (isinstance(loaded_grid, list) and loaded_grid and all(isinstance(row, list) for row in loaded_grid)
+                        and len({len(row) for row in loaded_grid}) == 1):
+                    # The editor takes the size of the loaded layout
+                    self.grid_data = loaded_grid
+                    self._non_blank = np.array([[cell["fa_type"] != "Blank" for cell in row] for row in loaded_grid])
+                    self.height, self.width = len(loaded_grid), len(loaded_grid[0])
+                    self.preview.cancel()
+                    self.preview_result = None
+                    self._overlay_values = None
+                    self.draw_grid()
+                    self.schedule_preview()
+                    self.root.title(f"Reactor Layout Editor - {file_path} ({self.width}x{self.height})")
+                    if interactive:
+                        messagebox.showinfo("Load Successful", f"Layout loaded from {file_path}")
+                else:
+                    messagebox.showerror("Load Error", "Invalid layout: 'grid' key missing or not rectangular.")
             except json.JSONDecodeError as e:
                 messagebox.showerror("Load Error", f"Invalid JSON file: {e}")
             except IOError as e:
                 messagebox.showerror("Load Error", f"Could not open file: {e}")
+            except (ValueError, struct.error) as e:
+                messagebox.showerror("Load Error", f"Invalid layout file: {e}")
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reactor layout editor")
+    parser.add_argument("layout", nargs="?", help="Layout file to open (JSON or binary)")
+    parser.add_argument("--size", type=int, default=GRID_SIZE, help="Size of a new, empty layout")
+    args = parser.parse_args()
+
     root = tk.Tk()
-    app = GridEditor(root)
-    root.mainloop()
\ No newline at end of file
+    app = GridEditor(root, width=args.size, height=args.size)
+    if args.layout:
+        app.load_layout(args.layout)
+    root.mainloop()
@@ -3,6 +3,8 @@ import os
 import json
 from core_sim.core_grid import CoreGrid
 from core_sim.simulator import Simulator
+from core_sim.checkpoint import load_checkpoint
+from core_sim.trajectory import TrajectoryEncoding
 from layout_utils.load_layout import load_layout
 from optimization.batch_runner import evaluate_layouts_in_batch
 from core_sim.constants import TIMESTEPS  # Make sure this exists
@@ -18,8 +20,53 @@ def parse_args():
         help="Path to output log file (ignored in batch mode)"
     )
     parser.add_argument(
-        "--timesteps", type=int, default=TIMESTEPS,
-        help="Number of simulation timesteps"
+        "--timesteps", type=int, default=None,
+        help=f"Number of simulation timesteps (default {TIMESTEPS}, or the checkpoint's)"
+    )
+    parser.add_argument(
+        "--trajectory", type=str, default=None,
+        help="Optional directory for a memory-mapped trajectory store (used by the visualizer)"
+    )
+    parser.add_argument(
+        "--trajectory-encoding", choices=["raw", "lossless", "quantized"], default="raw",
+        help="Frame encoding of the trajectory store: raw .npy, lossless delta, or quantized delta"
+    )
+    parser.add_argument(
+        "--error-bound", type=float, default=None,
+        help="Absolute error bound for --trajectory-encoding quantized (default: per-field defaults)"
+    )
+    parser.add_argument(
+        "--keyframe-every", type=int, default=50,
+        help="Keyframe interval of an encoded trajectory store"
+    )
+    parser.add_argument(
+        "--recording", choices=["frames", "stats"], default=None,
+        help="Log every frame, or only per-cell online statistics "
+             "(default: frames for single runs, stats in batch mode)"
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Time each phase of Simulator.step and print a breakdown at the end"
+    )
+    parser.add_argument(
+        "--adaptive", action="store_true",
+        help="Use adaptive timestepping (output stays on the fixed timestep grid)"
+    )
+    parser.add_argument(
+        "--dtype", choices=["float64", "float32"], default=None,
+        help="Precision of the flux field and of logged frames / output (default float64, or the checkpoint's)"
+    )
+    parser.add_argument(
+        "--checkpoint-every", type=int, default=None,
+        help="Write a resumable checkpoint every N steps"
+    )
+    parser.add_argument(
+        "--checkpoint", type=str, default="output/checkpoint.npz",
+        help="Checkpoint file written by --checkpoint-every"
+    )
+    parser.add_argument(
+        "--resume", type=str, default=None,
+        help="Resume a run from a checkpoint file (--layout is ignored)"
     )
     parser.add_argument(
         "--batch", action="store_true",
@@ -33,6 +80,10 @@ def parse_args():
         "--batch-output", type=str, default="output/batch",
         help="Output directory for batch results"
     )
+    parser.add_argument(
+        "--batch-workers", type=int, default=1,
+        help="Simulate batch layouts in this many processes"
+    )
     return parser.parse_args()
 
 def main():
@@ -42,9 +93,28 @@ def main():
         "some_parameter": 1.0,  # You can expand this config as needed
     }
 
+    encoding = TrajectoryEncoding(args.trajectory_encoding, args.error_bound, args.keyframe_every)
+
     if args.batch:
         print("🚀 Running in batch mode...")
-        evaluate_layouts_in_batch(args.batch_dir, args.batch_output, config)
+        evaluate_layouts_in_batch(args.batch_dir, args.batch_output, config, recording=args.recording or "stats",
+                                  backend="pool" if args.batch_workers > 1 else "serial", workers=args.batch_workers)
+
+    elif args.resume:
+        state = load_checkpoint(args.resume)
+        print(f"🚀 Resuming simulation from {args.resume} at step {state['header']['step']}")
+        sim = Simulator.from_checkpoint(
+            state,
+            max_timesteps=args.timesteps,
+            output_path=args.output,
+            config=config,
+            trajectory_path=args.trajectory,
+            trajectory_encoding=encoding,
+            profile=args.profile,
+            dtype=args.dtype,
+            recording=args.recording
+        )
+        sim.run(checkpoint_every=args.checkpoint_every, checkpoint_path=args.checkpoint)
 
     else:
         print(f"🚀 Running single simulation for layout: {args.layout}")
@@ -54,12 +124,19 @@ def main():
 
         sim = Simulator(
             grid=grid,
-            max_timesteps=args.timesteps,
+            max_timesteps=args.timesteps or TIMESTEPS,
             output_path=args.output,
-            config=config
+            config=config,
+            trajectory_path=args.trajectory,
+            trajectory_encoding=encoding,
+            profile=args.profile,
+            adaptive=args.adaptive,
+            dtype=args.dtype or "float64",
+            recording=args.recording or "frames"
         )
-        sim.run()
+        sim.run(checkpoint_every=args.checkpoint_every, checkpoint_path=args.checkpoint)
 
+    if not args.batch:
         # Load final meta snapshot from saved log
         with open(args.output, "r") as f:
             data = json.load(f)
@@ -1,5 +1,5 @@
 # main_ga.py
-from optimization_ga.run_ga import run_optimization
+from optimization_ga.run_ga import run_optimization, run_pareto_optimization
 import sys
 
 
@@ -10,6 +10,7 @@ def main():
     quick_mode = '--quick' in sys.argv
     no_sim = '--no-sim' in sys.argv
     safe_mode = '--safe' in sys.argv
+    pareto_mode = '--pareto' in sys.argv
 
     # Konfiguracja algorytmu
     if quick_mode:
@@ -24,7 +25,11 @@ def main():
             'timesteps': 50,
             'temp_limit': 800,  # Limit optymalnej temperatury
             'critical_temp': 1000,  # Temperatura krytyczna
-            'optimal_fuel_ratio': 0.65
+            'optimal_fuel_ratio': 0.65,
+            'stagnation_generations': 15,  # Stop bez nowego rekordu przez tyle generacji
+            'min_diversity': 0.02,  # Poniżej - hipermutacja populacji
+            'diversity_action': 'hypermutation',
+            'canonicalize_symmetry': True  # Lustrzane układy liczone raz
         }
     elif safe_mode:
         print("🛡️ Tryb bezpieczny - niższe limity temperatury")
@@ -38,7 +43,11 @@ def main():
             'timesteps': 100,
             'temp_limit': 700,  # Niższy limit
             'critical_temp': 900,  # Niższa temperatura krytyczna
-            'optimal_fuel_ratio': 0.6
+            'optimal_fuel_ratio': 0.6,
+            'stagnation_generations': 30,  # Stop bez nowego rekordu przez tyle generacji
+            'min_diversity': 0.02,  # Poniżej - hipermutacja populacji
+            'diversity_action': 'hypermutation',
+            'canonicalize_symmetry': True  # Lustrzane układy liczone raz
         }
     else:
         print("🚀 Tryb standardowy")
@@ -52,7 +61,11 @@ def main():
             'timesteps': 100,
             'temp_limit': 800,  # Limit optymalnej temperatury
             'critical_temp': 1000,  # Temperatura krytyczna
-            'optimal_fuel_ratio': 0.65
+            'optimal_fuel_ratio': 0.65,
+            'stagnation_generations': 30,  # Stop bez nowego rekordu przez tyle generacji
+            'min_diversity': 0.02,  # Poniżej - hipermutacja populacji
+            'diversity_action': 'hypermutation',
+            'canonicalize_symmetry': True  # Lustrzane układy liczone raz
         }
 
     print(f"\n⚙️  Parametry bezpieczeństwa:")
@@ -63,6 +76,14 @@ def main():
     # Ścieżka do bazowego layoutu
     base_layout = 'layouts/ga_base_layouts/base_layout.json'
 
+    if pareto_mode:
+        # Jeden przebieg NSGA-II daje cały front energia / temperatura / paliwo
+        print("🎯 Tryb wielokryterialny - zapis całego frontu Pareto")
+        results = run_pareto_optimization(base_layout, config)
+        print("\n🎉 Gotowe!")
+        print(f"📁 Front Pareto zapisany w: {results['ga_output_dir']}")
+        return
+
     # Uruchom optymalizację
     results = run_optimization(
         base_layout,
@@ -88,6 +109,7 @@ if __name__ == "__main__":
     print("  python main_ga.py --quick   - szybki tryb (mniej generacji)")
     print("  python main_ga.py --safe    - tryb bezpieczny (niższe limity)")
     print("  python main_ga.py --no-sim  - bez końcowej symulacji")
+    print("  python main_ga.py --pareto  - NSGA-II, cały front Pareto w jednym przebiegu")
     print("=" * 60)
 
     main()
\ No newline at end of file
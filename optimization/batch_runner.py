@@ -2,40 +2,49 @@
 
 import os
 import glob
-from core_sim.core_grid import CoreGrid
-from core_sim.simulator import Simulator
-from layout_utils.load_layout import load_layout
+from core_sim.evaluation import evaluate_many
 from core_sim.constants import TIMESTEPS
 
-def evaluate_layouts_in_batch(layout_dir, output_dir, config):
+def evaluate_layouts_in_batch(layout_dir, output_dir, config, recording="stats", backend="serial", workers=None):
+    """
+    Simulates every layout JSON in `layout_dir` and ranks them by final fitness.
+
+    With recording="stats" (the default for screening) each run keeps only per-cell
+    online statistics (core_sim.cell_stats) instead of full trajectories; their fuel-cell
+    summary (peak temperature, depletion, ...) is added to the layout's row in
+    batch_summary.json. recording="frames" writes full per-step logs as before.
+    The runs go through core_sim.evaluation.evaluate_many, so backend="pool" spreads
+    them over `workers` processes.
+    """
     os.makedirs(output_dir, exist_ok=True)
     layout_files = glob.glob(os.path.join(layout_dir, "*.json"))
 
-    results = []
-
-    for layout_path in layout_files:
-        layout_name = os.path.basename(layout_path)
-        print(f"\n🔄 Evaluating layout: {layout_name}")
-
-        layout = load_layout(layout_path)
-        grid = CoreGrid(width=layout["width"], height=layout["height"])
-        grid.initialize_from_layout(layout)
-
-        output_path = os.path.join(output_dir, layout_name.replace(".json", "_log.json"))
+    print(f"\n🔄 Evaluating {len(layout_files)} layouts ({backend} backend)")
+    records = evaluate_many(layout_files, {
+        "timesteps": TIMESTEPS,
+        "simulator_config": config,
+        "stop_on_critical": False,  # rank complete runs
+        "output_dir": output_dir,
+        "recording": recording,
+        "backend": backend,
+        "workers": workers,
+    })
 
-        sim = Simulator(grid=grid, max_timesteps=TIMESTEPS, output_path=output_path, config=config)
-        sim.run()
-
-        final_fitness = sim.meta_history[-1]["fitness"]
-
-        results.append({
-            "layout": layout_name,
-            "fitness": final_fitness,
-            "output_path": output_path
-        })
-
-    # Sort by fitness descending
-    results.sort(key=lambda x: x["fitness"], reverse=True)
+    results = []
+    for record in records:
+        result = {
+            "layout": record["layout"],
+            "fitness": record["fitness"],
+            "output_path": record.get("output_path")
+        }
+        if "cell_stats" in record:
+            result["cell_stats"] = record["cell_stats"]
+        if record["error"]:
+            result["error"] = record["error"]
+        results.append(result)
+
+    # Sort by fitness descending (failed runs last)
+    results.sort(key=lambda x: x["fitness"] if x["fitness"] is not None else float("-inf"), reverse=True)
 
     # Save summary
     summary_path = os.path.join(output_dir, "batch_summary.json")
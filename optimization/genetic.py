@@ -1,17 +1,24 @@
 import random
 import copy
 import json
-from optimization.fitness import run_simulation_and_score
 from core_sim.core_grid import CoreGrid
-import core_sim.assemblies.empty
+from core_sim.assemblies.control_rod import ControlRod
+from core_sim.assemblies.empty import Blank
+from core_sim.assemblies.fuel import Fuel
+from core_sim.assemblies.moderator import Moderator
+from core_sim.evaluation import EvaluationPool, evaluate_many
+from optimization.optimizer_interface import grid_to_layout
 import os
 
 class Layout:
     def __init__(self, grid):
         self.grid = grid
 
-    def evaluate(self):
-        return run_simulation_and_score(self.grid, num_steps=50)
+    def to_layout(self):
+        return grid_to_layout(self.grid)
+
+    def evaluate(self, num_steps=50):
+        return evaluate_many([self.to_layout()], {"timesteps": num_steps, "stop_on_critical": False})[0]["fitness"]
 
     def enforce_symmetry(self):
         rows = len(self.grid)
@@ -21,12 +28,25 @@ class Layout:
                 self.grid[i][cols - j - 1] = copy.deepcopy(self.grid[i][j])
 
 class GAOptimizer:
-    def __init__(self, layout_size=(10, 10), population_size=30, generations=20, mutation_rate=0.2, elitism=2):
+    def __init__(self, layout_size=(10, 10), population_size=30, generations=20, mutation_rate=0.2, elitism=2,
+                 num_steps=50, backend="serial", workers=None):
         self.layout_size = layout_size
         self.population_size = population_size
         self.generations = generations
         self.mutation_rate = mutation_rate
         self.elitism = elitism
+        # Ewaluacja całych populacji przez core_sim.evaluation (backend: serial, pool, ensemble, service)
+        self.evaluation_config = {"timesteps": num_steps, "stop_on_critical": False,
+                                  "backend": backend, "workers": workers}
+        self.cache = {}  # Wyniki z poprzednich generacji (elita i powtórzone układy nie są liczone ponownie)
+        # Procesy backendu "pool" startują raz na cały run() i są zamykane na jego końcu
+        self.pool = EvaluationPool(workers) if backend == "pool" else None
+
+    def evaluate_population(self, population):
+        records = evaluate_many([layout.to_layout() for layout in population], self.evaluation_config,
+                                cache=self.cache, pool=self.pool)
+        # Symulacja przerwana przed pierwszym krokiem zwraca fitness None - traktujemy ją jak najgorszą
+        return [record["fitness"] if record["fitness"] is not None else float("-inf") for record in records]
 
     def initialize_population(self):
         pop = []
@@ -38,13 +58,13 @@ class GAOptimizer:
                     roll = random.random()
                     if roll < 0.7:
                         enr = random.choice([2.4, 3.2, 4.5])
-                        fa = core_sim.fuel_assembly.Fuel(enrichment=enr)
+                        fa = Fuel(enrichment=enr)
                     elif roll < 0.8:
-                        fa = core_sim.fuel_assembly.ControlRod()
+                        fa = ControlRod()
                     elif roll < 0.9:
-                        fa = core_sim.fuel_assembly.Moderator()
+                        fa = Moderator()
                     else:
-                        fa = core_sim.fuel_assembly.Blank()
+                        fa = Blank()
                     grid[i][j] = fa
             layout = Layout(grid)
             layout.enforce_symmetry()
@@ -89,13 +109,13 @@ class GAOptimizer:
             c = random.randrange(size_y)
             typ = random.choice(["fuel", "control_rod", "moderator", "blank"])
             if typ == "fuel":
-                layout.grid[r][c] = core_sim.fuel_assembly.Fuel(enrichment=random.choice([2.4, 3.2, 4.5]))
+                layout.grid[r][c] = Fuel(enrichment=random.choice([2.4, 3.2, 4.5]))
             elif typ == "control_rod":
-                layout.grid[r][c] = core_sim.fuel_assembly.ControlRod()
+                layout.grid[r][c] = ControlRod()
             elif typ == "moderator":
-                layout.grid[r][c] = core_sim.fuel_assembly.Moderator()
+                layout.grid[r][c] = Moderator()
             else:
-                layout.grid[r][c] = core_sim.fuel_assembly.Blank()
+                layout.grid[r][c] = Blank()
 
     def select_parents(self, population, fitnesses):
         idx1 = random.randint(0, len(population) - 1)
@@ -107,27 +127,31 @@ class GAOptimizer:
         best_layout = None
         best_fitness = float("-inf")
 
-        for gen in range(self.generations):
-            fitnesses = [layout.evaluate() for layout in population]
-            gen_best_fitness = max(fitnesses)
-            gen_best_layout = population[fitnesses.index(gen_best_fitness)]
-            print(f"Gen {gen+1}: best_fitness = {gen_best_fitness:.4f}")
-
-            if gen_best_fitness > best_fitness:
-                best_fitness = gen_best_fitness
-                best_layout = copy.deepcopy(gen_best_layout)
-
-            sorted_pop = [x for _, x in sorted(zip(fitnesses, population), key=lambda p: -p[0])]
-            new_population = sorted_pop[:self.elitism]
-
-            while len(new_population) < self.population_size:
-                p1 = self.select_parents(population, fitnesses)
-                p2 = self.select_parents(population, fitnesses)
-                child = self.crossover(p1, p2)
-                self.mutate(child)
-                new_population.append(child)
-
-            population = new_population
+        try:
+            for gen in range(self.generations):
+                fitnesses = self.evaluate_population(population)
+                gen_best_fitness = max(fitnesses)
+                gen_best_layout = population[fitnesses.index(gen_best_fitness)]
+                print(f"Gen {gen+1}: best_fitness = {gen_best_fitness:.4f}")
+
+                if best_layout is None or gen_best_fitness > best_fitness:
+                    best_fitness = gen_best_fitness
+                    best_layout = copy.deepcopy(gen_best_layout)
+
+                sorted_pop = [x for _, x in sorted(zip(fitnesses, population), key=lambda p: -p[0])]
+                new_population = sorted_pop[:self.elitism]
+
+                while len(new_population) < self.population_size:
+                    p1 = self.select_parents(population, fitnesses)
+                    p2 = self.select_parents(population, fitnesses)
+                    child = self.crossover(p1, p2)
+                    self.mutate(child)
+                    new_population.append(child)
+
+                population = new_population
+        finally:
+            if self.pool is not None:
+                self.pool.close()
 
         # Po zakończeniu zapisujemy najlepszy layout
         def fa_to_dict(fa):
@@ -1,76 +1,69 @@
 # optimizer_interface.py
-from core_sim.assemblies.empty import Fuel
-from core_sim.recorder import Recorder
-from models.penalty_model import PenaltyModel
-from models.energy_output_model import EnergyOutputModel
-# Możesz dołączyć inne modele (np. temperature_model), jeśli będą potrzebne
+from core_sim.core_grid import TYPE_ALIASES
+from core_sim.evaluation import evaluate_many, resolve_config, simulate_metrics
+
+
+def grid_to_layout(grid_layout, enrichment=3.2):
+    """
+    Zamienia 2D listę typów FA (np. [["fuel", "moderator", ...], ...]) albo obiektów FA
+    na layout JSON rozumiany przez CoreGrid.initialize_from_layout.
+    Pola None są traktowane jak Blank, a paliwo podane nazwą dostaje domyślne wzbogacenie.
+    """
+    grid = []
+    for row in grid_layout:
+        cells = []
+        for cell in row:
+            if cell is None:
+                cells.append({"fa_type": "Blank"})
+            elif isinstance(cell, str):
+                fa_type = TYPE_ALIASES.get(cell, cell)
+                cells.append({"fa_type": fa_type, "enrichment": enrichment} if fa_type == "Fuel"
+                             else {"fa_type": fa_type})
+            else:
+                fa_type = TYPE_ALIASES.get(cell.type, cell.type)
+                cells.append({"fa_type": fa_type, "enrichment": cell.enrichment, "life": cell.life}
+                             if fa_type == "Fuel" else {"fa_type": fa_type})
+        grid.append(cells)
+    return {"width": len(grid[0]), "height": len(grid), "grid": grid}
+
+
+def _evaluation_config(num_steps, overheat_temp, **options):
+    # Pełne przebiegi; overheat_temp liczy przekroczenia (temp_violations) w rekordzie
+    return dict(options, timesteps=num_steps, temp_limit=overheat_temp, stop_on_critical=False)
+
+
+def simulate_layouts(grid_layouts, num_steps=50, overheat_temp=620, enrichment=3.2,
+                     backend="serial", workers=None, cache=None):
+    """
+    Symulacja wielu layoutów naraz przez core_sim.evaluation.evaluate_many.
+    Argumenty jak w simulate_layout, plus backend ("serial", "pool", "ensemble", "service"),
+    workers i opcjonalny słownik cache współdzielony między wywołaniami.
+    Zwraca:
+        listę rekordów metryk (fitness, total_energy, max_temp, temp_violations, ...)
+    """
+    layouts = [grid_to_layout(grid_layout, enrichment) for grid_layout in grid_layouts]
+    config = _evaluation_config(num_steps, overheat_temp, backend=backend, workers=workers)
+    return evaluate_many(layouts, config, cache=cache)
+
 
 def simulate_layout(grid_layout, num_steps=50, overheat_temp=620, enrichment=3.2, record_path=None):
     """
     Uruchamia pełną symulację dla danego layoutu FA.
     Argumenty:
-        grid_layout : 2D lista stringów lub typów FA (np. [["fuel", "fuel", ...], ...])
+        grid_layout : 2D lista stringów lub obiektów FA (np. [["fuel", "fuel", ...], ...])
         num_steps : liczba kroków symulacji
-        overheat_temp : próg temperatury do penalizacji
+        overheat_temp : próg temperatury, powyżej którego liczone są przekroczenia
         enrichment : domyślne wzbogacenie, jeśli nie podano
         record_path : jeśli podasz, historia symulacji zostanie zapisana do pliku (opcjonalne)
     Zwraca:
         final_fitness : końcowy fitness layoutu po symulacji
-        (opcjonalnie: inne metryki z ostatniego kroku)
+        (pozostałe metryki ostatniego kroku zwraca simulate_layouts)
     """
-    rows = len(grid_layout)
-    cols = len(grid_layout[0])
-    # Tworzymy grid obiektów FA na podstawie podanego layoutu
-    grid = []
-    for i in range(rows):
-        row = []
-        for j in range(cols):
-            cell_type = grid_layout[i][j]
-            if isinstance(cell_type, Fuel):
-                row.append(cell_type)  # już Fuel, użyj bez zmian
-            elif cell_type == "fuel":
-                row.append(Fuel(enrichment=enrichment))
-            else:
-                # Tu możesz dodać obsługę innych typów, np. ControlRod, Moderator, Blank
-                row.append(Fuel(enrichment=0.0))  # domyślnie fuel z zerowym enrichment
-        grid.append(row)
-
-    recorder = Recorder()
-    penalty_model = PenaltyModel(overheat_temp=overheat_temp)
-    energy_output_model = EnergyOutputModel()
-
-    for step in range(num_steps):
-        # --- Update grid ---
-        old_grid = [[fa for fa in row] for row in grid]
-        for i in range(rows):
-            for j in range(cols):
-                neighbors = []
-                for di, dj in [(-1,0),(1,0),(0,-1),(0,1)]:
-                    ni, nj = i+di, j+dj
-                    if 0 <= ni < rows and 0 <= nj < cols:
-                        neighbors.append(old_grid[ni][nj])
-                grid[i][j].update(neighbors)
-
-        # --- Obliczenia scoringu ---
-        penalty = penalty_model.compute_penalty(grid)
-        total_energy = energy_output_model.compute_output(grid)
-        fitness = total_energy - penalty
-
-        meta = {
-            "step": step,
-            "fitness": fitness,
-            "penalty": penalty,
-            "total_energy": total_energy
-        }
-        recorder.record(grid, meta=meta)
-
-    # --- Zapis historii, jeśli chcesz ---
-    if record_path is not None:
-        recorder.save(record_path)
+    if record_path is None:
+        return simulate_layouts([grid_layout], num_steps, overheat_temp, enrichment)[0]["fitness"]
 
-    # --- Zwracamy końcowy fitness z ostatniego kroku ---
-    final_record = recorder.records[-1]["meta"]
-    return final_record["fitness"]
+    config = resolve_config(_evaluation_config(num_steps, overheat_temp, recording="frames"))
+    return simulate_metrics(grid_to_layout(grid_layout, enrichment), config, output_path=record_path)["fitness"]
 
 # Przykład użycia interfejsu:
 if __name__ == "__main__":
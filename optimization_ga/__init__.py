@@ -1,6 +1,19 @@
 # optimization_ga/__init__.py
-from .ga_optimizer import ReactorGA
-from .chromosome import ReactorChromosome
-from .fitness_evaluator import FitnessEvaluator
+# Leniwe importy: `import optimization_ga` nie ładuje symulatora, dopóki klasa nie jest potrzebna
+import importlib
 
-__all__ = ['ReactorGA', 'ReactorChromosome', 'FitnessEvaluator']
\ No newline at end of file
+_EXPORTS = {
+    'ReactorGA': '.ga_optimizer',
+    'ReactorChromosome': '.chromosome',
+    'FitnessEvaluator': '.fitness_evaluator',
+}
+
+__all__ = ['ReactorGA', 'ReactorChromosome', 'FitnessEvaluator']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,113 +1,125 @@
 # optimization_ga/fitness_evaluator.py
-import os
-from core_sim.core_grid import CoreGrid
-from core_sim.simulator import Simulator
+from core_sim.evaluation import EvaluationPool, evaluate_many
+from .symmetry import canonical_genes
 
 
 class FitnessEvaluator:
     """Ewaluator fitness dla chromosomów reaktora"""
 
-    def __init__(self, timesteps=100, temp_limit=800, critical_temp=1000, optimal_fuel_ratio=0.7):
+    def __init__(self, timesteps=100, temp_limit=800, critical_temp=1000, optimal_fuel_ratio=0.7,
+                 symmetries=None, backend='serial', workers=None):
         self.timesteps = timesteps
         self.temp_limit = temp_limit  # Temperatura optymalna
         self.critical_temp = critical_temp  # Temperatura krytyczna (dyskwalifikacja)
         self.optimal_fuel_ratio = optimal_fuel_ratio
+        # Permutacje genów z symmetry_permutations: lustrzane układy dzielą klucz cache
+        self.symmetries = symmetries
+        # Backend core_sim.evaluation.evaluate_many: 'serial', 'pool', 'ensemble' lub 'service'
+        self.backend = backend
+        self.workers = workers
+        # Procesy backendu 'pool' żyją przez cały przebieg GA (zamyka je close())
+        self.pool = EvaluationPool(workers) if backend == 'pool' else None
         self.cache = {}
+        self.metrics = {}  # Surowe wyniki symulacji (cele NSGA-II), te same klucze co cache
         self.eval_count = 0
+        # Liczniki dla telemetrii GA
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.duplicates = 0  # Powtórzenia w obrębie jednej populacji (evaluate_population)
+        self.simulated_steps = 0
+
+    def cache_key(self, genes):
+        """Klucz cache: postać kanoniczna genów względem symetrii bazowego layoutu"""
+        return canonical_genes(genes, self.symmetries)
 
     def evaluate(self, chromosome):
         """Oblicz fitness dla danego chromosomu"""
-        # Cache dla przyspieszenia
-        gene_hash = tuple(chromosome.genes)
-        if gene_hash in self.cache:
-            return self.cache[gene_hash]
-
-        # Konwertuj chromosom na layout
-        layout = chromosome.to_layout()
-
-        # Stwórz siatkę i zainicjalizuj
-        grid = CoreGrid(width=layout['width'], height=layout['height'])
-        grid.initialize_from_layout(layout)
-
-        # Ścieżka dla tymczasowych wyników
-        temp_dir = "output/ga_temp"
-        os.makedirs(temp_dir, exist_ok=True)
-        output_path = f"{temp_dir}/eval_{self.eval_count}.json"
-
-        # Stwórz symulator
-        simulator = Simulator(
-            grid=grid,
-            max_timesteps=self.timesteps,
-            output_path=output_path
-        )
-
-        # Uruchom symulację
-        total_energy = 0.0
-        max_temp = 0.0
-        avg_temp = 0.0
-        temp_violations = 0
-        critical_violation = False
-
-        try:
-            for step in range(self.timesteps):
-                simulator.step()
-
-                if simulator.meta_history:
-                    total_energy += simulator.meta_history[-1]['total_energy']
-
-                    # Sprawdź temperatury w tym kroku
-                    step_max_temp = 0.0
-                    step_temps = []
-
-                    for y in range(grid.height):
-                        for x in range(grid.width):
-                            fa = grid.get_fa(x, y)
-                            if fa and hasattr(fa, 'temperature'):
-                                temp = fa.temperature
-                                step_temps.append(temp)
-                                step_max_temp = max(step_max_temp, temp)
-
-                                # Sprawdź przekroczenia
-                                if temp > self.temp_limit:
-                                    temp_violations += 1
-                                if temp > self.critical_temp:
-                                    critical_violation = True
-
-                    max_temp = max(max_temp, step_max_temp)
-                    if step_temps:
-                        avg_temp += sum(step_temps) / len(step_temps)
-
-                    # Przerwij jeśli temperatura krytyczna
-                    if critical_violation:
-                        break
-
-        except Exception as e:
-            print(f"Błąd podczas symulacji: {e}")
+        return self.evaluate_population([chromosome])[0]
+
+    def evaluate_metrics(self, chromosome):
+        """
+        Surowe wyniki symulacji chromosomu zamiast jednej wartości fitness
+        (energia, temperatury, stosunek paliwa osobno - cele optymalizacji wielokryterialnej).
+
+        Returns:
+            dict: Argumenty _calculate_fitness (total_energy, max_temp, avg_temp, fuel_ratio,
+                temp_violations, critical_violation, steps_completed) oraz 'fitness'.
+        """
+        return self.evaluate_population_metrics([chromosome])[0]
+
+    def evaluate_population(self, population):
+        """Fitness całej populacji; każdy unikalny (kanoniczny) układ jest liczony raz"""
+        return [self.cache[key] for key in self._evaluate_unique(population)]
+
+    def evaluate_population_metrics(self, population):
+        """Wyniki evaluate_metrics całej populacji, z deduplikacją jak evaluate_population"""
+        return [{**self.metrics[key], 'fitness': self.cache[key]} for key in self._evaluate_unique(population)]
+
+    def _evaluate_unique(self, population):
+        """
+        Deduplikacja populacji przed ewaluacją: powtórzenia (także lustrzane) liczone są
+        w self.duplicates, układy z cache w self.cache_hits, a pozostałe unikalne układy
+        trafiają jedną partią do evaluate_many.
+
+        Returns:
+            list: Klucze cache kolejnych osobników.
+        """
+        keys = [self.cache_key(chromosome.genes) for chromosome in population]
+        seen = set()
+        pending = {}
+        for chromosome, key in zip(population, keys):
+            if key in seen:
+                self.duplicates += 1
+                continue
+            seen.add(key)
+            if key in self.cache:
+                self.cache_hits += 1
+            else:
+                pending[key] = chromosome
+        self.cache_misses += len(pending)
+
+        if pending:
+            records = evaluate_many([chromosome.to_layout() for chromosome in pending.values()],
+                                    self.evaluation_config(), pool=self.pool)
+            for (key, chromosome), record in zip(pending.items(), records):
+                metrics = self._metrics_from_record(record, chromosome)
+                self.cache[key] = self._calculate_fitness(**metrics)
+                self.metrics[key] = metrics
+                self.simulated_steps += metrics['steps_completed']
+                self.eval_count += 1
+        return keys
+
+    def close(self):
+        """Zamknij procesy robocze backendu 'pool' (przy kolejnej ewaluacji wystartują ponownie)"""
+        if self.pool is not None:
+            self.pool.close()
+
+    def evaluation_config(self):
+        """Konfiguracja evaluate_many odpowiadająca ustawieniom ewaluatora"""
+        return {
+            'timesteps': self.timesteps,
+            'temp_limit': self.temp_limit,
+            'critical_temp': self.critical_temp,
+            'stop_on_critical': True,  # Przerwij symulację po przekroczeniu temperatury krytycznej
+            'backend': self.backend,
+            'workers': self.workers,
+        }
+
+    def _metrics_from_record(self, record, chromosome):
+        """Argumenty _calculate_fitness z rekordu evaluate_many"""
+        total_energy = record['cumulative_energy']
+        if record['error']:
+            print(f"Błąd podczas symulacji: {record['error']}")
             total_energy = -1000000  # Duża kara za błędną konfigurację
-
-        # Oblicz średnią temperaturę
-        if self.timesteps > 0:
-            avg_temp /= min(step + 1, self.timesteps)  # step+1 bo może być przerwane
-
-        # Oblicz fitness
-        fitness_value = self._calculate_fitness(
-            total_energy=total_energy,
-            max_temp=max_temp,
-            avg_temp=avg_temp,
-            fuel_ratio=chromosome.get_fuel_ratio(),
-            temp_violations=temp_violations,
-            critical_violation=critical_violation,
-            steps_completed=step + 1 if 'step' in locals() else 0
-        )
-
-        # Cache wynik
-        self.cache[gene_hash] = fitness_value
-        self.eval_count += 1
-
-        # Usuń tymczasowe pliki
-        self._cleanup_temp_files(output_path)
-
-        return fitness_value
+        return {
+            'total_energy': total_energy,
+            'max_temp': record['max_temp'],
+            'avg_temp': record['avg_temp'],
+            'fuel_ratio': chromosome.get_fuel_ratio(),
+            'temp_violations': record['temp_violations'],
+            'critical_violation': record['critical_violation'],
+            'steps_completed': record['steps_completed'],
+        }
 
     def _calculate_fitness(self, total_energy, max_temp, avg_temp, fuel_ratio,
                            temp_violations, critical_violation, steps_completed):
@@ -159,14 +171,3 @@ class FitnessEvaluator:
             fitness += fuel_bonus
 
         return fitness
-
-    def _cleanup_temp_files(self, output_path):
-        """Usuń tymczasowe pliki"""
-        try:
-            if os.path.exists(output_path):
-                os.remove(output_path)
-            snapshots_path = output_path.replace('.json', '_snapshots.json')
-            if os.path.exists(snapshots_path):
-                os.remove(snapshots_path)
-        except:
-            pass
\ No newline at end of file
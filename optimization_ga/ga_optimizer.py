@@ -1,22 +1,27 @@
 # optimization_ga/ga_optimizer.py
 import json
 import os
-import shutil
+import time
 import numpy as np
 from copy import deepcopy
 from datetime import datetime
 from .chromosome import ReactorChromosome
 from .fitness_evaluator import FitnessEvaluator
 from .genetic_operators import GeneticOperators
+from .pareto import (constraint_violation, crowded_tournament, crowding_distance, non_dominated_sort,
+                     objective_matrix, select_survivors)
+from .symmetry import symmetry_permutations
+from .telemetry import METRICS_FILENAME, append_metrics, population_diversity
+from layout_utils.load_layout import load_layout
+from core_sim.core_grid import TYPE_ALIASES
 
 
 class ReactorGA:
     """Główna klasa algorytmu genetycznego dla optymalizacji reaktora"""
 
-    def __init__(self, base_layout_file, config=None):
-        # Wczytaj bazowy layout
-        with open(base_layout_file, 'r') as f:
-            self.base_layout = json.load(f)
+    def __init__(self, base_layout_file, config=None, output_dir=None):
+        # Wczytaj bazowy layout (JSON lub binarny .rfl)
+        self.base_layout = load_layout(base_layout_file)
 
         # Znajdź pozycje do optymalizacji
         self.movable_positions = self._find_movable_positions()
@@ -32,22 +37,53 @@ class ReactorGA:
             'tournament_size': 3,
             'timesteps': 50,
             'temp_limit': 1000,
-            'optimal_fuel_ratio': 0.7
+            'optimal_fuel_ratio': 0.7,
+            # Kryteria zatrzymania (None = wyłączone, przebieg trwa 'generations' generacji)
+            'stagnation_generations': None,  # Stop po tylu generacjach bez nowego rekordu
+            'max_wall_time_s': None,  # Budżet czasu całego przebiegu
+            'max_evaluations': None,  # Budżet symulacji (trafienia cache są darmowe)
+            # Reakcja na zapaść różnorodności (odległość Hamminga poniżej progu)
+            'min_diversity': None,
+            'diversity_action': 'hypermutation',  # 'stop', 'restart' lub 'hypermutation'
+            'hypermutation_rate': 0.2,
+            # Lustrzane układy dzielą wynik (symulacja jest symetryczna z dokładnością ~1e-5)
+            'canonicalize_symmetry': False,
+            # Powtórzenia w nowej generacji zastępowane losowymi osobnikami
+            'random_immigrants': False,
+            # Gdzie liczone są symulacje (core_sim.evaluation): 'serial', 'pool', 'ensemble' lub 'service'
+            'backend': 'serial',
+            'workers': None
         }
 
         # Połącz z podaną konfiguracją
         self.config = {**default_config, **(config or {})}
 
+        # Symetrie bazowego layoutu (klucze cache ewaluatora)
+        self.symmetry_names, symmetries = ['identity'], None
+        if self.config['canonicalize_symmetry']:
+            self.symmetry_names, symmetries = symmetry_permutations(self.base_layout, self.movable_positions)
+            print(f"Symetrie bazowego layoutu: {', '.join(self.symmetry_names)}")
+
         # Inicjalizuj ewaluator
         self.evaluator = FitnessEvaluator(
             timesteps=self.config['timesteps'],
             temp_limit=self.config['temp_limit'],
-            optimal_fuel_ratio=self.config['optimal_fuel_ratio']
+            optimal_fuel_ratio=self.config['optimal_fuel_ratio'],
+            symmetries=symmetries,
+            backend=self.config['backend'],
+            workers=self.config['workers']
         )
 
         # Operatory genetyczne
         self.operators = GeneticOperators()
 
+        # Telemetria: jedna linia JSON na generację w katalogu wyników
+        self.metrics_path = os.path.join(output_dir, METRICS_FILENAME) if output_dir else None
+
+        # Wynik ostatniego run(): powód zakończenia i interwencje przy zapaści różnorodności
+        self.stop_reason = None
+        self.diversity_events = []
+
     def _find_movable_positions(self):
         """Znajdź pozycje które można optymalizować (Fuel lub Blank)"""
         movable = []
@@ -56,7 +92,7 @@ class ReactorGA:
         for y in range(self.base_layout['height']):
             for x in range(self.base_layout['width']):
                 cell = grid[y][x]
-                fa_type = cell.get('fa_type', '')
+                fa_type = TYPE_ALIASES.get(cell.get('fa_type', ''), cell.get('fa_type', ''))
 
                 # Tylko Fuel i Blank są zmienne
                 if fa_type in ['Fuel', 'Blank']:
@@ -64,6 +100,14 @@ class ReactorGA:
 
         return movable
 
+    def base_genes(self):
+        """Geny odpowiadające bazowemu layoutowi (1 = Fuel, 0 = Blank)"""
+        genes = []
+        for x, y in self.movable_positions:
+            current_type = self.base_layout['grid'][y][x]['fa_type']
+            genes.append(1 if TYPE_ALIASES.get(current_type, current_type) == 'Fuel' else 0)
+        return genes
+
     def initialize_population(self):
         """Inicjalizacja populacji początkowej"""
         population = []
@@ -73,10 +117,7 @@ class ReactorGA:
 
             if i == 0:
                 # Zachowaj obecny układ
-                chromosome.genes = []
-                for x, y in self.movable_positions:
-                    current_type = self.base_layout['grid'][y][x]['fa_type']
-                    chromosome.genes.append(1 if current_type == 'Fuel' else 0)
+                chromosome.genes = self.base_genes()
             elif i == 1:
                 # Wszystko paliwo
                 chromosome.genes = [1] * len(self.movable_positions)
@@ -86,35 +127,49 @@ class ReactorGA:
                                     for j in range(len(self.movable_positions))]
             else:
                 # Losowa inicjalizacja
-                fuel_probability = 0.7
-                chromosome.genes = [1 if np.random.random() < fuel_probability else 0
-                                    for _ in self.movable_positions]
+                chromosome.genes = self._random_genes()
 
             population.append(chromosome)
 
         return population
 
+    def _random_genes(self, fuel_probability=0.7):
+        """Losowe geny (każda pozycja paliwem z prawdopodobieństwem fuel_probability)"""
+        return [1 if np.random.random() < fuel_probability else 0
+                for _ in self.movable_positions]
+
     def run(self):
         """Główna pętla algorytmu genetycznego"""
+        try:
+            return self._run_generations()
+        finally:
+            self.evaluator.close()
+
+    def _run_generations(self):
         population = self.initialize_population()
         best_fitness_history = []
         avg_fitness_history = []
         best_ever = None
         best_fitness_ever = float('-inf')
+        last_improvement = 0
+        run_start = time.perf_counter()
+        simulations_before = self.evaluator.cache_misses
+        self.stop_reason = 'generations'
+        self.diversity_events = []
 
         self._print_header()
 
         for generation in range(self.config['generations']):
             gen_start_time = datetime.now()
+            gen_start = time.perf_counter()
+            counters_before = self._evaluator_counters()
 
-            # Ewaluacja populacji
-            fitness_scores = []
+            # Ewaluacja populacji (każdy unikalny układ raz)
             print(f"\nGeneracja {generation + 1}/{self.config['generations']}")
-
-            for i, chromosome in enumerate(population):
-                print(f"  Ewaluacja osobnika {i + 1}/{len(population)}", end='\r')
-                fitness = self.evaluator.evaluate(chromosome)
-                fitness_scores.append(fitness)
+            immigrants = self._replace_duplicates(population) if self.config['random_immigrants'] else 0
+            fitness_scores = self.evaluator.evaluate_population(population)
+            evaluation_time = time.perf_counter() - gen_start
+            self._print_evaluation_stats(counters_before, immigrants)
 
             # Statystyki i aktualizacja najlepszego
             best_idx = np.argmax(fitness_scores)
@@ -124,6 +179,7 @@ class ReactorGA:
             if best_fitness > best_fitness_ever:
                 best_fitness_ever = best_fitness
                 best_ever = deepcopy(best_chromosome)
+                last_improvement = generation + 1
                 print(f"\n  🎯 NOWY REKORD! Fitness: {best_fitness:.2f}")
 
             best_fitness_history.append(best_fitness)
@@ -137,19 +193,266 @@ class ReactorGA:
                 (datetime.now() - gen_start_time).total_seconds()
             )
 
+            diversity = population_diversity(population)
+            stop_reason = self._stop_reason(
+                generation + 1 - last_improvement, diversity,
+                time.perf_counter() - run_start, self.evaluator.cache_misses - simulations_before
+            )
+            if stop_reason and generation + 1 < self.config['generations']:
+                self.stop_reason = stop_reason
+                print(f"\n  ⏹️  Zatrzymanie po generacji {generation + 1}: {stop_reason}")
+                self._record_metrics(
+                    generation + 1, counters_before, best_fitness, avg_fitness, diversity,
+                    wall_time=time.perf_counter() - gen_start,
+                    evaluation_time=evaluation_time,
+                    breeding_time=0.0,
+                    checkpoint_time=0.0,
+                    immigrants=immigrants
+                )
+                break
+
             # Tworzenie nowej populacji
+            breeding_start = time.perf_counter()
             new_population = self._create_new_population(population, fitness_scores)
+            if self.config['diversity_action'] != 'stop' and self._diversity_collapsed(diversity):
+                new_population = self._restore_diversity(new_population, generation + 1, diversity)
             population = new_population
+            breeding_time = time.perf_counter() - breeding_start
 
             # Checkpoint co 10 generacji
+            checkpoint_start = time.perf_counter()
             if (generation + 1) % 10 == 0:
                 self._save_checkpoint(best_ever, generation + 1)
-
-        # Cleanup
-        self._cleanup_temp_files()
+            checkpoint_time = time.perf_counter() - checkpoint_start
+
+            self._record_metrics(
+                generation + 1, counters_before, best_fitness, avg_fitness, diversity,
+                wall_time=time.perf_counter() - gen_start,
+                evaluation_time=evaluation_time,
+                breeding_time=breeding_time,
+                checkpoint_time=checkpoint_time,
+                immigrants=immigrants
+            )
 
         return best_ever, best_fitness_ever, best_fitness_history, avg_fitness_history
 
+    def _replace_duplicates(self, population):
+        """
+        Losowi imigranci: każdy osobnik powtarzający (także lustrzanie) wcześniejszego
+        w tej samej populacji dostaje nowe losowe geny.
+
+        Returns:
+            int: Liczba zastąpionych osobników.
+        """
+        seen = set()
+        immigrants = 0
+        for i, chromosome in enumerate(population):
+            key = self.evaluator.cache_key(chromosome.genes)
+            if key in seen:
+                immigrant = ReactorChromosome(self.base_layout, self.movable_positions)
+                for _ in range(10):  # kilka prób na wypadek trafienia w istniejący układ
+                    immigrant.genes = self._random_genes()
+                    key = self.evaluator.cache_key(immigrant.genes)
+                    if key not in seen:
+                        break
+                population[i] = immigrant
+                immigrants += 1
+            seen.add(key)
+        return immigrants
+
+    def _diversity_collapsed(self, diversity):
+        """Czy różnorodność spadła poniżej progu 'min_diversity'"""
+        return self.config['min_diversity'] is not None and diversity < self.config['min_diversity']
+
+    def _stop_reason(self, stagnant_generations, diversity, elapsed, simulations):
+        """
+        Sprawdź kryteria zatrzymania po ewaluacji generacji.
+
+        Returns:
+            str | None: 'stagnation', 'diversity_collapse', 'time_budget', 'evaluation_budget'
+                albo None, gdy przebieg ma trwać dalej.
+        """
+        config = self.config
+        if config['stagnation_generations'] is not None and stagnant_generations >= config['stagnation_generations']:
+            return 'stagnation'
+        if config['diversity_action'] == 'stop' and self._diversity_collapsed(diversity):
+            return 'diversity_collapse'
+        if config['max_wall_time_s'] is not None and elapsed >= config['max_wall_time_s']:
+            return 'time_budget'
+        if config['max_evaluations'] is not None and simulations >= config['max_evaluations']:
+            return 'evaluation_budget'
+        return None
+
+    def _restore_diversity(self, population, generation, diversity):
+        """
+        Reakcja na zapaść różnorodności: elita zostaje, pozostali osobnicy są zastępowani
+        losowymi ('restart') albo mutowani z podwyższonym prawdopodobieństwem ('hypermutation').
+        """
+        action = self.config['diversity_action']
+        elites = self.config['elitism_count']
+        if action == 'restart':
+            for chromosome in population[elites:]:
+                chromosome.genes = self._random_genes()
+        elif action == 'hypermutation':
+            population = population[:elites] + [self.operators.mutate(chromosome, self.config['hypermutation_rate'])
+                                                for chromosome in population[elites:]]
+        else:
+            raise ValueError(f"Nieznana reakcja na zapaść różnorodności: {action!r}")
+
+        self.diversity_events.append({
+            'generation': generation,
+            'diversity': diversity,
+            'action': action,
+            'diversity_after': population_diversity(population),
+        })
+        print(f"  🔀 Zapaść różnorodności ({diversity:.3f}) - {action}, "
+              f"nowa różnorodność {self.diversity_events[-1]['diversity_after']:.3f}")
+        return population
+
+    def run_pareto(self):
+        """
+        Wielokryterialna pętla NSGA-II: energia (max), temperatura maksymalna (min)
+        i stosunek paliwa (min) jako osobne cele zamiast jednego fitness. Przekroczenie
+        temperatury krytycznej ('critical_temp' z konfiguracji) i przerwane symulacje
+        są traktowane jako naruszenie ograniczeń.
+
+        Returns:
+            tuple: (chromosomy frontu Pareto bez duplikatów, ich wyniki z evaluate_metrics,
+                historia generacji - lista słowników ze statystykami frontu).
+        """
+        try:
+            return self._run_pareto_generations()
+        finally:
+            self.evaluator.close()
+
+    def _run_pareto_generations(self):
+        size = self.config['population_size']
+        critical_temp = self.config.get('critical_temp', self.evaluator.critical_temp)
+
+        def rank_population(metrics):
+            objectives = objective_matrix(metrics, optimal_fuel_ratio=self.config['optimal_fuel_ratio'])
+            violation = constraint_violation(metrics, self.config['timesteps'], critical_temp)
+            rank = non_dominated_sort(objectives, violation)
+            return rank, crowding_distance(objectives, rank)
+
+        self._print_header()
+        print("  • Tryb: NSGA-II (front Pareto: energia / temperatura / paliwo)")
+
+        # Populacja początkowa wlicza się (symulacje i czas) do metryk generacji 1
+        gen_start = time.perf_counter()
+        counters_before = self._evaluator_counters()
+        population = self.initialize_population()
+        evaluation_start = time.perf_counter()
+        metrics = self.evaluator.evaluate_population_metrics(population)
+        initial_evaluation_time = time.perf_counter() - evaluation_start
+        rank, crowding = rank_population(metrics)
+        history = []
+
+        for generation in range(self.config['generations']):
+            if generation > 0:
+                gen_start = time.perf_counter()
+                counters_before = self._evaluator_counters()
+            print(f"\nGeneracja {generation + 1}/{self.config['generations']}")
+            diversity = population_diversity(population)
+
+            # Potomstwo z turniejów z porównaniem zatłoczenia
+            breeding_start = time.perf_counter()
+            offspring = self._create_offspring(population, rank, crowding)
+            breeding_time = time.perf_counter() - breeding_start
+
+            evaluation_start = time.perf_counter()
+            offspring_metrics = self.evaluator.evaluate_population_metrics(offspring)
+            evaluation_time = time.perf_counter() - evaluation_start + initial_evaluation_time
+            initial_evaluation_time = 0.0
+
+            # Selekcja (mu + lambda) po frontach i zatłoczeniu
+            combined = population + offspring
+            combined_metrics = metrics + offspring_metrics
+            combined_rank, combined_crowding = rank_population(combined_metrics)
+            survivors = select_survivors(combined_rank, combined_crowding, size)
+            population = [combined[i] for i in survivors]
+            metrics = [combined_metrics[i] for i in survivors]
+            rank, crowding = combined_rank[survivors], combined_crowding[survivors]
+
+            front = [m for m, r in zip(metrics, rank) if r == 0]
+            stats = {
+                'generation': generation + 1,
+                'front_size': len(front),
+                'fronts': int(rank.max()) + 1,
+                'max_energy': max(m['total_energy'] for m in front),
+                'min_max_temp': min(m['max_temp'] for m in front),
+                'fuel_ratio_range': [min(m['fuel_ratio'] for m in front), max(m['fuel_ratio'] for m in front)],
+            }
+            history.append(stats)
+            print(f"  📊 Front Pareto: {stats['front_size']} osobników, energia do {stats['max_energy']:.2f}, "
+                  f"temperatura od {stats['min_max_temp']:.1f}, paliwo "
+                  f"{stats['fuel_ratio_range'][0] * 100:.0f}-{stats['fuel_ratio_range'][1] * 100:.0f}%")
+
+            fitness_scores = [m['fitness'] for m in metrics]
+            self._record_metrics(
+                generation + 1, counters_before, max(fitness_scores), np.mean(fitness_scores), diversity,
+                wall_time=time.perf_counter() - gen_start,
+                evaluation_time=evaluation_time,
+                breeding_time=breeding_time,
+                checkpoint_time=0.0
+            )
+
+        # Front końcowy bez powtórzonych układów
+        front_chromosomes, front_metrics, seen = [], [], set()
+        for chromosome, m, r in zip(population, metrics, rank):
+            if r == 0 and tuple(chromosome.genes) not in seen:
+                seen.add(tuple(chromosome.genes))
+                front_chromosomes.append(chromosome)
+                front_metrics.append(m)
+        return front_chromosomes, front_metrics, history
+
+    def _create_offspring(self, population, rank, crowding):
+        """Potomstwo NSGA-II: turniej zatłoczenia, krzyżowanie i mutacja (bez elityzmu)"""
+        offspring = []
+        while len(offspring) < self.config['population_size']:
+            parent1 = population[crowded_tournament(rank, crowding, self.config['tournament_size'], np.random)]
+            parent2 = population[crowded_tournament(rank, crowding, self.config['tournament_size'], np.random)]
+            child1, child2 = self.operators.crossover(parent1, parent2, self.config['crossover_rate'])
+            offspring.append(self.operators.mutate(child1, self.config['mutation_rate']))
+            offspring.append(self.operators.mutate(child2, self.config['mutation_rate']))
+        return offspring[:self.config['population_size']]
+
+    def _evaluator_counters(self):
+        """Migawka liczników ewaluatora (do liczenia przyrostów na generację)"""
+        return {
+            'evaluations': self.evaluator.cache_hits + self.evaluator.cache_misses + self.evaluator.duplicates,
+            'cache_hits': self.evaluator.cache_hits,
+            'cache_misses': self.evaluator.cache_misses,
+            'duplicates': self.evaluator.duplicates,
+            'simulated_steps': self.evaluator.simulated_steps,
+        }
+
+    def _record_metrics(self, gen_num, counters_before, best_fit, avg_fit, diversity,
+                        wall_time, evaluation_time, breeding_time, checkpoint_time, immigrants=0):
+        """Dopisz metryki generacji do pliku ga_metrics.jsonl"""
+        if self.metrics_path is None:
+            return
+
+        counters = self._evaluator_counters()
+        delta = {key: counters[key] - counters_before[key] for key in counters}
+        record = {
+            'generation': gen_num,
+            **delta,
+            'cache_size': len(self.evaluator.cache),
+            'evaluations_saved': delta['evaluations'] - delta['cache_misses'],
+            'immigrants': immigrants,
+            'wall_time_s': wall_time,
+            'evaluation_time_s': evaluation_time,
+            'breeding_time_s': breeding_time,
+            'checkpoint_time_s': checkpoint_time,
+            'simulations_per_s': delta['cache_misses'] / evaluation_time if evaluation_time else 0.0,
+            'diversity': diversity,
+            'best_fitness': float(best_fit),
+            'avg_fitness': float(avg_fit),
+        }
+        os.makedirs(os.path.dirname(self.metrics_path), exist_ok=True)
+        append_metrics(self.metrics_path, record)
+
     def _create_new_population(self, population, fitness_scores):
         """Stwórz nową populację używając operatorów genetycznych"""
         new_population = []
@@ -197,6 +500,14 @@ class ReactorGA:
         print(f"  • Prawdopodobieństwo krzyżowania: {self.config['crossover_rate']}")
         print(f"{'=' * 60}")
 
+    def _print_evaluation_stats(self, counters_before, immigrants):
+        """Wyświetl ile ewaluacji generacji zaoszczędziły deduplikacja i cache"""
+        counters = self._evaluator_counters()
+        delta = {key: counters[key] - counters_before[key] for key in counters}
+        print(f"  Ewaluacja: {delta['evaluations']} osobników, {delta['cache_misses']} symulacji "
+              f"(duplikaty: {delta['duplicates']}, cache: {delta['cache_hits']}"
+              + (f", imigranci: {immigrants}" if immigrants else "") + ")")
+
     def _print_generation_stats(self, gen_num, best_fit, avg_fit, min_fit, best_chrom, gen_time):
         """Wyświetl statystyki generacji"""
         fuel_count = best_chrom.get_fuel_count()
@@ -208,7 +519,8 @@ class ReactorGA:
         print(f"     • Najgorszy fitness: {min_fit:.2f}")
         print(f"     • Paliwo w najlepszym: {fuel_count}/{len(best_chrom.genes)} ({fuel_ratio * 100:.1f}%)")
         print(f"     • Czas generacji: {gen_time:.1f}s")
-        print(f"     • Cache hits: {len(self.evaluator.cache)}")
+        print(f"     • Cache: {self.evaluator.cache_hits} trafień, {self.evaluator.cache_misses} symulacji "
+              f"(rozmiar {len(self.evaluator.cache)})")
 
         # Dodaj ostrzeżenie jeśli za dużo paliwa
         if fuel_ratio > 0.8:
@@ -224,12 +536,6 @@ class ReactorGA:
         self.save_layout(chromosome, checkpoint_file)
         print(f"  💾 Zapisano checkpoint: {checkpoint_file}")
 
-    def _cleanup_temp_files(self):
-        """Usuń pliki tymczasowe"""
-        temp_dir = "output/ga_temp"
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
-
     def save_layout(self, chromosome, filename):
         """Zapisz layout do pliku JSON"""
         layout = chromosome.to_layout()
@@ -0,0 +1,215 @@
+# optimization_ga/pareto.py
+"""
+Narzędzia NSGA-II: sortowanie niezdominowane, odległość zatłoczenia i selekcja
+środowiskowa, zwektoryzowane w NumPy (macierz dominacji N x N zamiast pętli po
+parach), żeby pozostały szybkie dla populacji liczonych w tysiącach.
+
+Wszystkie cele są minimalizowane - cele maksymalizowane (energia) należy podać
+ze znakiem minus (patrz objective_matrix).
+"""
+import json
+import os
+
+import numpy as np
+
+# Cele trybu wielokryterialnego: (klucz wyników ewaluatora, kierunek). Paliwo liczy się
+# jako odległość od optimal_fuel_ratio - sam minimalizowany udział paliwa robiłby z pustego
+# rdzenia (zero energii, najniższa temperatura) osobnika Pareto-optymalnego w każdym przebiegu.
+OBJECTIVES = (
+    ('total_energy', 'max'),
+    ('max_temp', 'min'),
+    ('fuel_ratio_deviation', 'min'),
+)
+
+# Dopuszczalny udział paliwa (te same progi co kara za paliwo w FitnessEvaluator)
+FUEL_RATIO_BOUNDS = (0.4, 0.8)
+
+PARETO_DIRNAME = 'pareto_front'
+PARETO_FILENAME = 'pareto_front.json'
+
+
+def objective_value(metrics, key, optimal_fuel_ratio=0.7):
+    """Wartość celu `key` osobnika; fuel_ratio_deviation = |fuel_ratio - optimal_fuel_ratio|"""
+    if key == 'fuel_ratio_deviation':
+        return abs(float(metrics['fuel_ratio']) - optimal_fuel_ratio)
+    return float(metrics[key])
+
+
+def objective_matrix(metrics_list, objectives=OBJECTIVES, optimal_fuel_ratio=0.7):
+    """
+    Macierz celów (N x M) do minimalizacji z listy wyników FitnessEvaluator.evaluate_metrics.
+
+    Args:
+        metrics_list (list[dict]): Wyniki ewaluacji osobników.
+        objectives (tuple): Pary (klucz, 'min' | 'max').
+        optimal_fuel_ratio (float): Docelowy udział paliwa (cel fuel_ratio_deviation).
+
+    Returns:
+        np.ndarray: Cele maksymalizowane z odwróconym znakiem.
+    """
+    matrix = np.array([[objective_value(m, key, optimal_fuel_ratio) for key, _ in objectives]
+                       for m in metrics_list], dtype=float)
+    signs = np.array([-1.0 if direction == 'max' else 1.0 for _, direction in objectives])
+    return matrix.reshape(len(metrics_list), len(objectives)) * signs
+
+
+def constraint_violation(metrics_list, timesteps, critical_temp, fuel_ratio_bounds=FUEL_RATIO_BOUNDS):
+    """
+    Naruszenie ograniczeń osobnika (0 = dopuszczalny): przekroczenie temperatury
+    krytycznej, brakujące kroki przerwanej symulacji oraz wyjście udziału paliwa
+    poza fuel_ratio_bounds.
+    """
+    low, high = fuel_ratio_bounds
+    return np.array([
+        max(0.0, m['max_temp'] - critical_temp) + max(0, timesteps - m['steps_completed'])
+        + max(0.0, low - m['fuel_ratio'], m['fuel_ratio'] - high)
+        for m in metrics_list
+    ], dtype=float)
+
+
+def domination_matrix(objectives, violation=None):
+    """
+    dominates[i, j] = True gdy osobnik i dominuje osobnika j.
+
+    Z podanym `violation` stosowana jest dominacja z ograniczeniami (Deb): osobnik
+    dopuszczalny dominuje niedopuszczalny, a z dwóch niedopuszczalnych wygrywa
+    mniejsze naruszenie.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    n = len(objectives)
+    no_worse = np.ones((n, n), dtype=bool)
+    better = np.zeros((n, n), dtype=bool)
+    # Pętla po celach (M jest małe), każdy krok to porównanie N x N
+    for column in objectives.T:
+        no_worse &= column[:, None] <= column[None, :]
+        better |= column[:, None] < column[None, :]
+    dominates = no_worse & better
+
+    if violation is not None:
+        violation = np.asarray(violation, dtype=float)
+        feasible = violation <= 0
+        both_feasible = feasible[:, None] & feasible[None, :]
+        dominates = np.where(both_feasible, dominates, violation[:, None] < violation[None, :])
+    return dominates
+
+
+def non_dominated_sort(objectives, violation=None):
+    """
+    Szybkie sortowanie niezdominowane przez zdejmowanie kolejnych frontów.
+
+    Args:
+        objectives (array): Cele N x M (minimalizowane).
+        violation (array): Opcjonalne naruszenia ograniczeń (N,).
+
+    Returns:
+        np.ndarray: Numer frontu każdego osobnika (0 = front Pareto).
+    """
+    dominates = domination_matrix(objectives, violation)
+    n = len(dominates)
+    dominated_by = dominates.sum(axis=0)  # ilu osobników dominuje każdego
+    rank = np.full(n, -1, dtype=np.int64)
+
+    front = np.flatnonzero(dominated_by == 0)
+    level = 0
+    while front.size:
+        rank[front] = level
+        dominated_by[front] = -1
+        dominated_by -= dominates[front].sum(axis=0)
+        front = np.flatnonzero(dominated_by == 0)
+        level += 1
+    return rank
+
+
+def crowding_distance(objectives, rank=None):
+    """
+    Odległość zatłoczenia liczona osobno w każdym froncie; skrajne punkty dostają inf.
+
+    Args:
+        objectives (array): Cele N x M.
+        rank (array): Numery frontów z non_dominated_sort; None = jeden front.
+
+    Returns:
+        np.ndarray: Odległość zatłoczenia (N,).
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    n, m = objectives.shape
+    rank = np.zeros(n, dtype=np.int64) if rank is None else np.asarray(rank)
+    distance = np.zeros(n)
+
+    for level in np.unique(rank):
+        members = np.flatnonzero(rank == level)
+        if members.size <= 2:
+            distance[members] = np.inf
+            continue
+        values = objectives[members]
+        order = np.argsort(values, axis=0, kind='stable')
+        ordered = np.take_along_axis(values, order, axis=0)
+        span = ordered[-1] - ordered[0]
+        span[span == 0] = 1.0
+
+        gaps = np.empty_like(ordered)
+        gaps[1:-1] = (ordered[2:] - ordered[:-2]) / span
+        gaps[0] = gaps[-1] = np.inf
+        per_objective = np.empty_like(gaps)
+        np.put_along_axis(per_objective, order, gaps, axis=0)
+        distance[members] = per_objective.sum(axis=1)
+    return distance
+
+
+def select_survivors(rank, crowding, count):
+    """
+    Selekcja środowiskowa NSGA-II: indeksy `count` najlepszych osobników
+    (niższy front, a w obrębie frontu większa odległość zatłoczenia).
+    """
+    order = np.lexsort((-np.asarray(crowding), np.asarray(rank)))
+    return order[:count]
+
+
+def crowded_tournament(rank, crowding, size, rng):
+    """
+    Turniej z porównaniem zatłoczenia: zwycięża niższy front, przy remisie większa odległość.
+
+    Args:
+        rng: np.random albo np.random.Generator (potrzebne choice).
+
+    Returns:
+        int: Indeks zwycięzcy.
+    """
+    contestants = rng.choice(len(rank), size=min(size, len(rank)), replace=False)
+    best = np.lexsort((-crowding[contestants], rank[contestants]))[0]
+    return int(contestants[best])
+
+
+def save_pareto_front(ga, chromosomes, metrics_list, output_dir):
+    """
+    Zapisz front Pareto jako zestaw layoutów (pareto_front/layout_XXX.json, od największej
+    energii) oraz zestawienie celów w pareto_front.json.
+
+    Returns:
+        str: Ścieżka do pareto_front.json.
+    """
+    front_dir = os.path.join(output_dir, PARETO_DIRNAME)
+    os.makedirs(front_dir, exist_ok=True)
+
+    order = sorted(range(len(chromosomes)), key=lambda i: -metrics_list[i]['total_energy'])
+    entries = []
+    for number, i in enumerate(order):
+        filename = f'layout_{number:03d}.json'
+        ga.save_layout(chromosomes[i], os.path.join(front_dir, filename))
+        metrics = metrics_list[i]
+        entries.append({
+            'layout': os.path.join(PARETO_DIRNAME, filename),
+            'total_energy': float(metrics['total_energy']),
+            'max_temp': float(metrics['max_temp']),
+            'avg_temp': float(metrics['avg_temp']),
+            'fuel_ratio': float(metrics['fuel_ratio']),
+            'fuel_ratio_deviation': objective_value(metrics, 'fuel_ratio_deviation', ga.config['optimal_fuel_ratio']),
+            'fuel_count': chromosomes[i].get_fuel_count(),
+            'fitness': float(metrics['fitness']),
+        })
+
+    summary_path = os.path.join(output_dir, PARETO_FILENAME)
+    with open(summary_path, 'w') as f:
+        json.dump({'objectives': [{'name': key, 'goal': goal} for key, goal in OBJECTIVES],
+                   'layouts': entries}, f, indent=2)
+    return summary_path
@@ -1,15 +1,18 @@
 # optimization_ga/run_ga.py
 import os
 import json
-import matplotlib.pyplot as plt
 from datetime import datetime
 from .ga_optimizer import ReactorGA
+from .pareto import save_pareto_front
+from .telemetry import format_report, load_metrics, summarize_metrics
 from core_sim.core_grid import CoreGrid
 from core_sim.simulator import Simulator
 
 
 def plot_evolution(best_history, avg_history, output_dir):
     """Stwórz wykres ewolucji algorytmu"""
+    import matplotlib.pyplot as plt  # leniwie: workery i krótkie komendy nie potrzebują matplotlib
+
     plt.figure(figsize=(12, 6))
 
     generations = range(1, len(best_history) + 1)
@@ -30,6 +33,27 @@ def plot_evolution(best_history, avg_history, output_dir):
     return plot_path
 
 
+def plot_pareto_front(front_metrics, output_dir):
+    """Wykres frontu Pareto: energia względem temperatury maksymalnej, kolor = stosunek paliwa"""
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+    points = plt.scatter([m['max_temp'] for m in front_metrics], [m['total_energy'] for m in front_metrics],
+                         c=[m['fuel_ratio'] * 100 for m in front_metrics], cmap='viridis', edgecolors='k')
+    plt.colorbar(points, label='Paliwo [%]')
+
+    plt.xlabel('Temperatura maksymalna')
+    plt.ylabel('Energia całkowita')
+    plt.title('Front Pareto - Optymalizacja Reaktora (NSGA-II)')
+    plt.grid(True, alpha=0.3)
+
+    plot_path = os.path.join(output_dir, 'pareto_front.png')
+    plt.savefig(plot_path, dpi=300, bbox_inches='tight')
+    plt.close()
+
+    return plot_path
+
+
 def save_optimization_report(ga, best_chromosome, best_fitness, history, output_dir):
     """Zapisz raport z optymalizacji"""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -44,7 +68,9 @@ def save_optimization_report(ga, best_chromosome, best_fitness, history, output_
         "generations_run": len(history[0]),
         "final_best_fitness": history[0][-1],
         "final_avg_fitness": history[1][-1],
-        "improvement": history[0][-1] - history[0][0]
+        "improvement": history[0][-1] - history[0][0],
+        "stop_reason": ga.stop_reason,
+        "diversity_interventions": ga.diversity_events
     }
 
     report_path = os.path.join(output_dir, 'optimization_report.json')
@@ -118,7 +144,7 @@ def run_optimization(base_layout_path=None, config=None, run_final_sim=True):
     print(f"📁 Katalog wyjściowy GA: {ga_output_dir}")
 
     # Inicjalizuj i uruchom GA
-    ga = ReactorGA(base_layout_path, config=default_config)
+    ga = ReactorGA(base_layout_path, config=default_config, output_dir=ga_output_dir)
 
     # Optymalizacja
     best_chromosome, best_fitness, best_history, avg_history = ga.run()
@@ -136,6 +162,10 @@ def run_optimization(base_layout_path=None, config=None, run_final_sim=True):
                                            (best_history, avg_history), ga_output_dir)
     print(f"📄 Zapisano raport: {report_path}")
 
+    if ga.metrics_path and os.path.exists(ga.metrics_path):
+        print(f"📈 Telemetria generacji: {ga.metrics_path}")
+        print(format_report(summarize_metrics(load_metrics(ga.metrics_path))))
+
     print(f"\n✨ Optymalizacja GA zakończona!")
     print(f"🏆 Najlepszy fitness: {best_fitness:.2f}")
     print(f"⚡ Liczba elementów paliwa: {best_chromosome.get_fuel_count()}")
@@ -161,6 +191,59 @@ def run_optimization(base_layout_path=None, config=None, run_final_sim=True):
     }
 
 
+def run_pareto_optimization(base_layout_path=None, config=None):
+    """
+    Uruchom optymalizację wielokryterialną (NSGA-II). Zamiast jednego najlepszego
+    layoutu zapisuje cały front Pareto, z którego można wybrać kompromis energia /
+    temperatura / paliwo bez ponownego uruchamiania GA.
+    """
+    if base_layout_path is None:
+        base_layout_path = 'layouts/ga_base_layouts/base_layout.json'
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    ga_output_dir = f"layouts/ga_optimized/pareto_{timestamp}"
+    os.makedirs(ga_output_dir, exist_ok=True)
+
+    print("🚀 Uruchamiam NSGA-II...")
+    print(f"📁 Bazowy layout: {base_layout_path}")
+    print(f"📁 Katalog wyjściowy GA: {ga_output_dir}")
+
+    ga = ReactorGA(base_layout_path, config=config, output_dir=ga_output_dir)
+    front, front_metrics, history = ga.run_pareto()
+
+    front_path = save_pareto_front(ga, front, front_metrics, ga_output_dir)
+    print(f"\n✅ Zapisano front Pareto ({len(front)} layoutów): {front_path}")
+
+    plot_path = plot_pareto_front(front_metrics, ga_output_dir)
+    print(f"📊 Zapisano wykres frontu: {plot_path}")
+
+    report = {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "mode": "pareto",
+        "configuration": ga.config,
+        "movable_positions": len(ga.movable_positions),
+        "generations_run": len(history),
+        "front_size": len(front),
+        "history": history,
+    }
+    report_path = os.path.join(ga_output_dir, 'optimization_report.json')
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"📄 Zapisano raport: {report_path}")
+
+    if ga.metrics_path and os.path.exists(ga.metrics_path):
+        print(f"📈 Telemetria generacji: {ga.metrics_path}")
+        print(format_report(summarize_metrics(load_metrics(ga.metrics_path))))
+
+    return {
+        'front': front,
+        'front_metrics': front_metrics,
+        'history': history,
+        'ga_output_dir': ga_output_dir,
+        'simulation_output': None
+    }
+
+
 if __name__ == "__main__":
     # Przykładowe uruchomienie
     results = run_optimization()
\ No newline at end of file
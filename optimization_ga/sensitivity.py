@@ -0,0 +1,136 @@
+# optimization_ga/sensitivity.py
+"""
+Mapa ważności pozycji: o ile zmienia się fitness po odwróceniu pojedynczego genu
+(Fuel <-> Blank) chromosomu referencyjnego. Wszystkie warianty trafiają jedną partią
+do ewaluatora GA (jego backend, cache i klucze symetrii), a dla dużych rdzeni geny
+można odwracać blokami block x block pozycji.
+"""
+import json
+import os
+import time
+
+import numpy as np
+
+from .chromosome import ReactorChromosome
+
+IMPORTANCE_FILENAME = 'importance_map.json'
+
+
+def flip_groups(movable_positions, block=1):
+    """
+    Grupy indeksów genów odwracanych razem.
+
+    Args:
+        movable_positions (list): Pozycje (x, y) genów.
+        block (int): Rozmiar kafelka; 1 = każda pozycja osobno.
+
+    Returns:
+        list[list[int]]: Indeksy genów w każdej grupie (kolejność kafelków wierszami).
+    """
+    groups = {}
+    for i, (x, y) in enumerate(movable_positions):
+        groups.setdefault((y // block, x // block), []).append(i)
+    return [groups[key] for key in sorted(groups)]
+
+
+def flipped(genes, group):
+    """Kopia genów z odwróconymi pozycjami z grupy"""
+    genes = list(genes)
+    for i in group:
+        genes[i] = 1 - genes[i]
+    return genes
+
+
+def _evaluate_all(ga, gene_sets):
+    """Fitness dla listy wektorów genów: jedna partia evaluate_population ewaluatora GA"""
+    chromosomes = []
+    for genes in gene_sets:
+        chromosome = ReactorChromosome(ga.base_layout, ga.movable_positions)
+        chromosome.genes = genes
+        chromosomes.append(chromosome)
+    return ga.evaluator.evaluate_population(chromosomes)
+
+
+def importance_sweep(ga, genes=None, block=1):
+    """
+    Odwraca każdą pozycję (lub blok pozycji) chromosomu referencyjnego i mierzy zmianę fitness.
+
+    Args:
+        ga (ReactorGA): Źródło bazowego layoutu, pozycji ruchomych i ewaluatora (backend
+            'serial', 'pool', 'ensemble' lub 'service' z konfiguracji GA).
+        genes (list): Chromosom referencyjny; domyślnie bazowy layout (ga.base_genes()).
+        block (int): Rozmiar bloku odwracanego naraz (1 = pojedyncze geny).
+
+    Returns:
+        dict: Mapa H x W (None poza pozycjami ruchomymi) z różnicą fitness wariantu
+        i referencji, geny referencji na siatce oraz fitness referencji.
+    """
+    genes = list(genes) if genes is not None else ga.base_genes()
+    groups = flip_groups(ga.movable_positions, block)
+
+    start = time.perf_counter()
+    scores = _evaluate_all(ga, [genes] + [flipped(genes, group) for group in groups])
+    wall_time = time.perf_counter() - start
+
+    reference_fitness = float(scores[0])
+    height, width = ga.base_layout['height'], ga.base_layout['width']
+    importance = np.full((height, width), np.nan)
+    reference = np.full((height, width), -1, dtype=int)
+
+    for i, (x, y) in enumerate(ga.movable_positions):
+        reference[y, x] = genes[i]
+    for group, score in zip(groups, scores[1:]):
+        for i in group:
+            x, y = ga.movable_positions[i]
+            importance[y, x] = float(score) - reference_fitness
+
+    return {
+        'width': width,
+        'height': height,
+        'block': block,
+        'reference_fitness': reference_fitness,
+        'evaluations': len(scores),
+        'wall_time_s': wall_time,
+        'importance': [[None if np.isnan(v) else float(v) for v in row] for row in importance],
+        'reference': reference.tolist(),  # 1 = Fuel, 0 = Blank, -1 = pozycja stała
+        'types': [[cell['fa_type'] for cell in row] for row in ga.base_layout['grid']],
+    }
+
+
+def save_importance_map(result, path):
+    """Zapisz mapę ważności jako JSON (czytany przez visualization.importance_map)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(result, f, indent=2)
+    return path
+
+
+if __name__ == "__main__":
+    import argparse
+    import contextlib
+    import io
+    from .ga_optimizer import ReactorGA
+
+    parser = argparse.ArgumentParser(description="Mapa ważności pozycji (odwracanie pojedynczych genów)")
+    parser.add_argument("layout", help="Bazowy layout (JSON lub .rfl)")
+    parser.add_argument("--block", type=int, default=1, help="Odwracaj bloki block x block pozycji")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Liczba procesów (backend 'pool')")
+    parser.add_argument("--backend", choices=("serial", "pool", "ensemble", "service"),
+                        help="Backend ewaluacji; domyślnie 'pool' dla --workers > 1, inaczej 'serial'")
+    parser.add_argument("--timesteps", type=int, default=50, help="Kroki symulacji na ewaluację")
+    parser.add_argument("--out", default=os.path.join("output", IMPORTANCE_FILENAME))
+    args = parser.parse_args()
+
+    backend = args.backend or ('pool' if args.workers and args.workers > 1 else 'serial')
+    with contextlib.redirect_stdout(io.StringIO()):
+        ga = ReactorGA(args.layout, config={'timesteps': args.timesteps, 'backend': backend,
+                                            'workers': args.workers})
+    try:
+        result = importance_sweep(ga, block=args.block)
+    finally:
+        ga.evaluator.close()
+    save_importance_map(result, args.out)
+
+    print(f"Ewaluacje: {result['evaluations']} w {result['wall_time_s']:.1f}s, "
+          f"fitness referencji: {result['reference_fitness']:.2f}")
+    print(f"Mapa ważności zapisana do: {args.out}")
@@ -0,0 +1,78 @@
+# optimization_ga/symmetry.py
+"""
+Grupa symetrii bazowego layoutu (odbicia i obroty siatki, które nie zmieniają
+komórek stałych i przeprowadzają pozycje ruchome na ruchome) oraz postać
+kanoniczna wektora genów - najmniejszy leksykograficznie z jego obrazów.
+Lustrzane układy mają wtedy jeden klucz w cache ewaluatora.
+"""
+import numpy as np
+
+# Przekształcenia siatki (x, y) -> (x', y'); cztery ostatnie tylko dla siatek kwadratowych
+TRANSFORMS = {
+    'identity': lambda x, y, w, h: (x, y),
+    'flip_horizontal': lambda x, y, w, h: (w - 1 - x, y),
+    'flip_vertical': lambda x, y, w, h: (x, h - 1 - y),
+    'rotate_180': lambda x, y, w, h: (w - 1 - x, h - 1 - y),
+    'transpose': lambda x, y, w, h: (y, x),
+    'anti_transpose': lambda x, y, w, h: (h - 1 - y, w - 1 - x),
+    'rotate_90': lambda x, y, w, h: (h - 1 - y, x),
+    'rotate_270': lambda x, y, w, h: (y, w - 1 - x),
+}
+SQUARE_ONLY = ('transpose', 'anti_transpose', 'rotate_90', 'rotate_270')
+
+
+def _preserves_layout(grid, gene_index, transform, width, height):
+    """Czy przekształcenie zachowuje komórki stałe i zbiór pozycji ruchomych"""
+    for y in range(height):
+        for x in range(width):
+            tx, ty = transform(x, y, width, height)
+            if ((x, y) in gene_index) != ((tx, ty) in gene_index):
+                return False
+            if (x, y) not in gene_index and grid[y][x] != grid[ty][tx]:
+                return False
+    return True
+
+
+def symmetry_permutations(base_layout, movable_positions):
+    """
+    Symetrie bazowego layoutu jako permutacje indeksów genów.
+
+    Args:
+        base_layout (dict): Layout JSON.
+        movable_positions (list): Pozycje (x, y) genów.
+
+    Returns:
+        tuple: (nazwy przekształceń, np.ndarray G x L), gdzie wiersz g to indeksy genów
+            trafiających na kolejne pozycje po przekształceniu g; pierwszy wiersz to identyczność.
+    """
+    width, height = base_layout['width'], base_layout['height']
+    grid = base_layout['grid']
+    gene_index = {position: i for i, position in enumerate(movable_positions)}
+
+    names, permutations = [], []
+    for name, transform in TRANSFORMS.items():
+        if name in SQUARE_ONLY and width != height:
+            continue
+        if _preserves_layout(grid, gene_index, transform, width, height):
+            names.append(name)
+            permutations.append([gene_index[transform(x, y, width, height)] for x, y in movable_positions])
+    return names, np.array(permutations, dtype=np.int64).reshape(len(names), len(movable_positions))
+
+
+def canonical_genes(genes, permutations):
+    """
+    Postać kanoniczna genów: najmniejszy leksykograficznie obraz w grupie symetrii.
+
+    Args:
+        genes (list): Wektor genów.
+        permutations (np.ndarray): Wynik symmetry_permutations (None = brak symetrii).
+
+    Returns:
+        tuple: Klucz cache.
+    """
+    if permutations is None or len(permutations) < 2:
+        return tuple(genes)
+    images = np.asarray(genes, dtype=np.int8)[permutations]
+    # lexsort sortuje po ostatnim kluczu jako głównym - kolumny w odwrotnej kolejności
+    first = np.lexsort(images.T[::-1])[0]
+    return tuple(images[first].tolist())
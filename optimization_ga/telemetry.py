@@ -0,0 +1,105 @@
+# optimization_ga/telemetry.py
+import json
+import numpy as np
+
+METRICS_FILENAME = 'ga_metrics.jsonl'
+
+
+def population_diversity(population):
+    """Średnia znormalizowana odległość Hamminga między parami osobników (0 = klony, 1 = maksimum)"""
+    if len(population) < 2:
+        return 0.0
+    genes = np.asarray([chromosome.genes for chromosome in population], dtype=np.int64)
+    n, length = genes.shape
+    if length == 0:
+        return 0.0
+
+    # Dla genów binarnych: liczba par różniących się na pozycji j = c_j * (n - c_j)
+    ones = genes.sum(axis=0)
+    differing_pairs = np.sum(ones * (n - ones))
+    return float(differing_pairs / (n * (n - 1) / 2) / length)
+
+
+def append_metrics(path, record):
+    """Dopisz jedną linię JSON z metrykami generacji"""
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+
+def load_metrics(path):
+    """Wczytaj wszystkie linie pliku metryk"""
+    with open(path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize_metrics(records):
+    """Zbierz metryki generacji w raport przepustowości"""
+    if not records:
+        return {}
+
+    def total(key):
+        return sum(r[key] for r in records)
+
+    wall = total('wall_time_s')
+    evaluation = total('evaluation_time_s')
+    breeding = total('breeding_time_s')
+    checkpoint = total('checkpoint_time_s')
+    simulations = total('cache_misses')
+    evaluations = total('evaluations')
+    # Starsze pliki metryk nie mają liczników deduplikacji
+    duplicates = sum(r.get('duplicates', 0) for r in records)
+
+    return {
+        'generations': len(records),
+        'evaluations': evaluations,
+        'simulations': simulations,
+        'cache_hits': total('cache_hits'),
+        'cache_hit_rate': total('cache_hits') / evaluations if evaluations else 0.0,
+        'duplicates': duplicates,
+        'evaluations_saved': evaluations - simulations,
+        'immigrants': sum(r.get('immigrants', 0) for r in records),
+        'simulated_steps': total('simulated_steps'),
+        'wall_time_s': wall,
+        'time_split': {
+            'evaluation': evaluation / wall if wall else 0.0,
+            'breeding': breeding / wall if wall else 0.0,
+            'checkpoint': checkpoint / wall if wall else 0.0,
+        },
+        'simulations_per_s': simulations / evaluation if evaluation else 0.0,
+        'steps_per_s': total('simulated_steps') / evaluation if evaluation else 0.0,
+        'final_diversity': records[-1]['diversity'],
+        'best_fitness': max(r['best_fitness'] for r in records),
+    }
+
+
+def format_report(summary):
+    """Sformatuj raport przepustowości jako tekst"""
+    split = summary['time_split']
+    return '\n'.join([
+        f"Generacje:            {summary['generations']}",
+        f"Ewaluacje:            {summary['evaluations']} "
+        f"(symulacje: {summary['simulations']}, cache: {summary['cache_hits']}, "
+        f"{summary['cache_hit_rate'] * 100:.1f}% trafień, duplikaty: {summary['duplicates']})",
+        f"Zaoszczędzone:        {summary['evaluations_saved']} ewaluacji "
+        f"(imigranci: {summary['immigrants']})",
+        f"Kroki symulacji:      {summary['simulated_steps']}",
+        f"Czas całkowity:       {summary['wall_time_s']:.1f}s "
+        f"(ewaluacja {split['evaluation'] * 100:.1f}%, operatory {split['breeding'] * 100:.1f}%, "
+        f"checkpointy {split['checkpoint'] * 100:.1f}%)",
+        f"Symulacje/s:          {summary['simulations_per_s']:.2f}",
+        f"Kroki/s:              {summary['steps_per_s']:.1f}",
+        f"Różnorodność końcowa: {summary['final_diversity']:.3f}",
+        f"Najlepszy fitness:    {summary['best_fitness']:.2f}",
+    ])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Raport przepustowości GA z pliku ga_metrics.jsonl")
+    parser.add_argument("metrics", help="Ścieżka do pliku ga_metrics.jsonl")
+    parser.add_argument("--json", action="store_true", help="Wypisz raport jako JSON")
+    args = parser.parse_args()
+
+    report = summarize_metrics(load_metrics(args.metrics))
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
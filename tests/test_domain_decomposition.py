@@ -0,0 +1,87 @@
+# tests/test_domain_decomposition.py
+"""
+The tiled multi-process engine against the single-process Simulator on a small
+generated grid: one worker must reproduce the serial run exactly, two workers
+may only drift within TWO_WORKER_TOLERANCE (tile seams see cross-tile
+neighbors one step late).
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from core_sim.core_grid import CoreGrid
+from core_sim.domain_decomposition import TiledSimulation
+from core_sim.simulator import Simulator
+from layout_utils.layout_generator import generate_random_layout
+
+SIZE = 16
+TIMESTEPS = 20
+
+# Largest relative deviation (max |tiled - serial| / max |serial|) allowed with two workers;
+# seeded 16x16 and 40x40 grids drift about 1e-3 in temperature / life and 3e-3 in energy output
+TWO_WORKER_TOLERANCE = 1e-2
+
+
+@pytest.fixture(scope="module")
+def layout():
+    random.seed(0)
+    return generate_random_layout(width=SIZE, height=SIZE)
+
+
+def _grid(layout):
+    grid = CoreGrid(width=layout["width"], height=layout["height"])
+    grid.initialize_from_layout(layout)
+    return grid
+
+
+def _state(sim):
+    cells = sim.grid.grid
+    return {
+        "temperature": np.array([[fa.temperature for fa in row] for row in cells]),
+        "life": np.array([[fa.life for fa in row] for row in cells]),
+        "energy_output": np.array([[fa.energy_output for fa in row] for row in cells]),
+    }
+
+
+@pytest.fixture(scope="module")
+def serial(layout):
+    sim = Simulator(_grid(layout), TIMESTEPS, record=False)
+    for _ in range(TIMESTEPS):
+        sim.step()
+    return sim
+
+
+def _tiled(layout, workers):
+    tiled = TiledSimulation(_grid(layout), TIMESTEPS, workers=workers)
+    tiled.run()
+    return tiled.sim
+
+
+def _relative_deviation(a, b):
+    return float(np.max(np.abs(a - b)) / max(np.max(np.abs(b)), 1e-12))
+
+
+def test_one_worker_is_bit_identical(layout, serial):
+    tiled = _tiled(layout, workers=1)
+
+    expected, state = _state(serial), _state(tiled)
+    for field in expected:
+        assert np.array_equal(state[field], expected[field]), field
+    assert len(tiled.meta_history) == len(serial.meta_history) == TIMESTEPS
+    for got, want in zip(tiled.meta_history, serial.meta_history):
+        assert got["total_energy"] == want["total_energy"]
+        assert got["penalties"] == want["penalties"]
+        assert got["fitness"] == want["fitness"]
+
+
+def test_two_workers_stay_within_tolerance(layout, serial):
+    tiled = _tiled(layout, workers=2)
+
+    expected, state = _state(serial), _state(tiled)
+    for field in expected:
+        assert _relative_deviation(state[field], expected[field]) <= TWO_WORKER_TOLERANCE, field
+    energy = [m["total_energy"] for m in tiled.meta_history]
+    reference = [m["total_energy"] for m in serial.meta_history]
+    assert _relative_deviation(np.array(energy), np.array(reference)) <= TWO_WORKER_TOLERANCE
@@ -0,0 +1,51 @@
+# tests/test_ensemble.py
+"""
+The "ensemble" evaluation backend against serial simulate_metrics runs: the
+records must be identical, including runs stopped at a critical temperature,
+batches of mixed sizes and layouts left to the per-assembly engine.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from core_sim.evaluation import evaluate_many, resolve_config
+from layout_utils.layout_generator import generate_random_layout
+
+TIMESTEPS = 40
+
+
+def _layouts():
+    random.seed(3)
+    np.random.seed(3)
+    layouts = [generate_random_layout(width=8, height=8) for _ in range(6)]
+    layouts += [generate_random_layout(width=6, height=9) for _ in range(2)]
+    blank = {"fa_type": "Blank"}
+    # Fuel without flux: the serial run fails on its first step
+    layouts.append({"width": 3, "height": 3,
+                    "grid": [[blank] * 3, [blank, {"fa_type": "Fuel", "enrichment": 0.0}, blank], [blank] * 3]})
+    return layouts
+
+
+def _without_wall_time(records):
+    return [{key: value for key, value in record.items() if key != "wall_time_s"} for record in records]
+
+
+@pytest.mark.parametrize("config", [
+    {"timesteps": TIMESTEPS},
+    {"timesteps": TIMESTEPS, "stop_on_critical": False},
+    {"timesteps": TIMESTEPS, "temp_limit": 800.0, "critical_temp": 850.0},  # most runs stop early
+    {"timesteps": TIMESTEPS, "params": {"cooling_coeff": 30.0, "diffusion_coeff": 0.3}},
+])
+def test_ensemble_matches_serial(config):
+    layouts = _layouts()
+    serial = evaluate_many(layouts, config)
+    ensemble = evaluate_many(layouts, dict(config, backend="ensemble"))
+
+    assert _without_wall_time(ensemble) == _without_wall_time(serial)
+
+
+def test_ensemble_does_not_record():
+    with pytest.raises(ValueError, match="ensemble"):
+        resolve_config({"backend": "ensemble", "output_dir": "output/batch"})
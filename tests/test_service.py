@@ -0,0 +1,158 @@
+# tests/test_service.py
+"""
+End-to-end tests of the local simulation service. Every server binds to
+127.0.0.1 on an ephemeral port and keeps its results in a temporary directory.
+"""
+
+import asyncio
+import socket
+import threading
+import urllib.error
+from urllib.parse import urlsplit
+
+import pytest
+
+from core_sim.evaluation import evaluate_many
+from core_sim.service import ServiceClient, SimulationService
+
+TIMESTEPS = 20
+
+
+def small_layout(size=6):
+    """A size x size layout: fuel with a moderator cross and a control rod in the middle."""
+    grid = []
+    for y in range(size):
+        row = []
+        for x in range(size):
+            if (x, y) == (size // 2, size // 2):
+                row.append({"fa_type": "ControlRod"})
+            elif x == size // 2 or y == size // 2:
+                row.append({"fa_type": "Moderator"})
+            else:
+                row.append({"fa_type": "Fuel", "enrichment": 3.2})
+        grid.append(row)
+    return {"width": size, "height": size, "grid": grid}
+
+
+class RunningService:
+    """A SimulationService serving on 127.0.0.1:<ephemeral port> from a background event loop."""
+
+    def __init__(self, result_dir):
+        self.service = SimulationService(workers=1, result_dir=str(result_dir), progress_every=2)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.server = self._call(self.service.start("127.0.0.1", 0))
+        host, port = self.server.sockets[0].getsockname()[:2]
+        self.client = ServiceClient(f"http://{host}:{port}", timeout=60)
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout=60)
+
+    async def _shutdown(self):
+        self.server.close()
+        await self.service.close()
+
+    def stop(self):
+        self._call(self._shutdown())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=10)
+        self.loop.close()
+
+
+@pytest.fixture
+def running(tmp_path):
+    service = RunningService(tmp_path / "service")
+    yield service
+    service.stop()
+
+
+def test_job_completes_with_metrics(running):
+    job = running.client.submit(layout=small_layout(), timesteps=TIMESTEPS)
+    result = running.client.wait(job["job_id"], timeout=60)
+
+    assert {"fitness", "total_energy", "mean_fuel_temperature", "penalty_total", "wall_time_s"} <= set(result)
+    assert result["total_energy"] > 0
+    assert running.client.job(job["job_id"])["status"] == "done"
+
+
+def test_resubmission_returns_same_job(running):
+    first = running.client.submit(layout=small_layout(), timesteps=TIMESTEPS)
+    second = running.client.submit(layout=small_layout(), timesteps=TIMESTEPS)
+
+    assert second["job_id"] == first["job_id"]
+    assert second["deduplicated"] and not first["deduplicated"]
+    assert len(running.client.health()["jobs"]) == 1
+
+
+def test_progress_events_arrive_in_order(running):
+    job = running.client.submit(layout=small_layout(), timesteps=TIMESTEPS)
+    events = list(running.client.events(job["job_id"], timeout=60))
+
+    steps = [event["step"] for event in events]
+    assert steps == sorted(steps)
+    assert events[-1]["status"] == "done"
+    assert events[-1]["step"] == TIMESTEPS
+    assert all(event["status"] in ("queued", "running") for event in events[:-1])
+
+
+@pytest.mark.parametrize("request_body", [
+    {"timesteps": TIMESTEPS},                                      # no layout
+    {"layout": {"width": 2, "height": 2, "grid": [[{"fa_type": "Fuel"}]]}},  # grid does not match size
+    {"layout": small_layout(), "timesteps": -1},
+    {"layout": small_layout(), "mode": "unknown"},
+    {"layout": small_layout(), "params": {"t_opt": "abc"}},
+    {"layout": small_layout(), "params": [1]},
+    {"layout": small_layout(), "mode": "metrics", "evaluation": {"temp_limit": "x"}},
+    {"layout": small_layout(), "mode": "metrics", "evaluation": [1]},
+    {"layout": small_layout(), "mode": "ga_fitness", "evaluator": {"optimal_fuel_ratio": None}},
+])
+def test_malformed_spec_is_rejected(running, request_body):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        running.client._request("POST", "/jobs", request_body)
+    assert error.value.code == 400
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-5"])
+def test_bad_content_length_is_rejected(running, content_length):
+    host, port = urlsplit(running.client.url).netloc.split(":")
+    with socket.create_connection((host, int(port)), timeout=10) as sock:
+        sock.sendall(f"POST /jobs HTTP/1.1\r\nHost: {host}\r\nContent-Length: {content_length}\r\n\r\n".encode())
+        status_line = sock.makefile("rb").readline().decode("latin-1")
+    assert status_line.split()[1] == "400"
+
+
+def test_result_is_reused_after_restart(tmp_path):
+    service = RunningService(tmp_path / "service")
+    try:
+        job = service.client.submit(layout=small_layout(), timesteps=TIMESTEPS)
+        result = service.client.wait(job["job_id"], timeout=60)
+    finally:
+        service.stop()
+
+    restarted = RunningService(tmp_path / "service")
+    try:
+        again = restarted.client.submit(layout=small_layout(), timesteps=TIMESTEPS)
+        assert again["job_id"] == job["job_id"]
+        assert again["deduplicated"]
+        assert again["status"] == "done"
+        assert again["result"] == result
+    finally:
+        restarted.stop()
+
+
+def test_metrics_backend_matches_serial(running):
+    layouts = [small_layout(), small_layout(5)]
+    url = running.client.url
+    served = evaluate_many(layouts, {"timesteps": TIMESTEPS, "backend": "service", "service_url": url})
+    serial = evaluate_many(layouts, {"timesteps": TIMESTEPS})
+
+    drop = ("wall_time_s",)
+    assert [{k: v for k, v in r.items() if k not in drop} for r in served] == \
+        [{k: v for k, v in r.items() if k not in drop} for r in serial]
+
+
+def test_refuses_non_loopback_host(tmp_path):
+    service = SimulationService(workers=1, result_dir=str(tmp_path))
+    with pytest.raises(ValueError, match="non-loopback"):
+        asyncio.run(service.start("0.0.0.0", 0))
@@ -0,0 +1,88 @@
+# visualization/cell_stats_map.py
+"""
+Maps of the per-cell statistics written by a stats-mode recording
+(Simulator(..., recording="stats"), main.py --recording stats, batch runs).
+
+    python -m visualization.cell_stats_map output/batch/layout_001_log.json --out output/layout_001_stats.png
+"""
+
+import numpy as np
+
+from core_sim.cell_stats import load_cell_stats
+
+# (statistic, title, colormap)
+PANELS = (
+    ("temperature_max", "Peak temperature [K]", "hot"),
+    ("temperature_mean", "Mean temperature [K]", "hot"),
+    ("temperature_std", "Temperature std [K]", "magma"),
+    ("steps_above_temp", "Steps above {temp_threshold:g} K", "Reds"),
+    ("final_life", "Final life", "cool"),
+    ("life_depleted_step", "Step life < {life_threshold:g}", "viridis_r"),
+    ("peak_energy_output", "Peak energy output", "viridis"),
+    ("temperature_min", "Minimum temperature [K]", "hot"),
+)
+
+
+def plot_cell_stats(recording, fuel_only=True):
+    """
+    Draws one panel per statistic. Non-fuel cells are greyed out when `fuel_only`,
+    and cells that never depleted are grey in the depletion panel.
+
+    Args:
+        recording (dict | str): load_cell_stats() result or the recording's path.
+
+    Returns:
+        matplotlib.figure.Figure
+    """
+    import matplotlib.pyplot as plt
+
+    if isinstance(recording, str):
+        recording = load_cell_stats(recording)
+    stats, types = recording["stats"], recording["types"]
+    hidden = types != "fuel" if fuel_only else np.zeros(types.shape, dtype=bool)
+
+    fig, axs = plt.subplots(2, 4, figsize=(18, 8))
+    for ax, (name, title, cmap_name) in zip(axs.flat, PANELS):
+        values = np.array(stats[name], dtype=float)
+        mask = hidden | ~np.isfinite(values)
+        if name == "life_depleted_step":
+            mask |= values < 0
+        cmap = plt.get_cmap(cmap_name).copy()
+        cmap.set_bad("lightgrey")
+        image = ax.imshow(np.ma.masked_array(values, mask), cmap=cmap, interpolation="nearest",
+                          vmin=0 if name == "steps_above_temp" else None)
+        plt.colorbar(image, ax=ax, fraction=0.046, pad=0.04)
+        ax.set_title(title.format(**stats))
+        ax.set_xticks([])
+        ax.set_yticks([])
+
+    meta = recording.get("meta") or {}
+    fitness = meta.get("fitness")
+    if isinstance(fitness, dict):
+        fitness = fitness.get("fitness")
+    fig.suptitle(f"Per-cell statistics over {stats['steps']} steps"
+                 + (f" (final fitness {fitness:.2f})" if fitness is not None else ""))
+    fig.tight_layout()
+    return fig
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Plot per-cell statistics of a stats-mode recording")
+    parser.add_argument("path", help="Recording JSON written with recording='stats'")
+    parser.add_argument("--all-cells", action="store_true", help="Also color non-fuel cells")
+    parser.add_argument("--out", default=None, help="Save to this image file instead of showing a window")
+    args = parser.parse_args()
+
+    if args.out:
+        import matplotlib
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plot_cell_stats(args.path, fuel_only=not args.all_cells)
+    if args.out:
+        plt.savefig(args.out, dpi=150, bbox_inches="tight")
+        print(f"Saved per-cell statistics to {args.out}")
+    else:
+        plt.show()
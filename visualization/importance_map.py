@@ -0,0 +1,76 @@
+# visualization/importance_map.py
+"""
+Heat map of a position-importance sweep (optimization_ga.sensitivity): fitness
+change when each movable position (or block) of the reference layout is flipped.
+
+    python -m visualization.importance_map output/importance_map.json --out output/importance_map.png
+"""
+
+import json
+
+import numpy as np
+
+TYPE_LETTERS = {"ControlRod": "C", "control_rod": "C", "Moderator": "M", "moderator": "M"}
+
+
+def load_importance_map(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def plot_importance_map(result, ax=None):
+    """
+    Draws the importance map on `ax`: red = flipping the position lowers fitness
+    (it matters as it is), blue = flipping it would raise fitness. Fixed positions
+    are grey with their type letter; reference fuel positions carry a dot.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import TwoSlopeNorm
+
+    importance = np.array([[np.nan if v is None else v for v in row] for row in result["importance"]])
+    reference = np.array(result["reference"])
+    if ax is None:
+        _, ax = plt.subplots(figsize=(8, 7))
+
+    finite = importance[np.isfinite(importance)]
+    limit = max(float(np.max(np.abs(finite))), 1e-9) if finite.size else 1.0
+    cmap = plt.get_cmap("RdBu_r").copy()
+    cmap.set_bad("lightgrey")
+    image = ax.imshow(-importance, cmap=cmap, norm=TwoSlopeNorm(vmin=-limit, vcenter=0.0, vmax=limit))
+
+    for y, row in enumerate(result["types"]):
+        for x, fa_type in enumerate(row):
+            if fa_type in TYPE_LETTERS:
+                ax.text(x, y, TYPE_LETTERS[fa_type], ha="center", va="center", fontsize=8, color="black")
+            elif reference[y, x] == 1:
+                ax.plot(x, y, marker=".", color="black", markersize=3)
+
+    colorbar = plt.colorbar(image, ax=ax)
+    colorbar.set_label("fitness loss when flipped")
+    block = result.get("block", 1)
+    ax.set_title(f"Position importance (reference fitness {result['reference_fitness']:.1f}"
+                 f"{f', {block}x{block} blocks' if block > 1 else ''})")
+    ax.set_xticks([])
+    ax.set_yticks([])
+    return ax
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Plot a position-importance heat map")
+    parser.add_argument("path", help="importance_map.json written by optimization_ga.sensitivity")
+    parser.add_argument("--out", default=None, help="Save to this image file instead of showing a window")
+    args = parser.parse_args()
+
+    if args.out:
+        import matplotlib
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plot_importance_map(load_importance_map(args.path))
+    if args.out:
+        plt.savefig(args.out, dpi=150, bbox_inches="tight")
+        print(f"Saved importance map to {args.out}")
+    else:
+        plt.show()
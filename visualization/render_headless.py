@@ -0,0 +1,196 @@
+# visualization/render_headless.py
+"""
+Headless rendering of simulation animations (no display needed).
+
+Frames are split across a process pool. The input is opened once in the main
+process; a plain JSON log is copied into a temporary trajectory store, so workers
+memory-map frames instead of each parsing the JSON. Every worker builds the figure once with
+the Agg backend, rasterizes the static type letters into an RGBA layer a single
+time and then only updates the image data per frame, compositing the letter layer
+on top. Output is an MP4 (needs ffmpeg), a GIF (Pillow) or a PNG sequence.
+
+    python -m visualization.render_headless output/run_traj --out output/run.mp4 --workers 4
+"""
+
+import matplotlib
+matplotlib.use("Agg")
+
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import matplotlib.image as mpimg
+
+from core_sim.trajectory import TrajectoryStore, TrajectoryWriter
+from visualization.visualize_simulation import build_animation_figure, open_trajectory
+
+_worker = {}
+
+
+def _letter_layer(fig, text_artists):
+    """Rasterizes only the type letters into an RGBA array the size of the figure canvas."""
+    texts = set(text_artists)
+    hidden = []
+    for ax in fig.axes:
+        children = ax.get_children() if any(t.axes is ax for t in text_artists) else [ax]
+        for artist in children:
+            if artist not in texts and artist.get_visible():
+                artist.set_visible(False)
+                hidden.append(artist)
+    face_alpha = fig.patch.get_alpha()
+    fig.patch.set_alpha(0.0)
+
+    fig.canvas.draw()
+    layer = np.array(fig.canvas.buffer_rgba(), dtype=np.float32) / 255.0
+
+    fig.patch.set_alpha(face_alpha)
+    for artist in hidden:
+        artist.set_visible(True)
+    for txt in text_artists:
+        txt.remove()
+    return layer
+
+
+def _store_copy(trajectory, store_path):
+    """Writes an in-memory (JSON) trajectory into a trajectory store; returns its path."""
+    fields = ("temperature", "energy_output", "life", "flux")
+    total_energy = trajectory.aggregate("total_energy")
+    writer = TrajectoryWriter(store_path, trajectory.types.shape, trajectory.n_frames, trajectory.types.tolist())
+    for t in range(trajectory.n_frames):
+        writer.append(*(trajectory.frame(field, t) for field in fields), total_energy[t])
+    writer.close()
+    return store_path
+
+
+def _init_worker(store_path, dpi):
+    trajectory = TrajectoryStore(store_path)
+    fig, update, text_artists = build_animation_figure(trajectory)
+    fig.set_dpi(dpi)
+    _worker["fig"] = fig
+    _worker["update"] = update
+    _worker["letters"] = _letter_layer(fig, text_artists)
+
+
+def _render_frame():
+    fig = _worker["fig"]
+    fig.canvas.draw()
+    base = np.asarray(fig.canvas.buffer_rgba(), dtype=np.float32)[..., :3] / 255.0
+    letters = _worker["letters"]
+    alpha = letters[..., 3:4]
+    rgb = letters[..., :3] * alpha + base * (1.0 - alpha)
+    return (np.clip(rgb, 0.0, 1.0) * 255).astype(np.uint8)
+
+
+def _render_chunk(jobs):
+    """Renders (output_index, frame, frame_dir) jobs to PNG files; returns how many were written."""
+    for output_index, frame, frame_dir in jobs:
+        _worker["update"](frame)
+        mpimg.imsave(os.path.join(frame_dir, f"frame_{output_index:05d}.png"), _render_frame())
+    return len(jobs)
+
+
+def _write_gif(frame_paths, output_path, fps):
+    from PIL import Image
+
+    images = [Image.open(path).convert("RGB") for path in frame_paths]
+    images[0].save(output_path, save_all=True, append_images=images[1:],
+                   duration=int(1000 / fps), loop=0)
+
+
+def _write_mp4(frame_dir, output_path, fps):
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg not found on PATH; export a .gif or a PNG directory instead")
+    subprocess.run([
+        ffmpeg, "-y", "-loglevel", "error", "-framerate", str(fps),
+        "-i", os.path.join(frame_dir, "frame_%05d.png"),
+        "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", output_path,
+    ], check=True)
+
+
+def render_animation(filepath, output_path, workers=None, stride=1, fps=30, dpi=100, chunk_size=16):
+    """
+    Renders a simulation to video without a display.
+
+    Args:
+        filepath (str): Simulation JSON log or trajectory store directory.
+        output_path (str): .mp4 or .gif file, or a directory for a PNG sequence.
+        workers (int): Process pool size (defaults to the CPU count).
+        stride (int): Render only every `stride`-th frame.
+        fps (int): Frame rate of the written video.
+        dpi (int): Figure resolution.
+        chunk_size (int): Frames handed to a worker at a time.
+
+    Returns:
+        dict: Frame count, wall times and rendering throughput in frames per second.
+    """
+    trajectory = open_trajectory(filepath)
+    frames = list(trajectory.frame_indices(stride))
+    workers = workers or os.cpu_count() or 1
+
+    ext = os.path.splitext(output_path)[1].lower()
+    png_sequence = ext not in (".mp4", ".gif")
+    if png_sequence:
+        os.makedirs(output_path, exist_ok=True)
+        frame_dir = output_path
+    else:
+        frame_dir = tempfile.mkdtemp(prefix="render_frames_")
+
+    jobs = [(i, frame, frame_dir) for i, frame in enumerate(frames)]
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+
+    start = time.perf_counter()
+    store_dir = None
+    try:
+        if isinstance(trajectory, TrajectoryStore):
+            store_path = trajectory.path
+        else:
+            store_dir = tempfile.mkdtemp(prefix="render_store_")
+            store_path = _store_copy(trajectory, store_dir)
+        del trajectory  # the workers read frames from the store
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(store_path, dpi)) as pool:
+            rendered = sum(pool.map(_render_chunk, chunks))
+        render_time = time.perf_counter() - start
+
+        if ext == ".gif":
+            _write_gif([os.path.join(frame_dir, f"frame_{i:05d}.png") for i in range(len(frames))],
+                       output_path, fps)
+        elif ext == ".mp4":
+            _write_mp4(frame_dir, output_path, fps)
+    finally:
+        if not png_sequence:
+            shutil.rmtree(frame_dir, ignore_errors=True)
+        if store_dir is not None:
+            shutil.rmtree(store_dir, ignore_errors=True)
+    total_time = time.perf_counter() - start
+
+    return {
+        "frames": rendered,
+        "workers": workers,
+        "render_seconds": render_time,
+        "total_seconds": total_time,
+        "render_fps": rendered / render_time if render_time else float("inf"),
+        "output": output_path,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a simulation animation headlessly")
+    parser.add_argument("path", help="Simulation JSON log or trajectory store directory")
+    parser.add_argument("--out", required=True, help=".mp4, .gif, or a directory for PNG frames")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--every", type=int, default=1, help="Render every N-th frame")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--dpi", type=int, default=100)
+    args = parser.parse_args()
+
+    stats = render_animation(args.path, args.out, workers=args.workers, stride=args.every,
+                             fps=args.fps, dpi=args.dpi)
+    print(f"✅ Rendered {stats['frames']} frames with {stats['workers']} workers "
+          f"in {stats['render_seconds']:.1f}s ({stats['render_fps']:.1f} frames/s) -> {stats['output']}")
@@ -2,10 +2,15 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import json
+import os
+from core_sim.trajectory import TrajectoryStore, is_trajectory_store
 
-def load_simulation_json(filepath):
+def _read_json(filepath):
     with open(filepath, 'r') as f:
-        data = json.load(f)
+        return json.load(f)
+
+def load_simulation_json(filepath):
+    data = filepath if isinstance(filepath, dict) else _read_json(filepath)
 
     temperature = np.array(data["temperature"])
     energy_output = np.array(data["energy_output"])
@@ -16,9 +21,77 @@ def load_simulation_json(filepath):
 
     return temperature, energy_output, life, flux, total_energy, types
 
-def animate_full_grid_json(filepath):
-    temperature, energy_output, life, flux, total_energy, types = load_simulation_json(filepath)
-    timesteps, height, width = temperature.shape
+class JsonTrajectory:
+    """In-memory stand-in for TrajectoryStore over a legacy simulation JSON file (path or loaded dict)."""
+
+    def __init__(self, filepath):
+        temperature, energy_output, life, flux, total_energy, types = load_simulation_json(filepath)
+        self._frames = {"temperature": temperature, "energy_output": energy_output, "life": life, "flux": flux}
+        self.types = types
+        self.n_frames = temperature.shape[0]
+
+        fuel_mask = (types == "fuel")
+        num_fuel_cells = np.sum(fuel_mask)
+        if num_fuel_cells == 0:
+            raise ValueError("No 'fuel' elements found in the type grid.")
+        self._aggregates = {
+            "mean_fuel_temperature": np.sum(temperature * fuel_mask[None, :, :], axis=(1, 2)) / num_fuel_cells,
+            "mean_fuel_life": np.sum(life * fuel_mask[None, :, :], axis=(1, 2)) / num_fuel_cells,
+            "total_energy": np.array(total_energy),
+        }
+
+    def frame(self, field, index):
+        return self._frames[field][index]
+
+    def aggregate(self, name):
+        return self._aggregates[name]
+
+    def frame_indices(self, stride=1):
+        return range(0, self.n_frames, max(1, stride))
+
+
+def open_recording(filepath):
+    """
+    Opens simulation output, parsing a JSON log at most once. Returns a trajectory
+    (see open_trajectory), or load_cell_stats() output for a stats-mode recording.
+    """
+    if is_trajectory_store(filepath):
+        return TrajectoryStore(filepath)
+
+    data = _read_json(filepath)
+    if data.get("mode") == "stats":
+        from core_sim.cell_stats import load_cell_stats
+        return load_cell_stats(data)
+    store_path = data.get("trajectory")
+    if store_path and not os.path.isabs(store_path) and not is_trajectory_store(store_path):
+        store_path = os.path.join(os.path.dirname(filepath), store_path)
+    if store_path and is_trajectory_store(store_path):
+        return TrajectoryStore(store_path)
+    return JsonTrajectory(data)
+
+
+def open_trajectory(filepath):
+    """
+    Opens simulation output for animation. Trajectory stores (or JSON logs that point
+    at one) are memory-mapped and read frame by frame; plain JSON logs are loaded whole.
+    """
+    trajectory = open_recording(filepath)
+    if isinstance(trajectory, dict):
+        raise ValueError(f"{filepath} is a stats-mode recording and has no frames")
+    return trajectory
+
+
+def build_animation_figure(trajectory):
+    """
+    Builds the 3x2 animation figure for a trajectory.
+
+    Returns:
+        tuple: (fig, update, text_artists) where update(frame) redraws all frame-dependent
+        artists and text_artists are the static per-cell type letters.
+    """
+    types = trajectory.types
+    timesteps = trajectory.n_frames
+    height, width = types.shape
 
     type_to_letter = {
         "fuel": "F",
@@ -27,17 +100,14 @@ def animate_full_grid_json(filepath):
         "blank": "B"
     }
 
-    fuel_mask = (types == "fuel")
-    fuel_mask_expanded = fuel_mask[None, :, :]
-
-    num_fuel_cells = np.sum(fuel_mask)
-    if num_fuel_cells == 0:
+    if np.sum(types == "fuel") == 0:
         raise ValueError("No 'fuel' elements found in the type grid.")
 
-    average_temperature_over_time = np.sum(temperature * fuel_mask_expanded, axis=(1, 2)) / num_fuel_cells
-    average_life_over_time = np.sum(life * fuel_mask_expanded, axis=(1, 2)) / num_fuel_cells
+    # Per-step aggregates come precomputed from the store's summary section
+    average_temperature_over_time = trajectory.aggregate("mean_fuel_temperature")
+    average_life_over_time = trajectory.aggregate("mean_fuel_life")
 
-    total_energy_over_time = np.array(total_energy)
+    total_energy_over_time = trajectory.aggregate("total_energy")
     max_total_energy = np.max(total_energy_over_time) or 1.0
     max_abs_avg_temp = np.max(np.abs(average_temperature_over_time)) or 1.0
     max_avg_life = np.max(average_life_over_time) or 1.0
@@ -47,7 +117,7 @@ def animate_full_grid_json(filepath):
 
     fig, axs = plt.subplots(3, 2, figsize=(12, 14))  # ← CHANGED to 3 rows
 
-    im_temp = axs[0, 0].imshow(temperature[0], cmap='hot', interpolation='nearest')
+    im_temp = axs[0, 0].imshow(trajectory.frame('temperature', 0), cmap='hot', interpolation='nearest')
     axs[0, 0].set_title("Temperature")
     fig.colorbar(im_temp, ax=axs[0, 0])
 
@@ -61,15 +131,15 @@ def animate_full_grid_json(filepath):
             row_texts.append(txt)
         text_grid.append(row_texts)
 
-    im_energy = axs[0, 1].imshow(energy_output[0], cmap='viridis', interpolation='nearest')
+    im_energy = axs[0, 1].imshow(trajectory.frame('energy_output', 0), cmap='viridis', interpolation='nearest')
     axs[0, 1].set_title("Energy Output")
     fig.colorbar(im_energy, ax=axs[0, 1])
 
-    im_life = axs[1, 0].imshow(life[0], cmap='cool', interpolation='nearest', vmin=0.0, vmax=1.0)
+    im_life = axs[1, 0].imshow(trajectory.frame('life', 0), cmap='cool', interpolation='nearest', vmin=0.0, vmax=1.0)
     axs[1, 0].set_title("Life Remaining")
     fig.colorbar(im_life, ax=axs[1, 0])
 
-    im_flux = axs[1, 1].imshow(flux[0], cmap='plasma', interpolation='nearest')
+    im_flux = axs[1, 1].imshow(trajectory.frame('flux', 0), cmap='plasma', interpolation='nearest')
     axs[1, 1].set_title("Flux")
     fig.colorbar(im_flux, ax=axs[1, 1])
 
@@ -89,30 +159,50 @@ def animate_full_grid_json(filepath):
 
     axs[2, 1].axis('off')  # Empty or use for stats later
 
-    energy_history = []
-    scaled_avg_temp_history = []
-    scaled_avg_life_history = []
-
     def update(frame):
-        im_temp.set_array(temperature[frame])
-        im_energy.set_array(energy_output[frame])
-        im_life.set_array(life[frame])
-        im_flux.set_array(flux[frame])
-
-        energy_history.append(total_energy_over_time[frame])
-        scaled_avg_temp_history.append(scaled_average_temperature[frame])
-        scaled_avg_life_history.append(scaled_average_life[frame])
+        im_temp.set_array(trajectory.frame("temperature", frame))
+        im_energy.set_array(trajectory.frame("energy_output", frame))
+        im_life.set_array(trajectory.frame("life", frame))
+        im_flux.set_array(trajectory.frame("flux", frame))
 
-        line_energy.set_data(np.arange(len(energy_history)), energy_history)
-        line_avg_temp.set_data(np.arange(len(scaled_avg_temp_history)), scaled_avg_temp_history)
-        line_avg_life.set_data(np.arange(len(scaled_avg_life_history)), scaled_avg_life_history)
+        steps = np.arange(frame + 1)
+        line_energy.set_data(steps, total_energy_over_time[:frame + 1])
+        line_avg_temp.set_data(steps, scaled_average_temperature[:frame + 1])
+        line_avg_life.set_data(steps, scaled_average_life[:frame + 1])
 
         return [im_temp, im_energy, im_life, im_flux, line_energy, line_avg_temp, line_avg_life]
 
-    ani = animation.FuncAnimation(fig, update, frames=timesteps, blit=False, interval=1)
     plt.tight_layout()
+    return fig, update, [txt for row in text_grid for txt in row]
+
+
+def animate_full_grid_json(filepath, stride=1):
+    """
+    Animates a simulation run.
+
+    Args:
+        filepath (str): Simulation JSON log or trajectory store directory. A stats-mode
+            recording has no frames to animate and is shown as per-cell maps instead.
+        stride (int): Draw only every `stride`-th frame (quick previews).
+    """
+    trajectory = open_recording(filepath)
+    if isinstance(trajectory, dict):
+        from visualization.cell_stats_map import plot_cell_stats
+        plot_cell_stats(trajectory)
+        plt.show()
+        return
+
+    fig, update, _ = build_animation_figure(trajectory)
+    ani = animation.FuncAnimation(fig, update, frames=trajectory.frame_indices(stride), blit=False, interval=1)
     plt.show()
 
 
 if __name__ == "__main__":
-    animate_full_grid_json("../output/ga_optimized_20250617_235244.json")
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Animate a simulation log or trajectory store")
+    parser.add_argument("path", nargs="?", default="../output/ga_optimized_20250617_235244.json")
+    parser.add_argument("--every", type=int, default=1, help="Draw every N-th frame (quick preview)")
+    args = parser.parse_args()
+
+    animate_full_grid_json(args.path, stride=args.every)